@@ -0,0 +1,82 @@
+"""
+Cold import time of the cookiecats modules.
+
+Every module is imported in a fresh interpreter, so the timings include all
+third-party dependencies it pulls in. The heavy dependencies loaded by each
+import are listed to show which modules stay on the lightweight core path.
+
+Usage:
+    python benchmarks/import_time.py [--repeat 5] [--json out.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+MODULES = [
+    "cookiecats",
+    "cookiecats.summary",
+    "cookiecats.power",
+    "cookiecats.stats",
+    "cookiecats.stream",
+    "cookiecats.batch",
+    "cookiecats.plots",
+]
+
+HEAVY = ["scipy.stats", "statsmodels", "matplotlib", "seaborn"]
+
+SNIPPET = """
+import sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def time_import(module: str, repeat: int = 5):
+    """
+    Best-of-`repeat` cold import time of one module.
+
+    Returns:
+        tuple: Best and median seconds, and the heavy dependencies loaded.
+    """
+    code = SNIPPET.format(src=str(SRC), module=module, heavy=HEAVY)
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.split()
+        times.append(float(out[0]))
+        loaded = out[1] if len(out) > 1 else ""
+    return min(times), statistics.median(times), loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'module':<22}{'best (ms)':>11}{'median (ms)':>13}  heavy deps loaded")
+    for module in MODULES:
+        best, median, loaded = time_import(module, args.repeat)
+        results.append(dict(module=module, best_s=best, median_s=median, loaded=loaded))
+        print(
+            f"{module:<22}{best * 1000:>11.1f}{median * 1000:>13.1f}  {loaded or '-'}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
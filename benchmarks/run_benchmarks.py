@@ -0,0 +1,237 @@
+"""
+Benchmarks for the loading, stats, table and plotting hot paths.
+
+For every dataset size a synthetic CSV is generated once (reused across
+runs from `--data-dir`), then each step is timed `--repeat` times and run
+once more under tracemalloc for its peak traced memory. Results are saved
+as JSON together with the git commit, so runs of different commits can be
+compared with `--compare`.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 100_000 1_000_000
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/old.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from cookiecats import plots, stats  # noqa: E402
+from cookiecats.binary import summarize_binary, write_cookiecats_binary  # noqa: E402
+from cookiecats.io import load_cookiecats  # noqa: E402
+from cookiecats.stream import summarize_parallel  # noqa: E402
+from cookiecats.summary import summarize  # noqa: E402
+from cookiecats.tables import build_results_table  # noqa: E402
+from synthetic import write_cookiecats  # noqa: E402
+
+
+def _parse_size(text: str) -> int:
+    return int(text.replace("_", ""))
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _plot(func, **kwargs):
+    # Draw on an explicit Agg figure and render it, without pyplot state
+    fig = Figure()
+    func(ax=fig.subplots(), **kwargs)
+    fig.canvas.draw()
+
+
+def benchmark_cases(csv_path: Path, n_boot: int, alpha: float = 0.05) -> dict:
+    """
+    Steps to time, as name -> zero-argument callable.
+
+    Inputs of later steps are computed once up front, so each case times
+    only its own function.
+    """
+    df = load_cookiecats(csv_path, cache=False)
+    load_cookiecats(csv_path)  # Warm the columnar cache
+    summary = summarize(df)
+    # Rewrite the binary copy whenever the CSV was regenerated after it
+    binary_path = csv_path.with_suffix(".ccbin")
+    if (
+        not binary_path.exists()
+        or binary_path.stat().st_mtime_ns < csv_path.stat().st_mtime_ns
+    ):
+        write_cookiecats_binary(df, binary_path)
+    ctrl, treat = summary.count("gate_30"), summary.count("gate_40")
+    p0 = summary.rate("retention_7", "gate_30")
+
+    ret7 = stats.test_two_prop_z(df, ctrl, treat, "retention_7", alpha, p0)
+    ret1 = stats.test_two_prop_z(df, ctrl, treat, "retention_1", alpha, p0)
+    engagement = stats.calculate_engagement_stats(df)
+    rounds = stats.test_game_rounds(summary)
+    boot = stats.bootstrap_mean_diff(
+        summary.histogram("gate_30"), summary.histogram("gate_40"), n_boot=n_boot
+    )
+    adj = stats.correct_pvals(
+        ret1.pval, rounds.pval_rounds, rounds.pval_log, alpha=alpha
+    )
+    n, mde = stats.solve_mde(summary, alpha, 0.80, p0)
+
+    q1, q3 = df["sum_gamerounds"].quantile([0.25, 0.75])
+    bounds = dict(lower_bound=q1 - 1.5 * (q3 - q1), upper_bound=q3 + 1.5 * (q3 - q1))
+    rounds_summary = summarize(
+        df.loc[df["sum_gamerounds"] < 3000, ["version", "sum_gamerounds"]],
+        binary_cols=[],
+    )
+
+    return {
+        "load_cookiecats (csv)": lambda: load_cookiecats(csv_path, cache=False),
+        "load_cookiecats (cache)": lambda: load_cookiecats(csv_path),
+        "summarize": lambda: summarize(df),
+        "summarize_parallel (csv)": lambda: summarize_parallel(csv_path),
+        "summarize_binary (memmap)": lambda: summarize_binary(binary_path),
+        "test_srm_chi2": lambda: stats.test_srm_chi2(ctrl, treat),
+        "test_two_prop_z": lambda: stats.test_two_prop_z(
+            df, ctrl, treat, "retention_7", alpha, p0
+        ),
+        "calculate_engagement_stats": lambda: stats.calculate_engagement_stats(df),
+        "test_game_rounds": lambda: stats.test_game_rounds(summary),
+        "bootstrap_mean_diff": lambda: stats.bootstrap_mean_diff(
+            summary.histogram("gate_30"), summary.histogram("gate_40"), n_boot=n_boot
+        ),
+        "build_results_table": lambda: build_results_table(
+            ret1, ret7, rounds, boot, adj, engagement, alpha
+        ),
+        "plot_game_rounds": lambda: _plot(
+            plots.plot_game_rounds, df=rounds_summary, **bounds
+        ),
+        "plot_game_rounds (log)": lambda: _plot(
+            plots.plot_game_rounds, df=rounds_summary, log=True, **bounds
+        ),
+        "plot_assignment_counts": lambda: _plot(plots.plot_assignment_counts, df=df),
+        "plot_retention_rates": lambda: _plot(plots.plot_retention_rates, df=summary),
+        "plot_game_rounds_dist": lambda: _plot(
+            plots.plot_game_rounds_dist, df=rounds_summary
+        ),
+        "plot_game_rounds_dist (log)": lambda: _plot(
+            plots.plot_game_rounds_dist, df=rounds_summary, log=True
+        ),
+        "plot_power_vs_mde": lambda: _plot(
+            plots.plot_power_vs_mde, p0=p0, nob=n, mde_pp_current=mde, alpha=alpha
+        ),
+        "plot_mde_vs_sample": lambda: _plot(
+            plots.plot_mde_vs_sample,
+            p0=p0,
+            alpha=alpha,
+            power=0.80,
+            n=n,
+            mde_pp_current=mde,
+        ),
+    }
+
+
+def time_case(func, repeat: int) -> dict:
+    """Best and median wall time over `repeat` calls, then peak traced memory."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return dict(best_s=min(times), median_s=statistics.median(times), peak_bytes=peak)
+
+
+def run(sizes, repeat: int, n_boot: int, data_dir: Path, seed: int = 0) -> dict:
+    results = []
+    for n in sizes:
+        csv_path = data_dir / f"cookie_cats_{n}_{seed}.csv"
+        if not csv_path.exists():
+            write_cookiecats(csv_path, n, seed=seed)
+
+        for name, func in benchmark_cases(csv_path, n_boot).items():
+            result = dict(benchmark=name, n=n, **time_case(func, repeat))
+            results.append(result)
+            print(
+                f"{n:>12,}  {name:<30}{result['best_s'] * 1000:>11.2f} ms"
+                f"{result['peak_bytes'] / 2**20:>11.1f} MiB"
+            )
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "n_boot": n_boot,
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict) -> pd.DataFrame:
+    """Best times of two runs side by side, ratio > 1 means the current run is slower."""
+    keys = ["benchmark", "n"]
+    old = pd.DataFrame(baseline["results"]).set_index(keys)["best_s"]
+    new = pd.DataFrame(current["results"]).set_index(keys)["best_s"]
+    table = pd.DataFrame({"baseline (s)": old, "current (s)": new}).dropna()
+    table["ratio"] = table["current (s)"] / table["baseline (s)"]
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", type=_parse_size, default=[100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--n-boot", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--data-dir", type=Path, default=Path(__file__).parent / ".data"
+    )
+    parser.add_argument("--output", type=Path, help="JSON file for the results")
+    parser.add_argument("--compare", type=Path, help="Earlier results JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.repeat, args.n_boot, args.data_dir, args.seed)
+
+    output = args.output or (
+        Path(__file__).parent / "results" / f"bench-{report['commit'] or 'local'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Saved {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        print(compare(baseline, report).to_string(float_format="{:.4f}".format))
+
+
+if __name__ == "__main__":
+    main()
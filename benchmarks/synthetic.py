@@ -0,0 +1,138 @@
+"""
+Synthetic Cookie Cats data for benchmarks.
+
+Players are split between gate_30 and gate_40 with the given treatment
+share, retention is drawn per group, and `sum_gamerounds` follows a
+lognormal body with a block of zero-round players and a Pareto tail.
+Large files are written chunk by chunk so N is limited by disk, not memory.
+
+Usage:
+    python benchmarks/synthetic.py 100_000_000 data/cookie_cats_100m.parquet
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULTS = {
+    "treatment_share": 0.5044,
+    "retention_1": (0.448, 0.442),
+    "retention_7": (0.190, 0.182),
+    "rounds_mu": 2.9,
+    "rounds_sigma": 1.4,
+    "zero_share": 0.05,
+    "tail_share": 0.001,
+    "tail_alpha": 1.2,
+}
+
+
+def generate_cookiecats(
+    n: int,
+    seed: int = 0,
+    first_userid: int = 0,
+    treatment_share: float = DEFAULTS["treatment_share"],
+    retention_1=DEFAULTS["retention_1"],
+    retention_7=DEFAULTS["retention_7"],
+    rounds_mu: float = DEFAULTS["rounds_mu"],
+    rounds_sigma: float = DEFAULTS["rounds_sigma"],
+    zero_share: float = DEFAULTS["zero_share"],
+    tail_share: float = DEFAULTS["tail_share"],
+    tail_alpha: float = DEFAULTS["tail_alpha"],
+) -> pd.DataFrame:
+    """
+    Generate `n` players in the Cookie Cats layout and dtypes.
+
+    Args:
+        n (int): Number of players.
+        seed (int | np.random.SeedSequence): Random seed.
+        first_userid (int): User id of the first player.
+        treatment_share (float): Share of players in gate_40.
+        retention_1 (tuple): Day-1 retention rate of (control, treatment).
+        retention_7 (tuple): Day-7 retention rate of (control, treatment).
+        rounds_mu (float): Log-scale mean of game rounds.
+        rounds_sigma (float): Log-scale standard deviation of game rounds.
+        zero_share (float): Share of players who never played a round.
+        tail_share (float): Share of players drawn from the Pareto tail.
+        tail_alpha (float): Pareto tail index, smaller is heavier.
+    """
+    rng = np.random.default_rng(seed)
+    treat = rng.random(n) < treatment_share
+
+    rounds = np.floor(rng.lognormal(rounds_mu, rounds_sigma, n))
+    tail = rng.random(n) < tail_share
+    rounds[tail] = np.floor(
+        np.exp(rounds_mu) * (1 + rng.pareto(tail_alpha, tail.sum()))
+    )
+    rounds[rng.random(n) < zero_share] = 0
+    rounds = np.minimum(rounds, np.iinfo(np.int32).max).astype(np.int32)
+
+    # Day-7 retention only among day-1 retained players keeps the rates nested
+    p1 = np.where(treat, retention_1[1], retention_1[0])
+    p7 = np.where(treat, retention_7[1], retention_7[0])
+    retention_1_ = rng.random(n) < p1
+    retention_7_ = retention_1_ & (rng.random(n) < p7 / p1)
+
+    return pd.DataFrame(
+        {
+            "userid": np.arange(first_userid, first_userid + n, dtype=np.uint32),
+            "version": pd.Categorical.from_codes(
+                treat.astype(np.int8), ["gate_30", "gate_40"]
+            ),
+            "sum_gamerounds": rounds,
+            "retention_1": retention_1_,
+            "retention_7": retention_7_,
+        }
+    )
+
+
+def write_cookiecats(
+    path, n: int, seed: int = 0, chunk_rows: int = 5_000_000, **params
+) -> Path:
+    """
+    Write `n` synthetic players to CSV or Parquet in chunks of `chunk_rows`.
+
+    Every chunk draws from its own child of one SeedSequence, so the file
+    only depends on `n`, `seed` and `chunk_rows`.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sizes = [chunk_rows] * (n // chunk_rows) + (
+        [n % chunk_rows] if n % chunk_rows else []
+    )
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+
+    writer = None
+    start = 0
+    for size, child in zip(sizes, seeds):
+        chunk = generate_cookiecats(size, seed=child, first_userid=start, **params)
+        if path.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            writer = writer or pq.ParquetWriter(tmp_path, table.schema)
+            writer.write_table(table)
+        else:
+            chunk.to_csv(
+                tmp_path, mode="a" if start else "w", header=not start, index=False
+            )
+        start += size
+
+    if writer is not None:
+        writer.close()
+    tmp_path.replace(path)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic Cookie Cats data")
+    parser.add_argument("n", type=lambda s: int(s.replace("_", "")))
+    parser.add_argument("path", help="Output file (.csv or .parquet)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    write_cookiecats(args.path, args.n, seed=args.seed, chunk_rows=args.chunk_rows)
@@ -1 +1,10 @@
-__all__ = ["io", "stats", "tables", "plots"]
+import importlib
+
+__all__ = ["io", "stats", "tables", "plots", "bootstrap", "summary", "stream", "batch", "power", "planning", "sequential", "render", "results", "cuped", "pipeline", "multiarm", "segments", "permutation", "bayes", "incremental", "binary", "ratio"]
+
+
+# Import submodules on first attribute access, so `import cookiecats` stays cheap
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
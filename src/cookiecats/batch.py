@@ -0,0 +1,201 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .io import load_cookiecats
+from .planning import required_n
+from .power import power_from_pp
+from .stats import (
+    bootstrap_mean_diff,
+    calculate_engagement_stats,
+    correct_pvals,
+    solve_mde,
+    test_game_rounds,
+    test_srm_chi2,
+    test_two_prop_z,
+)
+from .stream import STREAM_COLUMNS
+from .summary import CONTROL, TREATMENT, summarize
+from .tables import build_results_table
+
+# Defaults for optional manifest fields
+EXPERIMENT_DEFAULTS = {
+    "control": CONTROL,
+    "treatment": TREATMENT,
+    "primary_metric": "retention_7",
+    "guardrail_metric": "retention_1",
+    "alpha": 0.05,
+    "power": 0.80,
+    "mde_pp": 1.0,
+    "n_boot": 5000,
+    "seed": 42,
+}
+
+
+def read_manifest(path) -> list[dict]:
+    """
+    Read an experiment manifest from JSON (list of objects) or CSV (one row each).
+
+    Every experiment needs a `name` and a `data_path`; other fields fall
+    back to `EXPERIMENT_DEFAULTS`.
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        entries = json.loads(path.read_text())
+    else:
+        entries = pd.read_csv(path).to_dict("records")
+
+    experiments = []
+    for entry in entries:
+        entry = {k: v for k, v in entry.items() if not pd.isna(v)}
+        missing = {"name", "data_path"} - entry.keys()
+        if missing:
+            raise ValueError(f"Manifest entry {entry} is missing {sorted(missing)}")
+        experiments.append({**EXPERIMENT_DEFAULTS, **entry})
+    return experiments
+
+
+def run_experiment(spec: dict) -> pd.DataFrame:
+    """
+    Run the full analysis for one manifest entry up to `build_results_table`.
+
+    Returns the results table with experiment name, SRM p-value, MDE at the
+    observed N, required N and power at the manifest `mde_pp` and wall time
+    added as columns. Failures are reported in an `Error` column instead of
+    aborting the batch. Every test runs on one GroupSummary, and the
+    player-level frame is dropped once it is summarized.
+    """
+    start = time.perf_counter()
+    control, treatment = spec["control"], spec["treatment"]
+    labels = dict(control=control, treatment=treatment)
+    alpha = spec["alpha"]
+
+    try:
+        summary = summarize(load_cookiecats(spec["data_path"], columns=STREAM_COLUMNS))
+        ctrl, treat = summary.count(control), summary.count(treatment)
+
+        srm_result = test_srm_chi2(ctrl, treat)
+        p0 = summary.rate(spec["primary_metric"], control)
+        mde_result = solve_mde(summary, alpha, spec["power"], p0, control=control)
+
+        primary = test_two_prop_z(
+            summary, ctrl, treat, spec["primary_metric"], alpha, p0, **labels
+        )
+        guardrail_p0 = summary.rate(spec["guardrail_metric"], control)
+        guardrail = test_two_prop_z(
+            summary,
+            ctrl,
+            treat,
+            spec["guardrail_metric"],
+            alpha,
+            guardrail_p0,
+            **labels,
+        )
+        engagement_stats = calculate_engagement_stats(summary, **labels)
+        rounds_results = test_game_rounds(summary, **labels)
+        bootstrap_result = bootstrap_mean_diff(
+            summary.histogram(control),
+            summary.histogram(treatment),
+            n_boot=spec["n_boot"],
+            seed=spec["seed"],
+        )
+        guardrail_adj = correct_pvals(
+            guardrail.pval,
+            rounds_results.pval_rounds,
+            rounds_results.pval_log,
+            alpha=alpha,
+        )
+
+        table = build_results_table(
+            ret1_results=guardrail,
+            ret7_results=primary,
+            rounds_results=rounds_results,
+            bootstrap_result=bootstrap_result,
+            guardrail_adj=guardrail_adj,
+            engagement_stats=engagement_stats,
+            alpha=alpha,
+            primary_label=spec["primary_metric"],
+            guardrail_label=spec["guardrail_metric"],
+            **labels,
+        )
+        # Group labels differ between experiments, so use generic column names
+        table = table.rename(
+            columns={
+                f"Control ({control})": "Control",
+                f"Treatment ({treatment})": "Treatment",
+            }
+        )
+        table["SRM p-value"] = srm_result.pval
+        table["MDE at N (pp)"] = mde_result.mde_pp
+        # Planning view of the primary metric at the manifest MDE
+        table["Target MDE (pp)"] = spec["mde_pp"]
+        table["Required N control"] = np.ceil(
+            required_n(p0, spec["mde_pp"], alpha=alpha, power=spec["power"])
+        )
+        table["Power at target MDE"] = power_from_pp(
+            spec["mde_pp"], p0, ctrl, alpha=alpha, ratio=treat / ctrl
+        )
+        table["Error"] = None
+    except Exception as exc:
+        table = pd.DataFrame({"Error": [f"{type(exc).__name__}: {exc}"]})
+
+    table.insert(0, "Experiment", spec["name"])
+    table.insert(1, "Control label", control)
+    table.insert(2, "Treatment label", treatment)
+    table["Wall time (s)"] = time.perf_counter() - start
+
+    return table
+
+
+def run_batch(manifest, output_path=None, max_workers: int | None = None):
+    """
+    Analyze every experiment of a manifest across a process pool.
+
+    Args:
+        manifest (str | list[dict]): Manifest path or already parsed entries.
+        output_path (str | None): Consolidated results file (.csv or .parquet).
+        max_workers (int | None): Worker processes, all cores if omitted.
+
+    Returns:
+        pd.DataFrame: Results tables of all experiments stacked in manifest order.
+    """
+    if isinstance(manifest, (str, Path)):
+        experiments = read_manifest(manifest)
+    else:
+        experiments = [{**EXPERIMENT_DEFAULTS, **spec} for spec in manifest]
+
+    max_workers = max_workers or os.cpu_count()
+    if max_workers == 1:
+        tables = [run_experiment(spec) for spec in experiments]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            tables = list(pool.map(run_experiment, experiments))
+
+    results = pd.concat(tables, ignore_index=True)
+
+    if output_path:
+        output_path = Path(output_path)
+        if output_path.suffix == ".parquet":
+            results.to_parquet(output_path, index=False)
+        else:
+            results.to_csv(output_path, index=False)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a batch of A/B test analyses")
+    parser.add_argument("manifest", help="Experiment manifest (.json or .csv)")
+    parser.add_argument("output", help="Consolidated results file (.csv or .parquet)")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    results = run_batch(args.manifest, args.output, max_workers=args.workers)
+    timings = results.groupby("Experiment", sort=False)["Wall time (s)"].first()
+    print(timings.to_string())
@@ -0,0 +1,262 @@
+import numpy as np
+import pandas as pd
+from scipy.special import betaincc, betaincinv, betaln
+
+from .multiarm import arm_pairs
+from .summary import BINARY_COLS, CONTROL, as_summary
+
+METHODS = ("auto", "integrate", "sample")
+
+# Integration grid points per comparison
+GRID_SIZE = 4097
+
+# Posterior tail mass left outside the integration grid
+TAIL_MASS = 1e-12
+
+# Largest deviation of the integrated posterior mass from 1 before sampling instead
+MAX_MASS_ERROR = 1e-6
+
+
+def _beta_pdf(x, a, b):
+    # Beta density in log space, stable for posteriors with large counts
+    with np.errstate(divide="ignore"):
+        log_pdf = (a - 1) * np.log(x) + (b - 1) * np.log1p(-x) - betaln(a, b)
+    return np.exp(log_pdf)
+
+
+def _prob_less(grid, weights, a_arm, b_arm, a_ref, b_ref):
+    # P(arm < reference) = integral of f_arm(x) * P(reference > x) dx
+    return np.sum(
+        weights * _beta_pdf(grid, a_arm, b_arm) * betaincc(a_ref, b_ref, grid), axis=-1
+    )
+
+
+def _grid(a_arm, b_arm, a_ref, b_ref):
+    # Shared grid over the bulk of both posteriors, with trapezoidal weights
+    low = np.minimum(
+        betaincinv(a_arm, b_arm, TAIL_MASS), betaincinv(a_ref, b_ref, TAIL_MASS)
+    )
+    high = np.maximum(
+        betaincinv(a_arm, b_arm, 1 - TAIL_MASS),
+        betaincinv(a_ref, b_ref, 1 - TAIL_MASS),
+    )
+    step = np.linspace(0, 1, GRID_SIZE)
+    grid = low[:, None] + (high - low)[:, None] * step
+    weights = np.full(grid.shape, 1.0) * ((high - low) / (GRID_SIZE - 1))[:, None]
+    weights[:, [0, -1]] /= 2
+    return grid, weights
+
+
+def _difference_quantiles(grid, weights, pdf_arm, pdf_ref, q):
+    # Quantiles of arm - reference from the convolved posterior masses
+    mass_arm = weights * pdf_arm
+    mass_ref = weights * pdf_ref
+    size = 2 * GRID_SIZE
+    mass = np.fft.irfft(
+        np.fft.rfft(mass_arm, size) * np.fft.rfft(mass_ref[:, ::-1], size), size
+    )[:, : 2 * GRID_SIZE - 1]
+    cdf = np.cumsum(np.clip(mass, 0, None), axis=-1)
+    cdf /= cdf[:, -1:]
+
+    step = grid[:, 1] - grid[:, 0]
+    offsets = np.arange(-(GRID_SIZE - 1), GRID_SIZE)
+    index = np.stack([(cdf < p).sum(axis=-1) for p in q], axis=-1)
+    return offsets[index] * step[:, None]
+
+
+def _integrate(a_arm, b_arm, a_ref, b_ref, q):
+    grid, weights = _grid(a_arm, b_arm, a_ref, b_ref)
+    a_arm, b_arm, a_ref, b_ref = (x[:, None] for x in (a_arm, b_arm, a_ref, b_ref))
+    mean_arm, mean_ref = a_arm / (a_arm + b_arm), a_ref / (a_ref + b_ref)
+
+    pdf_arm = _beta_pdf(grid, a_arm, b_arm)
+    pdf_ref = _beta_pdf(grid, a_ref, b_ref)
+    mass_error = np.maximum(
+        np.abs(np.sum(weights * pdf_arm, axis=-1) - 1),
+        np.abs(np.sum(weights * pdf_ref, axis=-1) - 1),
+    )
+
+    # E[max(ref - arm, 0)] through the size-biased posteriors Beta(a + 1, b)
+    prob_less = _prob_less(grid, weights, a_arm, b_arm, a_ref, b_ref)
+    ref_part = _prob_less(grid, weights, a_arm, b_arm, a_ref + 1, b_ref)
+    arm_part = _prob_less(grid, weights, a_arm + 1, b_arm, a_ref, b_ref)
+    loss_arm = mean_ref[:, 0] * ref_part - mean_arm[:, 0] * arm_part
+    quantiles = _difference_quantiles(grid, weights, pdf_arm, pdf_ref, q)
+
+    return prob_less, loss_arm, quantiles, mass_error
+
+
+def _sample(a_arm, b_arm, a_ref, b_ref, q, n_draws, rng):
+    draws_arm = rng.beta(a_arm, b_arm, size=(n_draws, len(a_arm)))
+    draws_ref = rng.beta(a_ref, b_ref, size=(n_draws, len(a_ref)))
+    diff = draws_arm - draws_ref
+    return (
+        np.mean(diff < 0, axis=0),
+        np.mean(np.maximum(-diff, 0), axis=0),
+        np.quantile(diff, q, axis=0).T,
+    )
+
+
+def beta_binomial_compare(
+    successes_arm,
+    nobs_arm,
+    successes_ref,
+    nobs_ref,
+    prior=(1, 1),
+    credible: float = 0.95,
+    method: str = "auto",
+    n_draws: int = 200_000,
+    seed=42,
+):
+    """
+    Compare Beta posteriors of arm and reference rates, elementwise.
+
+    Each rate gets a conjugate Beta(prior_a + successes, prior_b + failures)
+    posterior. With "integrate", P(arm < reference) is one numerical
+    integral over a grid covering both posteriors, and the expected loss
+    E[max(reference - arm, 0)] follows from the same integral of the
+    size-biased posteriors, so no draws are needed. Credible intervals for
+    arm - reference come from the convolved posterior masses. "sample"
+    uses vectorized posterior draws instead, and "auto" integrates and
+    falls back to draws for comparisons the grid does not resolve.
+
+    Args:
+        successes_arm (array-like): Successes of the compared arms.
+        nobs_arm (array-like): Players of the compared arms.
+        successes_ref (array-like): Successes of the reference arms.
+        nobs_ref (array-like): Players of the reference arms.
+        prior (tuple): Beta prior (a, b), uniform by default.
+        credible (float): Credible level of the difference interval.
+        method (str): "auto", "integrate" or "sample".
+        n_draws (int): Posterior draws per comparison when sampling.
+        seed (int | np.random.Generator): Random seed for the draws.
+
+    Returns:
+        dict: Posterior means, P(arm < reference), P(arm > reference),
+            expected losses of choosing each arm and the credible interval,
+            as arrays.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+
+    successes_arm, nobs_arm, successes_ref, nobs_ref = (
+        np.atleast_1d(np.asarray(x, dtype=float))
+        for x in (successes_arm, nobs_arm, successes_ref, nobs_ref)
+    )
+    a_arm = prior[0] + successes_arm
+    b_arm = prior[1] + nobs_arm - successes_arm
+    a_ref = prior[0] + successes_ref
+    b_ref = prior[1] + nobs_ref - successes_ref
+    mean_arm, mean_ref = a_arm / (a_arm + b_arm), a_ref / (a_ref + b_ref)
+    q = [(1 - credible) / 2, (1 + credible) / 2]
+
+    sampled = np.ones(len(a_arm), dtype=bool)
+    if method != "sample":
+        prob_less, loss_arm, interval, mass_error = _integrate(
+            a_arm, b_arm, a_ref, b_ref, q
+        )
+        if method == "auto":
+            sampled = mass_error > MAX_MASS_ERROR
+        else:
+            sampled[:] = False
+
+    if sampled.any():
+        rng = np.random.default_rng(seed)
+        draws = _sample(
+            a_arm[sampled],
+            b_arm[sampled],
+            a_ref[sampled],
+            b_ref[sampled],
+            q,
+            n_draws,
+            rng,
+        )
+        if method == "sample":
+            prob_less, loss_arm, interval = draws
+        else:
+            prob_less[sampled], loss_arm[sampled], interval[sampled] = draws
+
+    return {
+        "mean_arm": mean_arm,
+        "mean_ref": mean_ref,
+        "prob_less": prob_less,
+        "prob_greater": 1 - prob_less,
+        "loss_arm": loss_arm,
+        "loss_ref": np.maximum(loss_arm + mean_arm - mean_ref, 0),
+        "ci_low": interval[:, 0],
+        "ci_high": interval[:, 1],
+        "sampled": sampled,
+    }
+
+
+def bayesian_table(
+    df,
+    metrics=None,
+    control: str = CONTROL,
+    pairs: str = "control",
+    arms=None,
+    prior=(1, 1),
+    credible: float = 0.95,
+    method: str = "auto",
+    n_draws: int = 200_000,
+    seed=42,
+) -> pd.DataFrame:
+    """
+    Bayesian Beta-Binomial comparison of every metric and arm pair at once.
+
+    Uses the same grouped counts as `test_two_prop_z`, so a GroupSummary
+    is analyzed without touching player-level data again.
+
+    Args:
+        df (pd.DataFrame | GroupSummary): Data or summary.
+        metrics (list | None): Binary metrics, the retention columns if omitted.
+        control (str): Control arm.
+        pairs (str): "control" for every arm vs. control, "all" for all pairs.
+        arms (list | None): Arms to include, all if omitted.
+        prior (tuple): Beta prior (a, b), uniform by default.
+        credible (float): Credible level of the difference interval.
+        method (str): "auto", "integrate" or "sample".
+        n_draws (int): Posterior draws per comparison when sampling.
+        seed (int): Random seed for the draws.
+
+    Returns:
+        pd.DataFrame: One row per metric and pair. Expected loss is the
+            retention given up, in rate units, by shipping that arm.
+    """
+    summary = as_summary(df)
+    metrics = metrics or [col for col in BINARY_COLS if col in summary.successes]
+    ref, other = arm_pairs(summary.groups, control, pairs, arms)
+
+    successes = np.concatenate([summary.successes[col] for col in metrics])
+    offsets = np.repeat(np.arange(len(metrics)) * len(summary.groups), len(ref))
+    ref_rows, other_rows = np.tile(ref, len(metrics)), np.tile(other, len(metrics))
+    n = np.tile(summary.n, len(metrics))
+
+    posterior = beta_binomial_compare(
+        successes[offsets + other_rows],
+        n[offsets + other_rows],
+        successes[offsets + ref_rows],
+        n[offsets + ref_rows],
+        prior=prior,
+        credible=credible,
+        method=method,
+        n_draws=n_draws,
+        seed=seed,
+    )
+
+    return pd.DataFrame(
+        {
+            "Metric": np.repeat(metrics, len(ref)),
+            "Reference": [summary.groups[i] for i in ref_rows],
+            "Arm": [summary.groups[j] for j in other_rows],
+            "Reference posterior mean": posterior["mean_ref"],
+            "Arm posterior mean": posterior["mean_arm"],
+            "P(arm < reference)": posterior["prob_less"],
+            "P(arm > reference)": posterior["prob_greater"],
+            "Expected loss (arm)": posterior["loss_arm"],
+            "Expected loss (reference)": posterior["loss_ref"],
+            "Credible low": posterior["ci_low"],
+            "Credible high": posterior["ci_high"],
+            "Method": np.where(posterior["sampled"], "sample", "integrate"),
+        }
+    )
@@ -0,0 +1,188 @@
+import json
+import os
+import struct
+from dataclasses import dataclass
+from functools import reduce
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .summary import (
+    BINARY_COLS,
+    GROUP_COL,
+    VALUE_COL,
+    GroupSummary,
+    summarize_codes,
+)
+
+MAGIC = b"CCATBIN1"
+
+# Column data starts on multiples of this many bytes
+ALIGNMENT = 4096
+
+# Fixed-width columns and their on-disk types; retention columns are bit-packed
+COLUMN_TYPES = {"userid": "<u4", GROUP_COL: "i1", VALUE_COL: "<i4"}
+
+# Rows per chunk when summarizing, a multiple of 8 so packed bits split on bytes
+SUMMARY_CHUNK_ROWS = 8 * 2**20
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_cookiecats_binary(df: pd.DataFrame, path) -> Path:
+    """
+    Write the experiment columns to a fixed-layout binary file.
+
+    The file starts with a magic string and a JSON header giving the row
+    count, group labels and the offset of every column. Columns follow as
+    aligned raw arrays: `userid`, `version` codes into the sorted labels,
+    `sum_gamerounds` and one bit per player for each retention flag.
+
+    Args:
+        df (pd.DataFrame): Player-level experiment data.
+        path (str | Path): Output file, written atomically.
+    """
+    path = Path(path)
+    codes, labels = pd.factorize(df[GROUP_COL], sort=True)
+    columns = {
+        "userid": df["userid"].to_numpy(),
+        GROUP_COL: codes,
+        VALUE_COL: df[VALUE_COL].to_numpy(),
+    }
+    arrays = {
+        col: np.asarray(columns[col], dtype=kind) for col, kind in COLUMN_TYPES.items()
+    }
+    for col in BINARY_COLS:
+        if col in df.columns:
+            arrays[col] = np.packbits(df[col].to_numpy(dtype=bool), bitorder="little")
+
+    # Offsets depend on the header length, which is padded to the first block
+    layout, offset = {}, ALIGNMENT
+    for col, array in arrays.items():
+        layout[col] = {"dtype": array.dtype.str, "offset": offset, "size": array.size}
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps(
+        {"rows": len(df), "groups": [str(g) for g in labels], "columns": layout}
+    ).encode()
+    if len(MAGIC) + 8 + len(header) > ALIGNMENT:
+        raise ValueError("Too many group labels for the binary header")
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+        for col, array in arrays.items():
+            f.seek(layout[col]["offset"])
+            f.write(array.tobytes())
+        f.truncate(offset)
+    tmp_path.replace(path)
+    return path
+
+
+@dataclass
+class CookieCatsBinary:
+    """
+    Read-only memory-mapped view of a binary experiment file.
+
+    Opening only parses the header; column pages are read on first access
+    and shared through the OS page cache by every process mapping the file.
+    Worker processes should open the path themselves rather than receive
+    the arrays, which would be pickled as copies.
+
+    Attributes:
+        path (Path): Binary file.
+        rows (int): Number of players.
+        groups (tuple): Group labels, indexed by the `version` codes.
+        columns (dict): Column name -> np.memmap; retention columns hold
+            the packed bits.
+    """
+
+    path: Path
+    rows: int
+    groups: tuple
+    columns: dict
+
+    def flags(self, col: str, start: int = 0, stop: int | None = None):
+        """Unpack one retention column, or rows [start, stop), to booleans."""
+        stop = self.rows if stop is None else min(stop, self.rows)
+        first = start // 8
+        packed = self.columns[col][first : -(-stop // 8)]
+        bits = np.unpackbits(packed, bitorder="little")
+        return bits[start - 8 * first : stop - 8 * first].view(bool)
+
+    def to_frame(self, columns=None) -> pd.DataFrame:
+        """
+        Columns as a DataFrame in the `load_cookiecats` schema.
+
+        Fixed-width columns are wrapped without copying where pandas allows
+        it; retention flags are unpacked to one byte per player.
+        """
+        columns = columns or ["userid", GROUP_COL, VALUE_COL, *self.binary_cols]
+        data = {}
+        for col in columns:
+            if col == GROUP_COL:
+                data[col] = pd.Categorical.from_codes(self.columns[col], self.groups)
+            elif col in COLUMN_TYPES:
+                data[col] = np.asarray(self.columns[col])
+            else:
+                data[col] = self.flags(col)
+        return pd.DataFrame(data, copy=False)
+
+    @property
+    def binary_cols(self) -> list:
+        return [col for col in BINARY_COLS if col in self.columns]
+
+
+def open_cookiecats_binary(path) -> CookieCatsBinary:
+    """Map a file written by `write_cookiecats_binary` without reading its data."""
+    path = Path(path)
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a Cookie Cats binary file")
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len))
+
+    columns = {
+        col: np.memmap(
+            path,
+            dtype=spec["dtype"],
+            mode="r",
+            offset=spec["offset"],
+            shape=(spec["size"],),
+        )
+        for col, spec in header["columns"].items()
+    }
+    return CookieCatsBinary(path, header["rows"], tuple(header["groups"]), columns)
+
+
+def summarize_binary(data, chunk_rows: int = SUMMARY_CHUNK_ROWS) -> GroupSummary:
+    """
+    Build a GroupSummary straight from the mapped columns.
+
+    `version` codes and game rounds are read in place and retention bits
+    are unpacked one chunk at a time, so memory stays bounded by
+    `chunk_rows` whatever the file size. Raises ValueError for a file
+    without rows.
+
+    Args:
+        data (str | Path | CookieCatsBinary): Binary file or an opened view.
+        chunk_rows (int): Rows per chunk, rounded down to a multiple of 8.
+    """
+    if not isinstance(data, CookieCatsBinary):
+        data = open_cookiecats_binary(data)
+    if data.rows == 0:
+        raise ValueError(f"{data.path} has no rows")
+    chunk_rows = max(8, chunk_rows - chunk_rows % 8)
+
+    parts = []
+    for start in range(0, data.rows, chunk_rows):
+        stop = min(start + chunk_rows, data.rows)
+        codes = data.columns[GROUP_COL][start:stop].astype(np.intp)
+        binary = {col: data.flags(col, start, stop) for col in data.binary_cols}
+        x = data.columns[VALUE_COL][start:stop]
+        parts.append(summarize_codes(codes, data.groups, binary, x))
+
+    summary: GroupSummary = reduce(GroupSummary.merge, parts)
+    return summary
@@ -0,0 +1,230 @@
+import numpy as np
+from scipy.special import ndtr, ndtri
+
+
+# Memory budget for one block of bootstrap replicates (bytes)
+DEFAULT_MAX_BLOCK_BYTES = 64 * 2**20
+
+
+def as_counts(x):
+    """
+    Compress a sample into sorted distinct values and their counts.
+
+    A `(values, counts)` histogram, e.g. from `GroupSummary.histogram`, is
+    passed through as is.
+    """
+    if isinstance(x, tuple):
+        values, counts = x
+        return np.asarray(values, dtype=float), np.asarray(counts, dtype=np.int64)
+    values, counts = np.unique(np.asarray(x), return_counts=True)
+    return values.astype(float), counts.astype(np.int64)
+
+
+def _as_sample(x):
+    # Raw observations, expanding a (values, counts) histogram
+    if isinstance(x, tuple):
+        return np.repeat(*as_counts(x))
+    return np.asarray(x, dtype=float)
+
+
+def _trim_weights(weights, cum_counts, n, proportiontocut):
+    # Weights left per distinct value after cutting g observations from each end
+    g = int(proportiontocut * n)
+    lo, hi = g, n - g
+    upper = np.clip(cum_counts, lo, hi)
+    lower = np.clip(cum_counts - weights, lo, hi)
+    return upper - lower, hi - lo
+
+
+def _order_stat(values, cum_counts, k):
+    # k-th smallest observation (1-based) for each row of cumulative counts
+    return values[(cum_counts < k).sum(axis=-1)]
+
+
+def weighted_statistic(values, weights, statistic="mean", trim=0.1):
+    """
+    Evaluate a statistic on samples given as counts over distinct values.
+
+    Args:
+        values (np.ndarray): Sorted distinct values, shape (m,).
+        weights (np.ndarray): Counts per value, shape (m,) or (B, m).
+        statistic (str): "mean", "median" or "trimmed_mean".
+        trim (float): Proportion cut from each end for the trimmed mean.
+    """
+    weights = np.asarray(weights)
+    n = int(weights.sum(axis=-1).flat[0])
+
+    if statistic == "mean":
+        return weights @ values / n
+
+    cum_counts = np.cumsum(weights, axis=-1)
+    if statistic == "median":
+        low = _order_stat(values, cum_counts, (n + 1) // 2)
+        high = _order_stat(values, cum_counts, n // 2 + 1)
+        return (low + high) / 2
+    if statistic == "trimmed_mean":
+        trimmed, n_kept = _trim_weights(weights, cum_counts, n, trim)
+        return trimmed @ values / n_kept
+
+    raise ValueError(f"Unknown statistic: {statistic!r}")
+
+
+def _contrast(stat_ctrl, stat_treat, contrast):
+    if contrast == "diff":
+        return stat_treat - stat_ctrl
+    if contrast == "ratio":
+        return stat_treat / stat_ctrl
+    raise ValueError(f"Unknown contrast: {contrast!r}")
+
+
+def _block_sizes(n_boot, bytes_per_replicate, max_block_bytes):
+    block = max(1, min(n_boot, max_block_bytes // max(bytes_per_replicate, 1)))
+    sizes = [block] * (n_boot // block)
+    if n_boot % block:
+        sizes.append(n_boot % block)
+    return sizes
+
+
+def _replicates_counts(samples, statistic, trim, n_boot, rng, max_block_bytes):
+    # Resample each group as a multinomial draw over its distinct values
+    m = max(len(values) for values, _ in samples)
+    reps = [np.empty(n_boot) for _ in samples]
+    start = 0
+    for size in _block_sizes(n_boot, 16 * m, max_block_bytes):
+        for rep, (values, counts) in zip(reps, samples):
+            n = counts.sum()
+            weights = rng.multinomial(n, counts / n, size=size)
+            rep[start : start + size] = weighted_statistic(
+                values, weights, statistic, trim
+            )
+        start += size
+    return reps
+
+
+def _replicates_indices(samples, func, n_boot, rng, max_block_bytes):
+    # Resample raw observations by index for user-supplied statistics
+    n_max = max(len(x) for x in samples)
+    reps = [np.empty(n_boot) for _ in samples]
+    start = 0
+    for size in _block_sizes(n_boot, 16 * n_max, max_block_bytes):
+        for rep, x in zip(reps, samples):
+            idx = rng.integers(0, len(x), size=(size, len(x)))
+            rep[start : start + size] = func(x[idx], axis=1)
+        start += size
+    return reps
+
+
+def _jackknife_counts(values, counts, statistic, trim, max_block_bytes):
+    # Leave-one-out statistics, one per distinct value, weighted by its count
+    m = len(values)
+    jack = np.empty(m)
+    block = max(1, max_block_bytes // (16 * m))
+    for start in range(0, m, block):
+        stop = min(start + block, m)
+        weights = np.tile(counts, (stop - start, 1))
+        weights[np.arange(stop - start), np.arange(start, stop)] -= 1
+        jack[start:stop] = weighted_statistic(values, weights, statistic, trim)
+    return jack, counts
+
+
+def _jackknife_indices(x, func):
+    # Dropping any copy of a value gives the same statistic, so drop the first
+    _, first, counts = np.unique(x, return_index=True, return_counts=True)
+    jack = np.array([func(np.delete(x, i), axis=0) for i in first])
+    return jack, counts
+
+
+def _acceleration(jackknifes, contrast, observed_stats):
+    # BCa acceleration from per-group jackknife influence values
+    num, den = 0.0, 0.0
+    for i, (jack, counts) in enumerate(jackknifes):
+        stats = list(observed_stats)
+        stats[i] = jack
+        theta = _contrast(*stats, contrast)
+        n = counts.sum()
+        u = np.average(theta, weights=counts) - theta
+        num += np.sum(counts * u**3) / n**3
+        den += np.sum(counts * u**2) / n**2
+    return num / (6 * den**1.5) if den > 0 else 0.0
+
+
+def bootstrap_ci(
+    rounds_ctrl,
+    rounds_treat,
+    statistic="mean",
+    contrast="diff",
+    n_boot: int = 5000,
+    confidence: float = 0.95,
+    method: str = "percentile",
+    trim: float = 0.1,
+    rng=None,
+    max_block_bytes: int = DEFAULT_MAX_BLOCK_BYTES,
+):
+    """
+    Two-sample bootstrap confidence interval for treatment vs. control.
+
+    Built-in statistics resample each group as multinomial counts over its
+    distinct values, so cost depends on the number of distinct values rather
+    than on the sample size. A callable statistic `func(x, axis)` falls back
+    to resampling indices. Replicates are drawn in blocks whose size is
+    bounded by `max_block_bytes`.
+
+    Args:
+        rounds_ctrl (array-like | tuple): Control observations or a
+            `(values, counts)` histogram.
+        rounds_treat (array-like | tuple): Treatment observations or histogram.
+        statistic (str | callable): "mean", "median", "trimmed_mean" or a
+            vectorized function accepting an `axis` argument.
+        contrast (str): "diff" (treatment - control) or "ratio" (treatment / control).
+        n_boot (int): Number of bootstrap replicates.
+        confidence (float): Confidence level of the interval.
+        method (str): "percentile" or "bca".
+        trim (float): Proportion cut from each end for the trimmed mean.
+        rng (np.random.Generator | int | None): Generator or seed.
+        max_block_bytes (int): Memory budget for one block of replicates.
+
+    Returns:
+        tuple: Observed contrast, lower and upper confidence limits.
+    """
+    rng = np.random.default_rng(rng)
+    raw = [rounds_ctrl, rounds_treat]
+
+    if callable(statistic):
+        samples = [_as_sample(x) for x in raw]
+        observed = [float(statistic(x, axis=0)) for x in samples]
+        reps = _replicates_indices(samples, statistic, n_boot, rng, max_block_bytes)
+    else:
+        samples = [as_counts(x) for x in raw]
+        observed = [
+            float(weighted_statistic(values, counts, statistic, trim))
+            for values, counts in samples
+        ]
+        reps = _replicates_counts(
+            samples, statistic, trim, n_boot, rng, max_block_bytes
+        )
+
+    theta_hat = _contrast(*observed, contrast)
+    boot = _contrast(*reps, contrast)
+    tail = (1 - confidence) / 2
+
+    if method == "percentile":
+        quantiles = [tail, 1 - tail]
+    elif method == "bca":
+        if callable(statistic):
+            jackknifes = [_jackknife_indices(x, statistic) for x in samples]
+        else:
+            jackknifes = [
+                _jackknife_counts(values, counts, statistic, trim, max_block_bytes)
+                for values, counts in samples
+            ]
+        a = _acceleration(jackknifes, contrast, observed)
+        # Count ties as half so discrete statistics (e.g. medians) stay finite
+        z0 = ndtri(np.mean(boot < theta_hat) + 0.5 * np.mean(boot == theta_hat))
+        z = ndtri(np.array([tail, 1 - tail]))
+        quantiles = ndtr(z0 + (z0 + z) / (1 - a * (z0 + z)))
+    else:
+        raise ValueError(f"Unknown interval method: {method!r}")
+
+    ci_low, ci_high = np.quantile(boot, quantiles)
+
+    return theta_hat, ci_low, ci_high
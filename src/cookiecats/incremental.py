@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from .io import content_fingerprint, find_cookiecats, iter_cookiecats
+from .stats import bootstrap_mean_diff, correct_pvals
+from .stream import STREAM_COLUMNS, analyze_summary
+from .summary import CONTROL, TREATMENT, GroupSummary, summarize
+from .tables import build_results_table
+
+# Bumped when the state file layout changes
+STATE_VERSION = 2
+
+
+@dataclass
+class ExperimentState:
+    """
+    Accumulated per-group aggregates of every partition ingested so far.
+
+    Attributes:
+        summary (GroupSummary | None): Merged statistics, None before any data.
+        partitions (dict): Partition name -> content fingerprint, in ingest order.
+        updated_at (str | None): UTC time of the last ingest.
+    """
+
+    summary: GroupSummary | None = None
+    partitions: dict = field(default_factory=dict)
+    updated_at: str | None = None
+
+
+def save_state(state: ExperimentState, path):
+    """Write the state atomically as a compressed, pickle-free .npz file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "version": STATE_VERSION,
+        "partitions": state.partitions,
+        "updated_at": state.updated_at,
+    }
+    arrays = {}
+    if state.summary is not None:
+        summary = state.summary
+        meta["groups"] = list(summary.groups)
+        meta["binary_cols"] = list(summary.successes)
+        arrays = {
+            "n": summary.n,
+            "moments": np.stack(
+                [
+                    summary.value_sum,
+                    summary.value_sumsq,
+                    summary.log_sum,
+                    summary.log_sumsq,
+                ]
+            ),
+            "values": summary.values,
+            "hist": summary.hist,
+            **{f"successes.{col}": s for col, s in summary.successes.items()},
+        }
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, meta=np.array(json.dumps(meta)), **arrays)
+    tmp_path.replace(path)
+
+
+def load_state(path) -> ExperimentState:
+    """Read a state file, or return an empty state if it does not exist yet."""
+    path = Path(path)
+    if not path.exists():
+        return ExperimentState()
+
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data["meta"]))
+        if meta["version"] != STATE_VERSION:
+            raise ValueError(
+                f"State file {path} has version {meta['version']}, "
+                f"expected {STATE_VERSION}; rebuild it from the partitions"
+            )
+        summary = None
+        if "groups" in meta:
+            summary = GroupSummary(
+                tuple(meta["groups"]),
+                data["n"],
+                {col: data[f"successes.{col}"] for col in meta["binary_cols"]},
+                *data["moments"],
+                data["values"],
+                data["hist"],
+            )
+
+    return ExperimentState(summary, meta["partitions"], meta["updated_at"])
+
+
+def ingest_partition(
+    state_path,
+    partition_path,
+    name: str | None = None,
+    chunksize: int = 1_000_000,
+) -> bool:
+    """
+    Fold one new partition (e.g. a day of players) into the state file.
+
+    Only the partition is read, chunk by chunk, and merged into the stored
+    aggregates, so the cost scales with the new data. Partitions are
+    identified by a hash of their bytes, so re-ingesting one that was
+    touched, copied or checked out again is a no-op, whatever its name; a
+    changed partition under a name that was already ingested raises, since
+    its old rows cannot be subtracted. An empty partition is recorded
+    without changing the aggregates.
+
+    Args:
+        state_path (str | Path): State file (.npz), created if missing.
+        partition_path (str | Path): CSV or Parquet export of the new players.
+        name (str | None): Partition name, the file name if omitted.
+        chunksize (int): Rows per chunk when reading the partition.
+
+    Returns:
+        bool: True if the partition was merged, False if already ingested.
+    """
+    partition_path = find_cookiecats(partition_path)
+    name = name or partition_path.name
+    fingerprint = content_fingerprint(partition_path)
+
+    state = load_state(state_path)
+    if fingerprint in state.partitions.values():
+        return False
+    if name in state.partitions:
+        raise ValueError(
+            f"Partition {name!r} was already ingested with different content; "
+            "rebuild the state from all partitions"
+        )
+
+    # A header-only partition leaves the summary unchanged but is recorded,
+    # so it is not read again
+    chunks = iter_cookiecats(
+        partition_path, chunksize=chunksize, columns=STREAM_COLUMNS
+    )
+    for chunk in chunks:
+        if len(chunk):
+            part = summarize(chunk)
+            state.summary = part if state.summary is None else state.summary.merge(part)
+    state.partitions[name] = fingerprint
+    state.updated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    save_state(state, state_path)
+    return True
+
+
+def refresh_results(
+    state_path,
+    alpha: float = 0.05,
+    n_boot: int = 5000,
+    seed=42,
+    control: str = CONTROL,
+    treatment: str = TREATMENT,
+):
+    """
+    Regenerate the results table from the merged state alone.
+
+    Every test runs on the stored aggregates, so no partition is re-read.
+
+    Args:
+        state_path (str | Path): State file written by `ingest_partition`.
+        alpha (float): Significance level.
+        n_boot (int): Bootstrap replicates for the mean difference.
+        seed (int): Bootstrap seed.
+        control (str): Control group label.
+        treatment (str): Treatment group label.
+
+    Returns:
+        pd.DataFrame: Output of `build_results_table`.
+    """
+    state = load_state(state_path)
+    if state.summary is None:
+        raise ValueError(f"State file {state_path} holds no data yet")
+
+    labels = dict(control=control, treatment=treatment)
+    results = analyze_summary(state.summary, alpha, **labels)
+    engagement = results["engagement"]
+    bootstrap_result = bootstrap_mean_diff(
+        state.summary.histogram(control),
+        state.summary.histogram(treatment),
+        n_boot=n_boot,
+        seed=seed,
+    )
+    guardrail_adj = correct_pvals(
+        results["ret1"].pval,
+        results["rounds"].pval_rounds,
+        results["rounds"].pval_log,
+        alpha=alpha,
+    )
+
+    return build_results_table(
+        ret1_results=results["ret1"],
+        ret7_results=results["ret7"],
+        rounds_results=results["rounds"],
+        bootstrap_result=bootstrap_result,
+        guardrail_adj=guardrail_adj,
+        engagement_stats=engagement,
+        alpha=alpha,
+        **labels,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Append daily partitions")
+    parser.add_argument("state", help="State file (.npz)")
+    parser.add_argument("partitions", nargs="*", help="New CSV or Parquet files")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--output", help="Results table file (.csv)")
+    args = parser.parse_args()
+
+    for partition in args.partitions:
+        merged = ingest_partition(args.state, partition)
+        print(f"{partition}: {'merged' if merged else 'already ingested'}")
+
+    table = refresh_results(args.state, alpha=args.alpha)
+    if args.output:
+        table.to_csv(args.output, index=False)
+    print(table.to_string(index=False))
@@ -1,9 +1,25 @@
+import hashlib
+import os
+import re
+import time
+import warnings
 from pathlib import Path
 import pandas as pd
 
+# Explicit column types for the Cookie Cats export
+SCHEMA = {
+    "userid": "uint32",
+    "version": "category",
+    "sum_gamerounds": "int32",
+    "retention_1": "bool",
+    "retention_7": "bool",
+}
 
-# Load the Cookie Cats dataset
-def load_cookiecats(csv_path: str | None = None) -> pd.DataFrame:
+CACHE_FORMATS = ("parquet", "feather")
+
+
+# Locate the Cookie Cats CSV
+def find_cookiecats(csv_path: str | None = None) -> Path:
     if csv_path:
         path = Path(csv_path)
     else:
@@ -21,6 +37,163 @@ def load_cookiecats(csv_path: str | None = None) -> pd.DataFrame:
         raise FileNotFoundError(
             "cookie_cats.csv not found. Pass csv_path or place in repo/data."
         )
-    df = pd.read_csv(path)
+    return path
+
+
+def content_fingerprint(path: Path) -> str:
+    """Identify a file by a hash of its bytes alone, ignoring size and mtime."""
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: Path, hash_content: bool = False) -> str:
+    """
+    Identify a file version by its size and modification time.
+
+    Args:
+        path (Path): File to fingerprint.
+        hash_content (bool): Hash the file bytes instead, which survives
+            checkouts and copies that change the mtime.
+    """
+    if hash_content:
+        return content_fingerprint(path)
+    stat = path.stat()
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def _read_cache(cache_path: Path, cache_format: str, columns):
+    if cache_format == "parquet":
+        return pd.read_parquet(cache_path, columns=columns)
+    return pd.read_feather(cache_path, columns=columns)
+
+
+def _write_cache(df: pd.DataFrame, cache_path: Path, cache_format: str):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # A per-process temp name keeps concurrent loaders from sharing one file
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        if cache_format == "parquet":
+            df.to_parquet(tmp_path, index=False)
+        else:
+            df.to_feather(tmp_path)
+        tmp_path.replace(cache_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _prune_cache(cache_dir: Path, stem: str, key: str):
+    # Drop columnar copies of earlier versions of the same CSV
+    pattern = re.compile(rf"{re.escape(stem)}-([0-9a-f]{{16}})\.(parquet|feather)")
+    for old in cache_dir.iterdir():
+        match = pattern.fullmatch(old.name)
+        if match and match.group(1) != key:
+            old.unlink(missing_ok=True)
+
+
+def read_cookiecats_csv(path: Path, columns=None, **kwargs) -> pd.DataFrame:
+    """Parse the CSV with the explicit schema, optionally selecting columns."""
+    dtype = {col: kind for col, kind in SCHEMA.items() if not columns or col in columns}
+    return pd.read_csv(path, usecols=columns, dtype=dtype, **kwargs)
+
+
+def iter_cookiecats(
+    path: str | None = None,
+    chunksize: int = 1_000_000,
+    columns: list[str] | None = None,
+):
+    """
+    Yield typed chunks of at most `chunksize` rows from a CSV or Parquet export.
+
+    Parquet files are read batch by batch, so peak memory is bounded by the
+    chunk size rather than by the file size.
+    """
+    path = find_cookiecats(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(
+            batch_size=chunksize, columns=columns
+        ):
+            chunk = batch.to_pandas()
+            yield chunk.astype({c: SCHEMA[c] for c in chunk.columns if c in SCHEMA})
+    else:
+        yield from read_cookiecats_csv(path, columns=columns, chunksize=chunksize)
+
+
+# Load the Cookie Cats dataset
+def load_cookiecats(
+    csv_path: str | None = None,
+    columns: list[str] | None = None,
+    cache: bool = True,
+    cache_format: str = "parquet",
+    hash_content: bool = False,
+    report: bool = False,
+) -> pd.DataFrame:
+    """
+    Load the Cookie Cats dataset with compact column types.
+
+    The first load parses the CSV and stores a columnar copy under a
+    `.cache` folder next to it, keyed on the CSV fingerprint. Later loads
+    of the unchanged CSV read the columnar copy instead, and copies made
+    for earlier versions of the CSV are deleted when a new one is written.
+    Load time, memory footprint and cache use are recorded in `df.attrs`.
+
+    Args:
+        csv_path (str | None): Path to the CSV. Searches the repo if omitted.
+        columns (list[str] | None): Columns to load. Loads all if omitted.
+        cache (bool): Read and write the columnar cache (needs pyarrow). If
+            the cache cannot be read or written, e.g. in a read-only data
+            directory, the CSV is parsed instead with a warning.
+        cache_format (str): "parquet" or "feather".
+        hash_content (bool): Include the file bytes in the cache key.
+        report (bool): Print load time and memory footprint.
+    """
+    if cache_format not in CACHE_FORMATS:
+        raise ValueError(f"cache_format must be one of {CACHE_FORMATS}")
+
+    start = time.perf_counter()
+    path = find_cookiecats(csv_path)
+    cache_hit = False
+
+    if cache:
+        key = file_fingerprint(path, hash_content=hash_content)
+        cache_path = path.parent / ".cache" / f"{path.stem}-{key}.{cache_format}"
+        try:
+            if cache_path.exists():
+                df = _read_cache(cache_path, cache_format, columns)
+                cache_hit = True
+            else:
+                # Cache every column so any later column selection can reuse it
+                df = read_cookiecats_csv(path)
+                try:
+                    _write_cache(df, cache_path, cache_format)
+                    _prune_cache(cache_path.parent, path.stem, key)
+                except OSError as exc:
+                    # e.g. a read-only data directory; the parsed CSV is still good
+                    warnings.warn(f"Columnar cache not written: {exc}", stacklevel=2)
+                if columns:
+                    df = df[columns]
+        except (ImportError, OSError) as exc:
+            warnings.warn(f"Columnar cache disabled: {exc}", stacklevel=2)
+            cache = False
+
+    if not cache:
+        df = read_cookiecats_csv(path, columns=columns)
+
+    df.attrs["load_seconds"] = time.perf_counter() - start
+    df.attrs["memory_bytes"] = int(df.memory_usage(deep=True).sum())
+    df.attrs["cache_hit"] = cache_hit
+
+    if report:
+        print(
+            f"Loaded {len(df):,} rows in {df.attrs['load_seconds'] * 1000:.1f} ms "
+            f"({df.attrs['memory_bytes'] / 2**20:.2f} MiB, "
+            f"{'cache' if cache_hit else 'csv'})"
+        )
 
     return df
@@ -0,0 +1,231 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri, stdtr, stdtrit
+
+from .stats import correct_pvals, mannwhitneyu_from_counts
+from .summary import BINARY_COLS, CONTROL, GroupSummary, _sample_var, as_summary
+
+PAIRINGS = ("control", "all")
+
+
+def arm_pairs(groups, control=CONTROL, pairs="control", arms=None):
+    """
+    Row indices of the compared arms in `groups`.
+
+    Args:
+        groups (tuple): Group labels of the summary.
+        control (str): Control arm, the reference of every "control" pair.
+        pairs (str): "control" for every arm vs. control, "all" for all pairs.
+        arms (list | None): Arms to include, all groups if omitted. At
+            least two are needed.
+
+    Returns:
+        tuple: Reference and compared arm indices, as two arrays.
+    """
+    if pairs not in PAIRINGS:
+        raise ValueError(f"pairs must be one of {PAIRINGS}")
+    index = [groups.index(arm) for arm in (arms or groups)]
+    if len(set(index)) < 2:
+        raise ValueError(
+            f"Need at least two arms to compare, got {[groups[i] for i in index]}"
+        )
+
+    if pairs == "control":
+        ref = groups.index(control)
+        others = [i for i in index if i != ref]
+        return np.full(len(others), ref), np.array(others, dtype=int)
+
+    # Control first, so it is the reference of all its pairs
+    if control in groups and groups.index(control) in index:
+        index.remove(groups.index(control))
+        index.insert(0, groups.index(control))
+    ref, other = zip(*combinations(index, 2))
+    return np.array(ref), np.array(other)
+
+
+def _frame(summary, ref, other, metric, **columns):
+    return pd.DataFrame(
+        {
+            "Metric": metric,
+            "Reference": [summary.groups[i] for i in ref],
+            "Arm": [summary.groups[j] for j in other],
+            **columns,
+        }
+    )
+
+
+def proportion_comparisons(
+    df,
+    metric: str,
+    control: str = CONTROL,
+    pairs: str = "control",
+    alpha: float = 0.05,
+    arms=None,
+) -> pd.DataFrame:
+    """
+    Two-proportion z-tests for every compared pair in one vectorized pass.
+
+    The z statistic uses the pooled rate like `test_two_prop_z`, with the
+    sign of arm - reference; the interval is the unpooled Wald interval.
+
+    Args:
+        df (pd.DataFrame | GroupSummary): Data or summary with k arms.
+        metric (str): Binary metric, e.g. "retention_7".
+        control (str): Control arm.
+        pairs (str): "control" or "all".
+        alpha (float): Significance level for the intervals.
+        arms (list | None): Arms to include, all if omitted.
+    """
+    summary = as_summary(df)
+    ref, other = arm_pairs(summary.groups, control, pairs, arms)
+
+    n = summary.n.astype(float)
+    successes = summary.successes[metric].astype(float)
+    rate = successes / n
+
+    delta = rate[other] - rate[ref]
+    pooled = (successes[ref] + successes[other]) / (n[ref] + n[other])
+    z_stat = delta / np.sqrt(pooled * (1 - pooled) * (1 / n[ref] + 1 / n[other]))
+    se = np.sqrt(
+        rate[ref] * (1 - rate[ref]) / n[ref]
+        + rate[other] * (1 - rate[other]) / n[other]
+    )
+    margin = ndtri(1 - alpha / 2) * se
+
+    return _frame(
+        summary,
+        ref,
+        other,
+        metric,
+        **{
+            "Reference value": rate[ref],
+            "Arm value": rate[other],
+            "Absolute Δ": delta,
+            "CI low": delta - margin,
+            "CI high": delta + margin,
+            "Test": "two-proportion z",
+            "Statistic": z_stat,
+            "p-value": 2 * ndtr(-np.abs(z_stat)),
+        },
+    )
+
+
+def engagement_comparisons(
+    df,
+    control: str = CONTROL,
+    pairs: str = "control",
+    alpha: float = 0.05,
+    arms=None,
+) -> pd.DataFrame:
+    """
+    Game round comparisons for every compared pair.
+
+    Mann-Whitney U tests run on the stacked per-arm histograms at once and
+    Welch's t-tests on the log-scale moments, so no raw sample is touched.
+
+    Args:
+        df (pd.DataFrame | GroupSummary): Data or summary with k arms.
+        control (str): Control arm.
+        pairs (str): "control" or "all".
+        alpha (float): Significance level for the Welch intervals.
+        arms (list | None): Arms to include, all if omitted.
+    """
+    summary = as_summary(df)
+    ref, other = arm_pairs(summary.groups, control, pairs, arms)
+    n = summary.n.astype(float)
+
+    # Mann-Whitney U on raw game rounds, one row of counts per pair
+    u_stat, pval_rounds = mannwhitneyu_from_counts(
+        summary.hist[ref], summary.hist[other]
+    )
+    mean = summary.value_sum / n
+    rounds = _frame(
+        summary,
+        ref,
+        other,
+        "sum_gamerounds",
+        **{
+            "Reference value": mean[ref],
+            "Arm value": mean[other],
+            "Absolute Δ": mean[other] - mean[ref],
+            "CI low": np.nan,
+            "CI high": np.nan,
+            "Test": "Mann-Whitney U",
+            "Statistic": u_stat,
+            "p-value": pval_rounds,
+        },
+    )
+
+    # Welch's t-test on log-transformed game rounds
+    log_mean = summary.log_sum / n
+    log_var = _sample_var(summary.log_sum, summary.log_sumsq, n) / n
+    delta = log_mean[other] - log_mean[ref]
+    se = np.sqrt(log_var[ref] + log_var[other])
+    dof = se**4 / (
+        log_var[ref] ** 2 / (n[ref] - 1) + log_var[other] ** 2 / (n[other] - 1)
+    )
+    t_stat = delta / se
+    margin = stdtrit(dof, 1 - alpha / 2) * se
+    log_rounds = _frame(
+        summary,
+        ref,
+        other,
+        "log sum_gamerounds",
+        **{
+            "Reference value": log_mean[ref],
+            "Arm value": log_mean[other],
+            "Absolute Δ": delta,
+            "CI low": delta - margin,
+            "CI high": delta + margin,
+            "Test": "Welch t",
+            "Statistic": t_stat,
+            "p-value": 2 * stdtr(dof, -np.abs(t_stat)),
+        },
+    )
+
+    return pd.concat([rounds, log_rounds], ignore_index=True)
+
+
+def compare_arms(
+    df,
+    control: str = CONTROL,
+    metrics=None,
+    pairs: str = "control",
+    alpha: float = 0.05,
+    correction: str = "holm",
+    engagement: bool = True,
+    arms=None,
+) -> pd.DataFrame:
+    """
+    All comparisons of a multi-arm experiment as one corrected family.
+
+    Args:
+        df (pd.DataFrame | GroupSummary): Data or summary with k arms.
+        control (str): Control arm.
+        metrics (list | None): Binary metrics, the retention columns if omitted.
+        pairs (str): "control" for every arm vs. control, "all" for all pairs.
+        alpha (float): Family-wise (or FDR for "bh") significance level.
+        correction (str): "holm", "bonferroni" or "bh".
+        engagement (bool): Include the game round comparisons.
+        arms (list | None): Arms to include, all if omitted.
+
+    Returns:
+        pd.DataFrame: One row per metric and pair with raw and adjusted p-values.
+    """
+    summary: GroupSummary = as_summary(df)
+    metrics = metrics or [col for col in BINARY_COLS if col in summary.successes]
+    options = dict(control=control, pairs=pairs, alpha=alpha, arms=arms)
+
+    tables = [proportion_comparisons(summary, metric, **options) for metric in metrics]
+    if engagement:
+        tables.append(engagement_comparisons(summary, **options))
+    table = pd.concat(tables, ignore_index=True)
+
+    reject, adjusted, *_ = correct_pvals(
+        table["p-value"].to_numpy(), alpha=alpha, method=correction
+    )
+    table["Adjusted p-value"] = adjusted
+    table["Significant?"] = np.where(reject, "Yes", "No")
+    return table
@@ -0,0 +1,258 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtri
+
+from .bootstrap import DEFAULT_MAX_BLOCK_BYTES, as_counts, weighted_statistic
+from .results import PermutationResult
+from .summary import BINARY_COLS, CONTROL, TREATMENT, VALUE_COL, as_summary
+
+ALTERNATIVES = ("two-sided", "greater", "less")
+
+# Permutations per block, the unit of parallel work and of early stopping
+BLOCK_SIZE = 1000
+
+# Relative tolerance for counting permuted statistics tied with the observed one
+TIE_RTOL = 1e-12
+
+
+def _pool(samples):
+    # Both samples as counts over one shared grid of sorted distinct values
+    (values_ctrl, counts_ctrl), (values_treat, counts_treat) = samples
+    values = np.union1d(values_ctrl, values_treat)
+    pooled = np.zeros(len(values), dtype=np.int64)
+    np.add.at(pooled, np.searchsorted(values, values_ctrl), counts_ctrl)
+    treat = np.zeros(len(values), dtype=np.int64)
+    np.add.at(treat, np.searchsorted(values, values_treat), counts_treat)
+    return values, pooled + treat, treat
+
+
+def _difference(values, pooled, treat, statistic, trim):
+    # Statistic of treatment - control, for one or a block of label assignments
+    ctrl = pooled - treat
+    return weighted_statistic(values, treat, statistic, trim) - weighted_statistic(
+        values, ctrl, statistic, trim
+    )
+
+
+def _permutation_block(task, size, seed):
+    """
+    Count permuted statistics at or beyond the observed one for one block.
+
+    Shuffling group labels leaves the pooled sample unchanged, so each
+    permutation is a multivariate hypergeometric draw of the treatment
+    counts from the pooled counts.
+    """
+    values, pooled, n_treat, statistic, trim, observed = task
+    rng = np.random.default_rng(seed)
+    treat = rng.multivariate_hypergeometric(pooled, n_treat, size=size)
+    diff = _difference(values, pooled, treat, statistic, trim)
+
+    tol = TIE_RTOL * max(abs(observed), 1.0)
+    return (
+        np.count_nonzero(diff >= observed - tol),
+        np.count_nonzero(diff <= observed + tol),
+    )
+
+
+def _pvalue(greater, less, n, alternative):
+    # Monte Carlo p-value with the observed labelling counted as a permutation
+    p_greater, p_less = (greater + 1) / (n + 1), (less + 1) / (n + 1)
+    if alternative == "greater":
+        return p_greater, math.sqrt(p_greater * (1 - p_greater) / n)
+    if alternative == "less":
+        return p_less, math.sqrt(p_less * (1 - p_less) / n)
+    p_min = min(p_greater, p_less)
+    return min(1.0, 2 * p_min), 2 * math.sqrt(p_min * (1 - p_min) / n)
+
+
+def _block_results(task, sizes, seeds, executor, max_workers):
+    # Per-block results in block order, computing at most one wave ahead
+    if executor is None:
+        for size, seed in zip(sizes, seeds):
+            yield _permutation_block(task, size, seed)
+        return
+
+    wave = 2 * max_workers
+    for start in range(0, len(sizes), wave):
+        futures = [
+            executor.submit(_permutation_block, task, size, seed)
+            for size, seed in zip(
+                sizes[start : start + wave], seeds[start : start + wave]
+            )
+        ]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def permutation_test(
+    rounds_ctrl,
+    rounds_treat,
+    statistic: str = "mean",
+    n_perm: int = 10_000,
+    alternative: str = "two-sided",
+    precision: float | None = None,
+    confidence: float = 0.99,
+    max_seconds: float | None = None,
+    seed=42,
+    trim: float = 0.1,
+    max_workers: int | None = 1,
+    executor=None,
+    max_block_bytes: int = DEFAULT_MAX_BLOCK_BYTES,
+) -> PermutationResult:
+    """
+    Two-sample permutation test of treatment - control.
+
+    Permutations are drawn in blocks as counts over the distinct values, so
+    the cost depends on the number of distinct values rather than on the
+    sample size. Every block has its own stream spawned from one
+    SeedSequence and blocks are evaluated in order, so the p-value only
+    depends on `seed`, `n_perm` and the data, never on the number of
+    workers. With `precision`, sampling stops after the first block at
+    which the Monte Carlo confidence half-width of the p-value is below it.
+
+    Args:
+        rounds_ctrl (array-like | tuple): Control observations or a
+            `(values, counts)` histogram.
+        rounds_treat (array-like | tuple): Treatment observations or histogram.
+        statistic (str): "mean", "median" or "trimmed_mean".
+        n_perm (int): Maximum number of permutations.
+        alternative (str): "two-sided", "greater" or "less".
+        precision (float | None): Target half-width of the p-value.
+        confidence (float): Confidence level of that half-width.
+        max_seconds (float | None): Stop after the block that exceeds this
+            wall time. Results then depend on machine speed.
+        seed (int | np.random.SeedSequence): Random seed.
+        trim (float): Proportion cut from each end for the trimmed mean.
+        max_workers (int | None): Worker processes, all cores if None.
+        executor (concurrent.futures.Executor | None): Pool to reuse across tests.
+        max_block_bytes (int): Memory budget for one block of permutations.
+    """
+    if alternative not in ALTERNATIVES:
+        raise ValueError(f"alternative must be one of {ALTERNATIVES}")
+    if n_perm < 1:
+        raise ValueError("n_perm must be at least 1")
+
+    values, pooled, treat = _pool([as_counts(rounds_ctrl), as_counts(rounds_treat)])
+    observed = float(_difference(values, pooled, treat, statistic, trim))
+    task = (values, pooled, int(treat.sum()), statistic, trim, observed)
+
+    block = max(1, min(n_perm, BLOCK_SIZE, max_block_bytes // (16 * len(values))))
+    sizes = [block] * (n_perm // block) + ([n_perm % block] if n_perm % block else [])
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(len(sizes))
+    z = ndtri(1 - (1 - confidence) / 2)
+
+    max_workers = max_workers or os.cpu_count()
+    own_executor = executor is None and max_workers > 1
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    start = time.perf_counter()
+    greater = less = n = 0
+    stopped_early = False
+    try:
+        blocks = _block_results(task, sizes, seeds, executor, max_workers)
+        for size, (block_greater, block_less) in zip(sizes, blocks):
+            greater, less, n = greater + block_greater, less + block_less, n + size
+            pval, mc_se = _pvalue(greater, less, n, alternative)
+            resolved = precision is not None and z * mc_se <= precision
+            elapsed = time.perf_counter() - start
+            timed_out = max_seconds is not None and elapsed > max_seconds
+            if n < n_perm and (resolved or timed_out):
+                stopped_early = True
+                break
+        blocks.close()
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+
+    return PermutationResult(observed, pval, n, mc_se, stopped_early)
+
+
+def _binary_histogram(summary, col, group):
+    # A binary metric as counts of zeros and ones
+    n, successes = summary.count(group), summary.success(col, group)
+    return np.array([0.0, 1.0]), np.array([n - successes, successes])
+
+
+def permutation_tests(
+    df,
+    metrics=None,
+    control: str = CONTROL,
+    treatment: str = TREATMENT,
+    statistic: str = "mean",
+    max_workers: int | None = None,
+    seed=42,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Permutation tests for the retention metrics and game rounds.
+
+    Retention metrics are compared as 0/1 histograms and game rounds with
+    `statistic`. All tests share one process pool and get independent
+    streams spawned from `seed`.
+
+    Args:
+        df (pd.DataFrame | GroupSummary): Data or summary.
+        metrics (list | None): Binary metrics, the retention columns if omitted.
+        control (str): Control group label.
+        treatment (str): Treatment group label.
+        statistic (str): Game round statistic, "mean", "median" or "trimmed_mean".
+        max_workers (int | None): Worker processes, all cores if None.
+        seed (int): Random seed.
+        **kwargs: Passed to `permutation_test`, e.g. n_perm or precision.
+
+    Returns:
+        pd.DataFrame: One row per metric with observed difference and p-value.
+    """
+    summary = as_summary(df)
+    metrics = metrics or [col for col in BINARY_COLS if col in summary.successes]
+
+    groups = (control, treatment)
+    samples = {
+        col: [_binary_histogram(summary, col, g) for g in groups] for col in metrics
+    }
+    samples[VALUE_COL] = [summary.histogram(control), summary.histogram(treatment)]
+    seeds = np.random.SeedSequence(seed).spawn(len(samples))
+
+    max_workers = max_workers or os.cpu_count()
+    executor = ProcessPoolExecutor(max_workers) if max_workers > 1 else None
+    rows = []
+    try:
+        for (metric, (ctrl, treat)), child in zip(samples.items(), seeds):
+            stat = "mean" if metric in metrics else statistic
+            result = permutation_test(
+                ctrl,
+                treat,
+                stat,
+                seed=child,
+                max_workers=max_workers,
+                executor=executor,
+                **kwargs,
+            )
+            rows.append(
+                {
+                    "Metric": metric,
+                    "Statistic": stat,
+                    "Observed Δ": result.observed,
+                    "p-value": result.pval,
+                    "Monte Carlo SE": result.mc_se,
+                    "Permutations": result.n_perm,
+                    "Stopped early?": "Yes" if result.stopped_early else "No",
+                }
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return pd.DataFrame(rows)
@@ -0,0 +1,351 @@
+import hashlib
+import os
+import pickle
+import time
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from .io import file_fingerprint, find_cookiecats, load_cookiecats
+from .stats import (
+    bootstrap_mean_diff,
+    calculate_engagement_stats,
+    correct_pvals,
+    solve_mde,
+    solve_required_n,
+    test_game_rounds,
+    test_srm_chi2,
+    test_two_prop_z,
+)
+from .summary import CONTROL, TREATMENT, summarize
+from .tables import build_results_table
+
+# Modules whose source is part of every cache key; tables.py is left out so
+# formatting changes reuse cached results
+CODE_MODULES = ("stats", "summary", "bootstrap", "power", "planning", "results")
+
+DEFAULT_PARAMS = {
+    "csv_path": None,
+    "alpha": 0.05,
+    "power": 0.80,
+    "n_boot": 5000,
+    "seed": 42,
+    "control": CONTROL,
+    "treatment": TREATMENT,
+}
+
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+_MISSING = object()
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of pickled stage results.
+
+    Entries are stored as `<root>/<key[:2]>/<key>.pkl`. Reads refresh an
+    entry's modification time, and writes evict the least recently used
+    entries once the cache grows beyond `max_bytes`.
+
+    Args:
+        root (str | Path): Cache directory.
+        max_bytes (int): Size budget for all entries.
+    """
+
+    def __init__(self, root, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str, default=None):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return default
+        os.utime(path)
+        return value
+
+    def put(self, key: str, value):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+        self.evict()
+
+    def size(self) -> int:
+        return sum(p.stat().st_size for p in self.root.glob("*/*.pkl"))
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits `max_bytes`."""
+        entries = [(p.stat(), p) for p in self.root.glob("*/*.pkl")]
+        total = sum(stat.st_size for stat, _ in entries)
+        for stat, path in sorted(entries, key=lambda e: e[0].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+    def clear(self):
+        for path in self.root.glob("*/*.pkl"):
+            path.unlink()
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One pipeline step.
+
+    Attributes:
+        name (str): Stage name, used by other stages to declare inputs.
+        func (Callable): Called as `func(*input values, **declared params)`.
+        inputs (tuple): Names of the stages whose results are passed in.
+        params (tuple): Names of the run parameters passed as keywords.
+        fingerprint (Callable | None): Extra key material from the params,
+            e.g. a dataset fingerprint.
+        cache (bool): Store the result on disk.
+    """
+
+    name: str
+    func: Callable
+    inputs: tuple = ()
+    params: tuple = ()
+    fingerprint: Callable | None = None
+    cache: bool = True
+
+
+def code_fingerprint(modules=CODE_MODULES) -> str:
+    """Hash of the source files of the given cookiecats modules."""
+    digest = hashlib.blake2b(digest_size=16)
+    package = Path(__file__).parent
+    for module in modules:
+        digest.update((package / f"{module}.py").read_bytes())
+    return digest.hexdigest()
+
+
+class Pipeline:
+    """
+    Lazily evaluated stages with results cached by content.
+
+    A stage's key hashes its name, the analysis code, its declared params,
+    its fingerprint and the keys of its inputs, so keys are known before
+    anything runs. A stage is only computed, and its inputs only
+    evaluated, when its key is not in the cache. A fully cached run
+    therefore never reads the dataset.
+
+    Args:
+        stages (list[Stage]): Pipeline steps.
+        cache (ResultCache | None): Result cache, nothing is stored if omitted.
+    """
+
+    def __init__(self, stages, cache: ResultCache | None = None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache = cache
+        self.code_hash = code_fingerprint()
+        self.last_run = pd.DataFrame()
+
+    def key(self, name: str, params: dict, keys: dict | None = None) -> str:
+        keys = {} if keys is None else keys
+        if name not in keys:
+            stage = self.stages[name]
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(f"{name}:{self.code_hash}".encode())
+            for dep in stage.inputs:
+                digest.update(self.key(dep, params, keys).encode())
+            for param in stage.params:
+                digest.update(f"{param}={params[param]!r}".encode())
+            if stage.fingerprint is not None:
+                digest.update(stage.fingerprint(params).encode())
+            keys[name] = digest.hexdigest()
+        return keys[name]
+
+    def _evaluate(self, name, params, keys, values, log):
+        if name in values:
+            return values[name]
+
+        stage = self.stages[name]
+        key = self.key(name, params, keys)
+        use_cache = stage.cache and self.cache is not None
+
+        value = self.cache.get(key, _MISSING) if use_cache else _MISSING
+        if value is _MISSING:
+            args = [
+                self._evaluate(dep, params, keys, values, log) for dep in stage.inputs
+            ]
+            start = time.perf_counter()
+            value = stage.func(*args, **{p: params[p] for p in stage.params})
+            seconds = time.perf_counter() - start
+            if use_cache:
+                self.cache.put(key, value)
+            log.append(dict(Stage=name, Status="computed", Seconds=seconds))
+        else:
+            log.append(dict(Stage=name, Status="cached", Seconds=0.0))
+
+        values[name] = value
+        return value
+
+    def run(self, params: dict | None = None, targets=None) -> dict:
+        """
+        Evaluate the target stages (all stages if omitted).
+
+        Per-stage status and compute time are kept in `last_run`.
+
+        Returns:
+            dict: Stage name -> result for the targets.
+        """
+        params = {**DEFAULT_PARAMS, **(params or {})}
+        targets = list(self.stages) if targets is None else list(targets)
+        keys, values, log = {}, {}, []
+        results = {
+            name: self._evaluate(name, params, keys, values, log) for name in targets
+        }
+        self.last_run = pd.DataFrame(log)
+        return results
+
+
+def _load(csv_path):
+    return load_cookiecats(csv_path)
+
+
+def _dataset_fingerprint(params):
+    return file_fingerprint(find_cookiecats(params["csv_path"]))
+
+
+def _srm(summary, control, treatment):
+    return test_srm_chi2(summary.count(control), summary.count(treatment))
+
+
+def _baseline(summary, control):
+    return summary.rate("retention_7", control)
+
+
+def _mde(summary, p0, alpha, power, control):
+    return solve_mde(summary, alpha, power, p0, control=control)
+
+
+def _required_n(p0, alpha, power):
+    return solve_required_n(alpha, power, p0)
+
+
+def _retention_test(summary, p0, col, alpha, control, treatment):
+    ctrl, treat = summary.count(control), summary.count(treatment)
+    return test_two_prop_z(
+        summary, ctrl, treat, col, alpha, p0, control=control, treatment=treatment
+    )
+
+
+def _bootstrap(summary, n_boot, seed, control, treatment):
+    return bootstrap_mean_diff(
+        summary.histogram(control),
+        summary.histogram(treatment),
+        n_boot=n_boot,
+        seed=seed,
+    )
+
+
+def _guardrail_adj(ret1, rounds, alpha):
+    return correct_pvals(ret1.pval, rounds.pval_rounds, rounds.pval_log, alpha=alpha)
+
+
+def _table(ret1, ret7, rounds, bootstrap, guardrail_adj, engagement, **kwargs):
+    return build_results_table(
+        ret1, ret7, rounds, bootstrap, guardrail_adj, engagement, **kwargs
+    )
+
+
+LABELS = ("control", "treatment")
+
+ANALYSIS_STAGES = [
+    Stage(
+        "data",
+        _load,
+        params=("csv_path",),
+        fingerprint=_dataset_fingerprint,
+        cache=False,
+    ),
+    Stage("summary", summarize, inputs=("data",)),
+    Stage("srm", _srm, inputs=("summary",), params=LABELS),
+    Stage("p0", _baseline, inputs=("summary",), params=("control",)),
+    Stage("mde", _mde, inputs=("summary", "p0"), params=("alpha", "power", "control")),
+    Stage("required_n", _required_n, inputs=("p0",), params=("alpha", "power")),
+    Stage(
+        "ret7",
+        partial(_retention_test, col="retention_7"),
+        inputs=("summary", "p0"),
+        params=("alpha", *LABELS),
+    ),
+    Stage(
+        "ret1",
+        partial(_retention_test, col="retention_1"),
+        inputs=("summary", "p0"),
+        params=("alpha", *LABELS),
+    ),
+    Stage("engagement", calculate_engagement_stats, inputs=("summary",), params=LABELS),
+    Stage("rounds", test_game_rounds, inputs=("summary",), params=LABELS),
+    Stage(
+        "bootstrap",
+        _bootstrap,
+        inputs=("summary",),
+        params=("n_boot", "seed", *LABELS),
+    ),
+    Stage(
+        "guardrail_adj", _guardrail_adj, inputs=("ret1", "rounds"), params=("alpha",)
+    ),
+    # Formatting only, always rebuilt from the cached results
+    Stage(
+        "table",
+        _table,
+        inputs=("ret1", "ret7", "rounds", "bootstrap", "guardrail_adj", "engagement"),
+        params=("alpha", *LABELS),
+        cache=False,
+    ),
+]
+
+
+def run_analysis(
+    csv_path: str | None = None,
+    cache_dir=None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    targets=None,
+    report: bool = False,
+    **params,
+) -> dict:
+    """
+    Run the notebook analysis through the cached pipeline.
+
+    Results are cached under `<csv dir>/.cache/results` unless `cache_dir`
+    is given. Changing alpha, power, n_boot, seed, the dataset or the
+    analysis code recomputes only the affected stages; changes to the
+    results table formatting reuse every cached result.
+
+    Args:
+        csv_path (str | None): Path to the CSV. Searches the repo if omitted.
+        cache_dir (str | Path | None): Result cache directory.
+        max_bytes (int): Size budget of the result cache.
+        targets (list[str] | None): Stages to evaluate, all if omitted.
+        report (bool): Print per-stage cache use and compute time.
+        **params: Overrides of `DEFAULT_PARAMS`, e.g. alpha=0.01.
+
+    Returns:
+        dict: Stage name -> result, e.g. "srm", "ret7", "bootstrap", "table".
+    """
+    if cache_dir is None:
+        cache_dir = find_cookiecats(csv_path).parent / ".cache" / "results"
+    pipeline = Pipeline(ANALYSIS_STAGES, ResultCache(cache_dir, max_bytes))
+    if targets is None:
+        targets = [name for name in pipeline.stages if name != "data"]
+
+    start = time.perf_counter()
+    results = pipeline.run({**params, "csv_path": csv_path}, targets)
+    if report:
+        print(pipeline.last_run.to_string(index=False))
+        print(f"Pipeline finished in {time.perf_counter() - start:.3f} s")
+    return results
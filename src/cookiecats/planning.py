@@ -0,0 +1,119 @@
+from functools import lru_cache
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .power import critical_z, required_shift, cohens_h
+
+PLANNING_COLUMNS = [
+    "Baseline rate",
+    "Target MDE (pp)",
+    "Alpha",
+    "Power",
+    "Allocation ratio",
+    "Arms",
+]
+
+
+def required_n(
+    p0, mde_pp, alpha=0.05, power=0.80, ratio=1.0, n_arms=2, alternative="two-sided"
+):
+    """
+    Control group size needed to detect an absolute uplift, elementwise.
+
+    With more than two arms each treatment is compared with control at a
+    Bonferroni-adjusted alpha / (n_arms - 1). All arguments broadcast.
+
+    Args:
+        p0 (array-like): Baseline (control) rate.
+        mde_pp (array-like): Target absolute uplift in percentage points,
+            non-zero.
+        alpha (array-like): Family-wise significance level.
+        power (array-like): Target power.
+        ratio (array-like): Treatment size per arm as a multiple of control size.
+        n_arms (array-like): Number of arms including control, at least 2.
+        alternative (str): "two-sided", "larger" or "smaller".
+
+    Returns:
+        np.ndarray: Required control size (unrounded).
+    """
+    n_arms = np.asarray(n_arms)
+    if np.any(n_arms < 2):
+        raise ValueError("n_arms must be at least 2 (control and one treatment)")
+
+    p0 = np.asarray(p0, dtype=float)
+    p1 = np.clip(p0 + np.asarray(mde_pp, dtype=float) / 100.0, 1e-9, 1 - 1e-9)
+    h = np.abs(cohens_h(p1, p0))
+    if np.any(h == 0):
+        raise ValueError("mde_pp must be non-zero and move p0 to a different rate")
+    crit = critical_z(np.asarray(alpha) / (n_arms - 1), alternative)
+    n_eff = (required_shift(crit, power, alternative) / h) ** 2
+    return n_eff * (1 + ratio) / ratio
+
+
+@lru_cache(maxsize=128)
+def _planning_grid(p0s, mdes, alphas, powers, ratios, arms, alternative):
+    grid = pd.DataFrame(
+        list(product(p0s, mdes, alphas, powers, ratios, arms)), columns=PLANNING_COLUMNS
+    )
+    n_ctrl = np.ceil(
+        required_n(
+            grid["Baseline rate"].to_numpy(),
+            grid["Target MDE (pp)"].to_numpy(),
+            alpha=grid["Alpha"].to_numpy(),
+            power=grid["Power"].to_numpy(),
+            ratio=grid["Allocation ratio"].to_numpy(),
+            n_arms=grid["Arms"].to_numpy(),
+            alternative=alternative,
+        )
+    )
+    n_treat = np.ceil(n_ctrl * grid["Allocation ratio"].to_numpy())
+    grid["Required N control"] = n_ctrl.astype(np.int64)
+    grid["Required N per treatment"] = n_treat.astype(np.int64)
+    grid["Required N total"] = (n_ctrl + (grid["Arms"] - 1) * n_treat).astype(np.int64)
+    return grid
+
+
+def planning_table(
+    p0,
+    mde_pp,
+    alpha=(0.05,),
+    power=(0.80,),
+    ratio=(1.0,),
+    n_arms=(2,),
+    alternative="two-sided",
+) -> pd.DataFrame:
+    """
+    Required sample sizes for every combination of the planning parameters.
+
+    The grid is evaluated in one vectorized call. Results are memoized on
+    the parameter values, so repeated requests for the same grid are free.
+    Scalars and sequences are both accepted for every parameter.
+    """
+
+    def as_key(values):
+        return tuple(float(v) for v in np.atleast_1d(values))
+
+    grid = _planning_grid(
+        as_key(p0),
+        as_key(mde_pp),
+        as_key(alpha),
+        as_key(power),
+        as_key(ratio),
+        tuple(int(k) for k in np.atleast_1d(n_arms)),
+        alternative,
+    )
+    # Hand out a copy so callers cannot modify the cached table
+    return grid.copy()
+
+
+def export_planning_table(table: pd.DataFrame, path) -> Path:
+    """Write a planning table to Parquet or CSV depending on the file suffix."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        table.to_parquet(path, index=False)
+    else:
+        table.to_csv(path, index=False)
+    return path
@@ -3,97 +3,152 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mtick
 import seaborn as sns
-from statsmodels.stats.power import NormalIndPower
-from statsmodels.stats.proportion import proportion_confint, proportion_effectsize
-from .stats import h_to_p1
+from cycler import cycler
+from .power import mde_pp, power_from_pp
+from .stats import wilson_ci
+from .summary import CONTROL, TREATMENT, as_summary, hist_quantile
 
+# Custom color palette
+PALETTE = ["#6B46C1", "#3182CE", "#63B3ED", "#BEE3F8", "#EBF8FF"]
 
-# Set uniform style for all plots
-def set_plot_style():
-    """Apply uniform style for plotting"""
+# Matplotlib parameters
+PLOT_RC = {
+    "figure.figsize": [5, 3],
+    "figure.dpi": 200,
+    "savefig.dpi": 600,
+    "font.size": 10,
+    "axes.titlesize": 9,
+    "axes.labelsize": 8,
+    "xtick.labelsize": 6,
+    "ytick.labelsize": 6,
+    "legend.fontsize": 6,
+    "grid.alpha": 0.3,
+}
 
-    # Matplotlib parameters
-    plt.rcParams["figure.figsize"] = [5, 3]
-    plt.rcParams["figure.dpi"] = 200
-    plt.rcParams["savefig.dpi"] = 600
-    plt.rcParams["font.size"] = 10
-    plt.rcParams["axes.titlesize"] = 9
-    plt.rcParams["axes.labelsize"] = 8
-    plt.rcParams["xtick.labelsize"] = 6
-    plt.rcParams["ytick.labelsize"] = 6
-    plt.rcParams["legend.fontsize"] = 6
-    plt.rcParams["grid.alpha"] = 0.3
 
-    # Seaborn style
-    sns.set_style("whitegrid")
+def plot_style() -> dict:
+    """Uniform plot style as rcParams, usable with plt.rc_context"""
+    return {
+        **sns.axes_style("whitegrid"),
+        **PLOT_RC,
+        "axes.prop_cycle": cycler(color=PALETTE),
+    }
 
-    # Set custom color palette
-    custom_palette = ["#6B46C1", "#3182CE", "#63B3ED", "#BEE3F8", "#EBF8FF"]
-    sns.set_palette(custom_palette)
 
+_style_applied = False
 
-set_plot_style()
+
+# Set uniform style for all plots
+def set_plot_style():
+    """Apply uniform style for plotting"""
+    global _style_applied
+    plt.rcParams.update(plot_style())
+    _style_applied = True
+
+
+def _get_axes(ax):
+    # Draw on the given Axes, or on a new pyplot figure that is shown at the end
+    if ax is not None:
+        return ax, False
+    # Style the global pyplot state on first use rather than at import
+    if not _style_applied:
+        set_plot_style()
+    _, ax = plt.subplots()
+    return ax, True
+
+
+def _finish(ax, show, tight=False):
+    if tight:
+        ax.figure.tight_layout()
+    if show:
+        plt.show()
+    return ax
+
+
+def _box_stats(values, counts, label, whis=1.5):
+    # Boxplot statistics from a histogram, as matplotlib.cbook.boxplot_stats
+    q1, med, q3 = hist_quantile(values, counts, [0.25, 0.5, 0.75])
+    low, high = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+    inside = (values >= low) & (values <= high)
+    return dict(
+        label=label,
+        med=med,
+        q1=q1,
+        q3=q3,
+        whislo=values[inside].min(),
+        whishi=values[inside].max(),
+        fliers=values[~inside],
+    )
 
 
 # Function to plot game rounds
-def plot_game_rounds(df: pd.DataFrame, lower_bound, upper_bound, log: bool = False):
+def plot_game_rounds(df, lower_bound, upper_bound, log: bool = False, ax=None):
     """
     Plot the distribution of game rounds by version.
 
+    Boxes are drawn from per-version histograms, so the cost depends on the
+    number of distinct game round values rather than on the number of players.
+
     Args:
-        df (pd.DataFrame): DataFrame containing the data to plot.
+        df (pd.DataFrame | GroupSummary): Data or summary to plot.
         lower_bound (int): Lower bound for the y-axis.
         upper_bound (int): Upper bound for the y-axis.
         log (bool): Whether to plot the log-transformed values.
+        ax (Axes | None): Axes to draw on, a new figure is shown if omitted.
     """
+    summary = as_summary(df)
+    ax, show = _get_axes(ax)
+
+    # Raw and log scale share the same histogram, log1p is monotonic
+    stats = []
+    for group in summary.groups:
+        values, counts = summary.histogram(group)
+        if log:
+            values = np.log1p(values)
+        stats.append(_box_stats(values, counts, group))
+
+    boxes = ax.bxp(
+        stats,
+        widths=0.5,
+        patch_artist=True,
+        boxprops=dict(linewidth=0.7, edgecolor="0.25"),
+        whiskerprops=dict(linewidth=0.7, color="0.25"),
+        capprops=dict(linewidth=0.7, color="0.25"),
+        medianprops=dict(linewidth=0.7, color="0.25"),
+        flierprops=dict(marker="o", markersize=5, markeredgecolor="0.25"),
+    )
+    for box, color in zip(boxes["boxes"], PALETTE):
+        box.set_facecolor(color)
+
     if not log:  # Raw scale
-        sns.boxplot(
-            x="version",
-            y="sum_gamerounds",
-            data=df,
-            hue="version",
-            width=0.5,
-            linewidth=0.7,
-        )
-        plt.title("Distribution of Game Rounds by Version")
-        plt.xlabel("Game Version")
-        plt.ylabel("Game Rounds")
-        plt.ylim(lower_bound, upper_bound * 2)
-        # plt.savefig("reports/figures/3.3_dist_of_game_rounds_by_version.png")
-        plt.show()
+        ax.set_title("Distribution of Game Rounds by Version")
+        ax.set_xlabel("Game Version")
+        ax.set_ylabel("Game Rounds")
+        ax.set_ylim(lower_bound, upper_bound * 2)
 
     else:
-        # Create a column to log-transform sum_gamerounds
-        df.loc[:, "log_sum_gamerounds"] = np.log1p(df["sum_gamerounds"])
-
-        # Plot game rounds distributions by version
-        sns.boxplot(
-            x="version",
-            y="log_sum_gamerounds",
-            data=df,
-            hue="version",
-            width=0.5,
-            linewidth=0.7,
-        )
-        plt.title("Distribution of Game Rounds by Version (log scale)")
-        plt.xlabel("Game Version")
-        plt.ylabel("Game Rounds (log scale)")
-        # plt.savefig("reports/figures/3.3_dist_of_game_rounds_by_version_log.png")
-        plt.show()
+        ax.set_title("Distribution of Game Rounds by Version (log scale)")
+        ax.set_xlabel("Game Version")
+        ax.set_ylabel("Game Rounds (log scale)")
+
+    return _finish(ax, show)
 
 
 # Function to plot assignment counts by version
-def plot_assignment_counts(df: pd.DataFrame):
+def plot_assignment_counts(df: pd.DataFrame, ax=None):
     """
     Plot the distribution of assignment counts by version.
 
     Args:
         df (pd.DataFrame): DataFrame containing the data to plot.
+        ax (Axes | None): Axes to draw on, a new figure is shown if omitted.
     """
-    ax = sns.countplot(x="version", data=df, hue="version", width=0.5)
-    plt.title("Assignment Counts by Version")
-    plt.xlabel("Game Version")
-    plt.ylabel("Number of Assignments")
+    ax, show = _get_axes(ax)
+
+    sns.countplot(x="version", data=df, hue="version", width=0.5, ax=ax)
+    ax.set_title("Assignment Counts by Version")
+    ax.set_xlabel("Game Version")
+    ax.set_ylabel("Number of Assignments")
 
     # Add value labels on top of each bar
     for p in ax.patches:
@@ -110,48 +165,37 @@ def plot_assignment_counts(df: pd.DataFrame):
             fontweight="bold",
         )
 
-    # plt.savefig("reports/figures/4.2_assignment_counts_by_version.png")
-    plt.show()
+    return _finish(ax, show)
 
 
 # Function to plot grouped bar with confidence intervals
-def plot_retention_rates(df: pd.DataFrame):
+def plot_retention_rates(df, control=CONTROL, treatment=TREATMENT, ax=None):
     # Build summary for both metrics
+    summary = as_summary(df)
     rows = []
     for col, label in [("retention_1", "Day-1"), ("retention_7", "Day-7")]:
-        agg = (
-            df.groupby("version")[col]
-            .agg(["sum", "count"])
-            .rename(columns={"sum": "successes", "count": "n"})
-        )
-        agg["rate"] = agg["successes"] / agg["n"]
-        agg[["ci_low", "ci_upp"]] = agg.apply(
-            lambda r: pd.Series(
-                proportion_confint(int(r["successes"]), int(r["n"]), method="wilson")
-            ),
-            axis=1,
-        )
-        agg = agg.loc[["gate_30", "gate_40"]]
-        for v in agg.index:
+        for v in [control, treatment]:
+            rate = summary.rate(col, v)
+            ci_low, ci_upp = wilson_ci(summary.success(col, v), summary.count(v))
             rows.append(
                 dict(
                     metric=label,
                     version=v,
-                    rate=agg.loc[v, "rate"],
-                    err_low=agg.loc[v, "rate"] - agg.loc[v, "ci_low"],
-                    err_upp=agg.loc[v, "ci_upp"] - agg.loc[v, "rate"],
+                    rate=rate,
+                    err_low=rate - ci_low,
+                    err_upp=ci_upp - rate,
                 )
             )
     out = pd.DataFrame(rows)
 
     colors = ["#6B46C1", "#3182CE"]  # Purple for Day-1, blue for Day-7
 
-    fig, ax = plt.subplots()
+    ax, show = _get_axes(ax)
     width = 0.35
-    x = np.arange(2)  # gate_30, gate_40
+    x = np.arange(2)  # control, treatment
 
     # Day-1 bars
-    d1 = out[out.metric == "Day-1"].sort_values("version")
+    d1 = out[out.metric == "Day-1"]
     bars1 = ax.bar(
         x - width / 2,
         d1["rate"],
@@ -177,7 +221,7 @@ def plot_retention_rates(df: pd.DataFrame):
         )
 
     # Day-7 bars
-    d7 = out[out.metric == "Day-7"].sort_values("version")
+    d7 = out[out.metric == "Day-7"]
     bars7 = ax.bar(
         x + width / 2,
         d7["rate"],
@@ -202,101 +246,85 @@ def plot_retention_rates(df: pd.DataFrame):
             fontweight="bold",
         )
 
-    ax.set_xticks(x, ["gate_30", "gate_40"])
+    ax.set_xticks(x, [control, treatment])
     ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0))
     ax.set_ylabel("Retention Rate")
     ax.set_title("Retention Rates by Version with 95% CI")
     ax.legend()
 
-    plt.tight_layout()
-    # plt.savefig("reports/figures/4.3_retention_rates_by_version_95_ci.png")
-    plt.show()
+    return _finish(ax, show, tight=True)
 
 
 # Function to plot histogram of player count - game rounds distribution
-def plot_game_rounds_dist(df: pd.DataFrame, log: bool = False):
-    if not log:  # Raw scale
-        # Plot histogram for control group (gate_30)
-        sns.histplot(
-            data=df[df["version"] == "gate_30"],
-            x="sum_gamerounds",
-            bins=50,
-            alpha=0.7,
-            label="Control (gate_30)",
-        )
+def plot_game_rounds_dist(
+    df,
+    log: bool = False,
+    control=CONTROL,
+    treatment=TREATMENT,
+    ax=None,
+):
+    """
+    Plot control and treatment histograms of game rounds.
+
+    Bars are binned from per-version value counts, so raw and log scale
+    share one aggregate and the cost does not grow with the number of players.
 
-        # Plot histogram for treatment group (gate_40)
+    Args:
+        df (pd.DataFrame | GroupSummary): Data or summary to plot.
+        log (bool): Whether to plot the log-transformed values.
+        control (str): Control group label.
+        treatment (str): Treatment group label.
+        ax (Axes | None): Axes to draw on, a new figure is shown if omitted.
+    """
+    summary = as_summary(df)
+    ax, show = _get_axes(ax)
+
+    for group, label in [(control, "Control"), (treatment, "Treatment")]:
+        values, counts = summary.histogram(group)
         sns.histplot(
-            data=df[df["version"] == "gate_40"],
-            x="sum_gamerounds",
+            x=np.log1p(values) if log else values,
+            weights=counts,
             bins=50,
             alpha=0.7,
-            label="Treatment (gate_40)",
+            label=f"{label} ({group})",
+            ax=ax,
         )
 
-        plt.title("Player Count - Game Rounds Distribution (raw scale)")
-        plt.xlabel("Game Rounds")
-        plt.ylabel("Player Count")
-        plt.legend()
-        # plt.savefig("reports/figures/4.4_player_count_game_rounds_dist.png")
-        plt.show()
+    if not log:  # Raw scale
+        ax.set_title("Player Count - Game Rounds Distribution (raw scale)")
+        ax.set_xlabel("Game Rounds")
+        ax.set_ylabel("Player Count")
 
     else:  # Log scale
-        # Plot histogram for control group (gate_30)
-        sns.histplot(
-            data=df[df["version"] == "gate_30"],
-            x="log_sum_gamerounds",
-            bins=50,
-            alpha=0.7,
-            label="Control (gate_30)",
-        )
+        ax.set_title("Player Count - Game Rounds Distribution (log scale)")
+        ax.set_xlabel("Game Rounds (log scale)")
+        ax.set_ylabel("Player Count (log scale)")
 
-        # Plot histogram for treatment group (gate_40)
-        sns.histplot(
-            data=df[df["version"] == "gate_40"],
-            x="log_sum_gamerounds",
-            bins=50,
-            alpha=0.7,
-            label="Treatment (gate_40)",
-        )
+    ax.legend()
 
-        plt.title("Player Count - Game Rounds Distribution (log scale)")
-        plt.xlabel("Game Rounds (log scale)")
-        plt.ylabel("Player Count (log scale)")
-        plt.legend()
-        # plt.savefig("reports/figures/4.4_player_count_game_rounds_dist_log.png")
-        plt.show()
+    return _finish(ax, show)
 
 
-def prepare_axes_power_vs_mde(p0, nob, alpha):
+def prepare_axes_power_vs_mde(p0, nob, alpha, ratio=1.0, alternative="two-sided"):
     mde_points = np.linspace(0, 2.5, 51)
-    powers = []
-    for pp in mde_points:
-        p1 = min(max(p0 + pp / 100.0, 1e-9), 1 - 1e-9)
-        effectsize = proportion_effectsize(p1, p0)
-        power_analysis = NormalIndPower()
-        pw = power_analysis.solve_power(
-            effect_size=effectsize,
-            nobs1=nob,
-            alpha=alpha,
-            ratio=1.0,
-            alternative="two-sided",
-        )
-        powers.append(pw)
+    powers = power_from_pp(
+        mde_points, p0, nob, alpha=alpha, ratio=ratio, alternative=alternative
+    )
 
     return mde_points, powers
 
 
 # Function to plot power vs. MDE
-def plot_power_vs_mde(p0, nob, mde_pp_current, alpha):
+def plot_power_vs_mde(p0, nob, mde_pp_current, alpha, ax=None):
     axes = prepare_axes_power_vs_mde(p0, nob, alpha)
+    ax, show = _get_axes(ax)
 
-    plt.plot(axes[0], axes[1], color="#6B46C1", linewidth=1)
-    plt.axhline(0.8, linestyle="--", linewidth=0.5, color="#63B3ED")
+    ax.plot(axes[0], axes[1], color="#6B46C1", linewidth=1)
+    ax.axhline(0.8, linestyle="--", linewidth=0.5, color="#63B3ED")
 
     # Add point for current MDE
-    plt.scatter([mde_pp_current], [0.80], s=10, color="#3182CE", zorder=5)
-    plt.text(
+    ax.scatter([mde_pp_current], [0.80], s=10, color="#3182CE", zorder=5)
+    ax.text(
         mde_pp_current + 0.35,
         0.72,
         f"Current MDE = {mde_pp_current:.2f} pp",
@@ -306,45 +334,33 @@ def plot_power_vs_mde(p0, nob, mde_pp_current, alpha):
     )
 
     # Format y-axis as percentages
-    plt.gca().yaxis.set_major_formatter(mtick.PercentFormatter(1.0))
+    ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0))
+
+    ax.set_xlabel("Minimum Detectable Effect (percentage point)")
+    ax.set_ylabel("Power at current N")
+    ax.set_title("Power vs. MDE at Current Sample Size")
 
-    plt.xlabel("Minimum Detectable Effect (percentage point)")
-    plt.ylabel("Power at current N")
-    plt.title("Power vs. MDE at Current Sample Size")
-    plt.tight_layout()
-    # plt.savefig("reports/figures/5_power_vs_mde_at_current_n.png")
-    plt.show()
+    return _finish(ax, show, tight=True)
 
 
-def prepare_axes_mde_vs_sample(p0, alpha, power):
+def prepare_axes_mde_vs_sample(p0, alpha, power, ratio=1.0, alternative="two-sided"):
     # Plot — MDE vs n per group (balanced @ 80% power)
     n_values = np.linspace(5_000, 150_000, 60)  # per-group sizes for planning
-    pp = []
-    for n in n_values:
-        power_analysis = NormalIndPower()
-        effectsize_required = power_analysis.solve_power(
-            effect_size=None,
-            nobs1=n,
-            alpha=alpha,
-            power=power,
-            ratio=1.0,
-            alternative="two-sided",
-        )
-        p1_required = h_to_p1(
-            effectsize_required, p0
-        )  # invert h to get p1, then convert to pp uplift
-        pp.append((p1_required - p0) * 100)
+    pp = mde_pp(
+        p0, n_values, alpha=alpha, power=power, ratio=ratio, alternative=alternative
+    )
 
     return n_values, pp
 
 
 # Function to plot MDE vs. Sample Size
-def plot_mde_vs_sample(p0, alpha, power, n, mde_pp_current):
+def plot_mde_vs_sample(p0, alpha, power, n, mde_pp_current, ax=None):
     axes = prepare_axes_mde_vs_sample(p0, alpha, power)
+    ax, show = _get_axes(ax)
 
-    plt.plot(axes[0], axes[1], color="#6B46C1", linewidth=1)
-    plt.scatter([n], [mde_pp_current], s=10, color="#3182CE", zorder=5)
-    plt.text(
+    ax.plot(axes[0], axes[1], color="#6B46C1", linewidth=1)
+    ax.scatter([n], [mde_pp_current], s=10, color="#3182CE", zorder=5)
+    ax.text(
         n + 3000,
         mde_pp_current + 0.1,
         f"Current N = {n}, MDE = {mde_pp_current:.2f} pp",
@@ -353,9 +369,8 @@ def plot_mde_vs_sample(p0, alpha, power, n, mde_pp_current):
         fontsize=7,
     )
 
-    plt.xlabel("N per Group")
-    plt.ylabel("MDE (percentage points)")
-    plt.title("MDE vs. Sample Size per Group at 80% Power")
-    plt.tight_layout()
-    # plt.savefig("reports/figures/5_mde_vs_n_per_group_at_80_power.png")
-    plt.show()
+    ax.set_xlabel("N per Group")
+    ax.set_ylabel("MDE (percentage points)")
+    ax.set_title("MDE vs. Sample Size per Group at 80% Power")
+
+    return _finish(ax, show, tight=True)
@@ -0,0 +1,111 @@
+import numpy as np
+from scipy.special import ndtr, ndtri
+
+ALTERNATIVES = ("two-sided", "larger", "smaller")
+
+
+def cohens_h(p1, p0):
+    """Cohen's h between proportions p1 and p0, elementwise."""
+    return 2 * np.arcsin(np.sqrt(p1)) - 2 * np.arcsin(np.sqrt(p0))
+
+
+def h_to_p1(h, p0):
+    """Invert Cohen's h to get p1 given p0, elementwise."""
+    return np.sin(np.arcsin(np.sqrt(p0)) + h / 2.0) ** 2
+
+
+def critical_z(alpha, alternative):
+    if alternative not in ALTERNATIVES:
+        raise ValueError(f"alternative must be one of {ALTERNATIVES}")
+    alpha = np.asarray(alpha, dtype=float)
+    return ndtri(1 - alpha / 2) if alternative == "two-sided" else ndtri(1 - alpha)
+
+
+def _normal_pdf(z):
+    return np.exp(-0.5 * z**2) / np.sqrt(2 * np.pi)
+
+
+def _effective_n(nobs1, ratio):
+    # Harmonic combination of the two group sizes, nobs2 = ratio * nobs1
+    nobs1 = np.asarray(nobs1, dtype=float)
+    return nobs1 * ratio / (1 + ratio)
+
+
+def power_from_h(h, nobs1, alpha=0.05, ratio=1.0, alternative="two-sided"):
+    """
+    Power of the two-proportion z-test for effect size h, elementwise.
+
+    Matches statsmodels' NormalIndPower.power, including the opposite tail
+    for two-sided tests. All arguments broadcast against each other.
+
+    Args:
+        h (array-like): Cohen's h (treatment vs. control).
+        nobs1 (array-like): Control group size.
+        alpha (array-like): Significance level.
+        ratio (array-like): Treatment size as a multiple of control size.
+        alternative (str): "two-sided", "larger" or "smaller".
+    """
+    crit = critical_z(alpha, alternative)
+    shift = np.asarray(h, dtype=float) * np.sqrt(_effective_n(nobs1, ratio))
+
+    if alternative == "larger":
+        return ndtr(shift - crit)
+    if alternative == "smaller":
+        return ndtr(-shift - crit)
+    return ndtr(shift - crit) + ndtr(-shift - crit)
+
+
+def required_shift(crit, power, alternative):
+    # Noncentrality h * sqrt(n_eff) that reaches the target power
+    shift = crit + ndtri(power)
+    if alternative == "two-sided":
+        # Newton steps add the opposite rejection tail
+        for _ in range(3):
+            excess = ndtr(shift - crit) + ndtr(-shift - crit) - power
+            shift = shift - excess / (
+                _normal_pdf(shift - crit) - _normal_pdf(-shift - crit)
+            )
+    return shift
+
+
+def mde_h(nobs1, alpha=0.05, power=0.80, ratio=1.0, alternative="two-sided"):
+    """
+    Smallest Cohen's h detectable with the given power, elementwise.
+
+    Starts from the normal quantile formula (z_alpha + z_power) / sqrt(n_eff)
+    and, for two-sided tests, adds the opposite tail with a few vectorized
+    Newton steps so results agree with NormalIndPower.solve_power.
+    """
+    shift = required_shift(critical_z(alpha, alternative), power, alternative)
+    return shift / np.sqrt(_effective_n(nobs1, ratio))
+
+
+def mde_pp(p0, nobs1, alpha=0.05, power=0.80, ratio=1.0, alternative="two-sided"):
+    """Absolute uplift over baseline p0 (percentage points) detectable at nobs1."""
+    h = mde_h(nobs1, alpha=alpha, power=power, ratio=ratio, alternative=alternative)
+    if alternative == "smaller":
+        h = -h
+    return (h_to_p1(h, p0) - p0) * 100
+
+
+def power_from_pp(pp, p0, nobs1, alpha=0.05, ratio=1.0, alternative="two-sided"):
+    """Power to detect an absolute uplift of `pp` percentage points over p0."""
+    p1 = np.clip(np.asarray(p0) + np.asarray(pp) / 100.0, 1e-9, 1 - 1e-9)
+    return power_from_h(
+        cohens_h(p1, p0), nobs1, alpha=alpha, ratio=ratio, alternative=alternative
+    )
+
+
+def power_surface(
+    mde_pp_grid, n_grid, p0_grid, alpha=0.05, ratio=1.0, alternative="two-sided"
+):
+    """
+    Power over every combination of MDE (pp), control size and baseline rate.
+
+    Returns:
+        np.ndarray: Power with shape (len(mde_pp_grid), len(n_grid), len(p0_grid)).
+    """
+    pp = np.asarray(mde_pp_grid, dtype=float)[:, None, None]
+    n = np.asarray(n_grid, dtype=float)[None, :, None]
+    p0 = np.asarray(p0_grid, dtype=float)[None, None, :]
+    return power_from_pp(pp, p0, n, alpha=alpha, ratio=ratio, alternative=alternative)
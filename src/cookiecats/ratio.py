@@ -0,0 +1,204 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+from .cuped import CovariateSummary, summarize_covariates
+from .summary import CONTROL, GROUP_COL, TREATMENT
+
+
+@dataclass(frozen=True)
+class RatioMetric:
+    """
+    A metric defined as sum(numerator) / sum(denominator) per group.
+
+    Columns may be products such as "sum_gamerounds*retention_7". Without a
+    denominator the metric is a per-player mean.
+
+    Attributes:
+        name (str): Label in the results table.
+        numerator (str): Numerator column.
+        denominator (str | None): Denominator column, players if None.
+        scale (float): Factor applied to the ratio, e.g. ARPU per retained player.
+    """
+
+    name: str
+    numerator: str
+    denominator: str | None = None
+    scale: float = 1.0
+
+
+DEFAULT_RATIOS = (
+    RatioMetric("Day-1 retention", "retention_1"),
+    RatioMetric("Day-7 retention", "retention_7"),
+    RatioMetric("Game rounds per player", "sum_gamerounds"),
+    RatioMetric(
+        "Game rounds per day-7 retained player",
+        "sum_gamerounds*retention_7",
+        "retention_7",
+    ),
+)
+
+
+def _columns(ratios):
+    # Distinct columns in order of first use
+    columns = [col for r in ratios for col in (r.numerator, r.denominator) if col]
+    return list(dict.fromkeys(columns))
+
+
+def summarize_ratios(
+    df: pd.DataFrame, ratios=DEFAULT_RATIOS, group_col: str = GROUP_COL
+) -> CovariateSummary:
+    """
+    Per-group sums and cross-products of every column the ratios use.
+
+    Product columns are computed from their factors, then everything is
+    summarized in one pass by `summarize_covariates`.
+    """
+    columns = _columns(ratios)
+    data = pd.DataFrame({group_col: df[group_col]})
+    for col in columns:
+        factors = col.split("*")
+        data[col] = np.prod([df[f].to_numpy(dtype=float) for f in factors], axis=0)
+    return summarize_covariates(
+        data, covariates=[], metrics=columns, group_col=group_col
+    )
+
+
+def relative_lift_ci(ratio_ctrl, var_ctrl, ratio_treat, var_treat, alpha=0.05):
+    """
+    Delta-method interval for treatment / control - 1, elementwise.
+
+    Args:
+        ratio_ctrl (array-like): Control estimate.
+        var_ctrl (array-like): Variance of the control estimate.
+        ratio_treat (array-like): Treatment estimate.
+        var_treat (array-like): Variance of the treatment estimate.
+        alpha (float): Significance level.
+
+    Returns:
+        tuple: Relative lift, its standard error, lower and upper limits.
+    """
+    ratio = np.asarray(ratio_treat) / ratio_ctrl
+    se = np.abs(ratio) * np.sqrt(
+        var_treat / np.square(ratio_treat) + var_ctrl / np.square(ratio_ctrl)
+    )
+    margin = ndtri(1 - alpha / 2) * se
+    return ratio - 1, se, ratio - 1 - margin, ratio - 1 + margin
+
+
+def fieller_ci(ratio_ctrl, var_ctrl, ratio_treat, var_treat, alpha=0.05):
+    """
+    Fieller interval for treatment / control - 1 of independent estimates.
+
+    Unlike the delta method it is not symmetric around the estimate. When
+    the control estimate is not significantly different from zero the
+    interval is unbounded and NaN is returned. Arguments are as for
+    `relative_lift_ci`.
+
+    Returns:
+        tuple: Lower and upper limits.
+    """
+    a, b = np.asarray(ratio_treat, dtype=float), np.asarray(ratio_ctrl, dtype=float)
+    var_treat, var_ctrl = np.asarray(var_treat), np.asarray(var_ctrl)
+    z2 = ndtri(1 - alpha / 2) ** 2
+    denom = b**2 - z2 * var_ctrl
+    disc = var_treat * b**2 + var_ctrl * a**2 - z2 * var_treat * var_ctrl
+    with np.errstate(invalid="ignore"):
+        half = np.sqrt(z2 * disc)
+    bounded = denom > 0
+    low = np.where(bounded, (a * b - half) / denom - 1, np.nan)
+    high = np.where(bounded, (a * b + half) / denom - 1, np.nan)
+    return low, high
+
+
+def ratio_table(
+    data,
+    ratios=DEFAULT_RATIOS,
+    control: str = CONTROL,
+    treatment: str = TREATMENT,
+    alpha: float = 0.05,
+    fieller: bool = False,
+) -> pd.DataFrame:
+    """
+    Delta-method inference for ratio metrics, all metrics in one vectorized pass.
+
+    Each group's ratio R = sum(Y) / sum(X) gets the delta-method variance
+    (var(Y) - 2 R cov(X, Y) + R^2 var(X)) / (n mean(X)^2) from the grouped
+    sums and cross-products, which gives intervals for the absolute
+    difference and the relative lift without bootstrapping.
+
+    Args:
+        data (pd.DataFrame | CovariateSummary): Player-level data, or a
+            summary from `summarize_ratios` covering the ratio columns.
+        ratios (list[RatioMetric]): Metrics to evaluate.
+        control (str): Control group label.
+        treatment (str): Treatment group label.
+        alpha (float): Significance level.
+        fieller (bool): Add Fieller intervals for the relative lift.
+
+    Returns:
+        pd.DataFrame: One row per metric.
+    """
+    summary = (
+        data if isinstance(data, CovariateSummary) else summarize_ratios(data, ratios)
+    )
+    rows = [summary.index(control), summary.index(treatment)]
+    n = summary.n[rows].astype(float)[:, None]
+
+    # A column of ones stands in for a missing denominator
+    p = len(summary.metrics)
+    sums = np.concatenate([summary.sums[rows], n], axis=1)
+    cross = np.zeros((2, p + 1, p + 1))
+    cross[:, :p, :p] = summary.cross[rows]
+    cross[:, :p, p] = cross[:, p, :p] = summary.sums[rows]
+    cross[:, p, p] = n[:, 0]
+
+    iy = np.array([summary.metrics.index(r.numerator) for r in ratios])
+    ix = np.array(
+        [
+            p if r.denominator is None else summary.metrics.index(r.denominator)
+            for r in ratios
+        ]
+    )
+    scale = np.array([r.scale for r in ratios])
+
+    # Per-player moments, shape (2 groups, metrics)
+    mean_y, mean_x = sums[:, iy] / n, sums[:, ix] / n
+    var_y = (cross[:, iy, iy] - n * mean_y**2) / (n - 1)
+    var_x = (cross[:, ix, ix] - n * mean_x**2) / (n - 1)
+    cov_xy = (cross[:, iy, ix] - n * mean_y * mean_x) / (n - 1)
+
+    ratio = mean_y / mean_x
+    var = (var_y - 2 * ratio * cov_xy + ratio**2 * var_x) / (n * mean_x**2)
+    ratio, var = ratio * scale, var * scale**2
+
+    delta = ratio[1] - ratio[0]
+    se = np.sqrt(var[0] + var[1])
+    z_stat = delta / se
+    margin = ndtri(1 - alpha / 2) * se
+    lift, lift_se, lift_low, lift_high = relative_lift_ci(
+        ratio[0], var[0], ratio[1], var[1], alpha
+    )
+
+    table = pd.DataFrame(
+        {
+            "Metric": [r.name for r in ratios],
+            f"Control ({control})": ratio[0],
+            f"Treatment ({treatment})": ratio[1],
+            "Absolute Δ": delta,
+            "CI low": delta - margin,
+            "CI high": delta + margin,
+            "Relative Δ (%)": lift * 100,
+            "Relative CI low (%)": lift_low * 100,
+            "Relative CI high (%)": lift_high * 100,
+            "Statistic": z_stat,
+            "p-value": 2 * ndtr(-np.abs(z_stat)),
+        }
+    )
+    if fieller:
+        low, high = fieller_ci(ratio[0], var[0], ratio[1], var[1], alpha)
+        table["Fieller CI low (%)"] = low * 100
+        table["Fieller CI high (%)"] = high * 100
+    return table
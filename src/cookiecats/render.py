@@ -0,0 +1,257 @@
+import ast
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .stats import solve_mde
+from .summary import CONTROL, TREATMENT, GroupSummary, summarize
+
+# Per-figure render hashes, stored next to the figures
+CACHE_FILE = ".render_cache.json"
+
+
+def report_figure_jobs(
+    df: pd.DataFrame,
+    alpha: float = 0.05,
+    power: float = 0.80,
+    rounds_cap: int = 3000,
+    control: str = CONTROL,
+    treatment: str = TREATMENT,
+) -> dict:
+    """
+    Inputs of the eight report figures, computed the way the notebook does.
+
+    Game round plots drop players with `sum_gamerounds >= rounds_cap`, the
+    boxplot axis limits come from the IQR of the full data, and the power
+    plots use the control day-7 retention rate as baseline.
+
+    Returns:
+        dict: File name -> (plot function name, keyword arguments).
+    """
+    labels = dict(control=control, treatment=treatment)
+    summary = summarize(df)
+
+    q1, q3 = df["sum_gamerounds"].quantile([0.25, 0.75])
+    bounds = dict(lower_bound=q1 - 1.5 * (q3 - q1), upper_bound=q3 + 1.5 * (q3 - q1))
+
+    # Game round plots only need the per-version histogram of capped rounds
+    rounds = df.loc[df["sum_gamerounds"] < rounds_cap, ["version", "sum_gamerounds"]]
+    rounds_summary = summarize(rounds, binary_cols=[])
+
+    p0 = summary.rate("retention_7", control)
+    n, mde_pp_current = solve_mde(summary, alpha, power, p0, control=control)
+    power_args = dict(p0=p0, alpha=alpha, mde_pp_current=mde_pp_current)
+
+    return {
+        "3.3_dist_of_game_rounds_by_version.png": (
+            "plot_game_rounds",
+            dict(df=rounds_summary, **bounds),
+        ),
+        "3.3_dist_of_game_rounds_by_version_log.png": (
+            "plot_game_rounds",
+            dict(df=rounds_summary, log=True, **bounds),
+        ),
+        "4.2_assignment_counts_by_version.png": (
+            "plot_assignment_counts",
+            dict(df=df[["version"]]),
+        ),
+        "4.3_retention_rates_by_version_95_ci.png": (
+            "plot_retention_rates",
+            dict(df=summary, **labels),
+        ),
+        "4.4_player_count_game_rounds_dist.png": (
+            "plot_game_rounds_dist",
+            dict(df=rounds_summary, **labels),
+        ),
+        "4.4_player_count_game_rounds_dist_log.png": (
+            "plot_game_rounds_dist",
+            dict(df=rounds_summary, log=True, **labels),
+        ),
+        "5_power_vs_mde_at_current_n.png": (
+            "plot_power_vs_mde",
+            dict(nob=n, **power_args),
+        ),
+        "5_mde_vs_n_per_group_at_80_power.png": (
+            "plot_mde_vs_sample",
+            dict(power=power, n=n, **power_args),
+        ),
+    }
+
+
+def _update_hash(digest, value):
+    # Stable content hash of plot inputs
+    if isinstance(value, pd.DataFrame):
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy())
+        digest.update(repr(list(value.columns)).encode())
+    elif isinstance(value, GroupSummary):
+        digest.update(repr(value.groups).encode())
+        for array in (value.n, value.hist, value.values, *value.successes.values()):
+            digest.update(np.ascontiguousarray(array))
+    elif isinstance(value, dict):
+        for key in sorted(value):
+            digest.update(key.encode())
+            _update_hash(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+
+
+@lru_cache(maxsize=None)
+def _module_sources(module: str = "plots") -> tuple:
+    # Source files of a package module and every package module it imports
+    package = Path(__file__).parent
+    seen, todo = set(), [module]
+    while todo:
+        name = todo.pop()
+        if name in seen or not (package / f"{name}.py").exists():
+            continue
+        seen.add(name)
+        tree = ast.parse((package / f"{name}.py").read_text())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.level == 1:
+                if node.module:
+                    todo.append(node.module.split(".")[0])
+                else:
+                    todo.extend(alias.name for alias in node.names)
+    return tuple(package / f"{name}.py" for name in sorted(seen))
+
+
+def figure_hash(func_name: str, kwargs: dict, dpi: int) -> str:
+    """
+    Hash of a figure's inputs, plotting code and output resolution.
+
+    The plotting code is plots.py and every cookiecats module it imports,
+    directly or indirectly, so edits to e.g. power.py re-render the figures.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for source in _module_sources():
+        digest.update(source.read_bytes())
+    digest.update(f"{func_name}:{dpi}".encode())
+    _update_hash(digest, kwargs)
+    return digest.hexdigest()
+
+
+def render_figure(func_name: str, kwargs: dict, path, dpi: int = 600) -> float:
+    """
+    Draw one figure on an explicit Figure with the Agg backend and save it.
+
+    Returns:
+        float: Render time in seconds.
+    """
+    start = time.perf_counter()
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+
+    from . import plots
+
+    with matplotlib.rc_context(plots.plot_style()):
+        fig = Figure()
+        ax = fig.subplots()
+        getattr(plots, func_name)(ax=ax, **kwargs)
+        fig.savefig(path, dpi=dpi)
+
+    return time.perf_counter() - start
+
+
+def render_figures(
+    jobs: dict,
+    out_dir,
+    dpi: int = 600,
+    max_workers: int | None = None,
+    force: bool = False,
+) -> pd.DataFrame:
+    """
+    Render figures in parallel worker processes, skipping unchanged ones.
+
+    A figure is skipped when its file exists and the hash of its inputs
+    matches the one recorded at its last render. The record is updated as
+    each figure is saved; if any figure fails, the others are still
+    recorded and RuntimeError is raised at the end.
+
+    Args:
+        jobs (dict): File name -> (plot function name, keyword arguments).
+        out_dir (str | Path): Target directory.
+        dpi (int): Output resolution.
+        max_workers (int | None): Worker processes, all cores if omitted.
+        force (bool): Re-render every figure.
+
+    Returns:
+        pd.DataFrame: Status and render time per figure.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = out_dir / CACHE_FILE
+    cache = json.loads(cache_path.read_text()) if cache_path.exists() else {}
+
+    hashes = {
+        name: figure_hash(func, kwargs, dpi) for name, (func, kwargs) in jobs.items()
+    }
+    todo = [
+        name
+        for name in jobs
+        if force or cache.get(name) != hashes[name] or not (out_dir / name).exists()
+    ]
+
+    timings, errors = {}, {}
+    if todo:
+        workers = min(max_workers or os.cpu_count(), len(todo))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(render_figure, *jobs[name], out_dir / name, dpi): name
+                for name in todo
+            }
+            # Record each figure as soon as it is saved, so a failing
+            # figure does not discard the renders that completed
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    timings[name] = future.result()
+                except Exception as exc:
+                    errors[name] = exc
+                    continue
+                cache[name] = hashes[name]
+                cache_path.write_text(json.dumps(cache, indent=2, sort_keys=True))
+
+    if errors:
+        exc = next(iter(errors.values()))
+        raise RuntimeError(
+            f"Failed to render {sorted(errors)}; completed figures were kept"
+        ) from exc
+
+    return pd.DataFrame(
+        [
+            {
+                "Figure": name,
+                "Status": "rendered" if name in timings else "cached",
+                "Render time (s)": timings.get(name, 0.0),
+            }
+            for name in jobs
+        ]
+    )
+
+
+def render_report_figures(
+    df: pd.DataFrame,
+    out_dir="reports/figures",
+    alpha: float = 0.05,
+    power: float = 0.80,
+    dpi: int = 600,
+    max_workers: int | None = None,
+    force: bool = False,
+    control: str = CONTROL,
+    treatment: str = TREATMENT,
+) -> pd.DataFrame:
+    """Render the eight report figures for an experiment into `out_dir`."""
+    jobs = report_figure_jobs(
+        df, alpha=alpha, power=power, control=control, treatment=treatment
+    )
+    return render_figures(jobs, out_dir, dpi=dpi, max_workers=max_workers, force=force)
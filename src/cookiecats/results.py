@@ -0,0 +1,293 @@
+import os
+import uuid
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+class _TupleCompat:
+    """Positional access in field order, for code written against tuple results."""
+
+    __slots__ = ()
+
+    def __getitem__(self, index):
+        values = tuple(self)
+        return values[index]
+
+    def __iter__(self):
+        return (getattr(self, f.name) for f in fields(self))
+
+    def __len__(self):
+        return len(fields(self))
+
+    def to_dict(self) -> dict:
+        """Scalar fields by name, arrays are left out."""
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if np.isscalar(getattr(self, f.name))
+        }
+
+
+@dataclass(slots=True)
+class SRMResult(_TupleCompat):
+    pval: float
+    control_share: float
+    treatment_share: float
+
+
+@dataclass(slots=True)
+class MultiArmSRM(_TupleCompat):
+    arms: tuple
+    chi2: float
+    pval: float
+    observed_share: np.ndarray
+    expected_share: np.ndarray
+
+
+@dataclass(slots=True)
+class MDEResult(_TupleCompat):
+    n: int
+    mde_pp: float
+
+
+@dataclass(slots=True)
+class ProportionTest(_TupleCompat):
+    prop_ctrl: float
+    ci_ctrl_low: float
+    ci_ctrl_high: float
+    prop_treat: float
+    ci_treat_low: float
+    ci_treat_high: float
+    z_stat: float
+    pval: float
+    delta_abs_pp: float
+    ci_delta_low: float
+    ci_delta_high: float
+    delta_rel_pct: float
+    h: float
+
+
+@dataclass(slots=True)
+class EngagementStats(_TupleCompat):
+    """
+    Game round statistics per group, scalars only.
+
+    Unlike the tuple this replaces, no game rounds are kept: the log fields
+    are log-scale means rather than Series, and per-group histograms for
+    the tests and the bootstrap come from `GroupSummary.histogram`.
+    """
+
+    mean_ctrl: float
+    median_ctrl: float
+    mean_treat: float
+    median_treat: float
+    delta_mean: float
+    log_mean_ctrl: float
+    log_mean_treat: float
+
+
+@dataclass(slots=True)
+class RoundsTest(_TupleCompat):
+    u_stat: float
+    pval_rounds: float
+    tstat_log: float
+    pval_log: float
+
+
+@dataclass(slots=True)
+class BootstrapResult(_TupleCompat):
+    mean_diff: float
+    ci_low: float
+    ci_high: float
+    mean_ctrl: float
+    mean_treat: float
+
+
+@dataclass(slots=True)
+class AdjustedTest(_TupleCompat):
+    metric: str
+    method: str
+    mean_ctrl: float
+    mean_treat: float
+    delta: float
+    ci_low: float
+    ci_high: float
+    se: float
+    z_stat: float
+    pval: float
+    delta_unadjusted: float
+    se_unadjusted: float
+    variance_reduction: float
+
+
+@dataclass(slots=True)
+class PermutationResult(_TupleCompat):
+    observed: float
+    pval: float
+    n_perm: int
+    mc_se: float
+    stopped_early: bool
+
+
+# Long format keeps one schema for every result type
+STORE_COLUMNS = ["run_id", "recorded_at", "experiment", "test", "field", "value"]
+
+
+def _store_schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("run_id", pa.string()),
+            ("recorded_at", pa.timestamp("us", tz="UTC")),
+            ("experiment", pa.string()),
+            ("test", pa.string()),
+            ("field", pa.string()),
+            ("value", pa.float64()),
+        ]
+    )
+
+
+def _scalar_fields(result) -> dict:
+    # Numeric fields only, labels such as the metric name are not stored
+    if hasattr(result, "to_dict"):
+        items = result.to_dict().items()
+    elif isinstance(result, dict):
+        items = result.items()
+    else:
+        items = ((str(i), v) for i, v in enumerate(result))
+    return {k: v for k, v in items if np.isscalar(v) and not isinstance(v, str)}
+
+
+class ResultsStore:
+    """
+    Append-only Parquet store of test results across experiments and runs.
+
+    Every `append` writes one Parquet file with a row per result field, so
+    earlier runs are never rewritten. `load` reads all files as one Arrow
+    dataset and pushes experiment, test and field filters down to the
+    scan. Call `compact` after many appends to merge the small files.
+
+    Args:
+        path (str | Path): Directory holding the Parquet files (needs pyarrow).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def append(self, experiment: str, results: dict, run_id: str | None = None):
+        """
+        Store the scalar fields of one run's results.
+
+        Args:
+            experiment (str): Experiment name.
+            results (dict): Results keyed by test name, e.g. from
+                `stream.analyze_summary`. Values may be result objects,
+                dicts or tuples.
+            run_id (str | None): Run identifier, random if omitted. Reusing
+                the identifier of a stored run raises ValueError.
+
+        Returns:
+            str: The run identifier.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        run_id = run_id or uuid.uuid4().hex[:12]
+        rows = [
+            (test, field, float(value))
+            for test, result in results.items()
+            for field, value in _scalar_fields(result).items()
+        ]
+        tests, names, values = zip(*rows) if rows else ((), (), ())
+        table = pa.table(
+            {
+                "run_id": [run_id] * len(rows),
+                "recorded_at": [datetime.now(timezone.utc)] * len(rows),
+                "experiment": [experiment] * len(rows),
+                "test": list(tests),
+                "field": list(names),
+                "value": list(values),
+            },
+            schema=_store_schema(),
+        )
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path / f".part-{run_id}.{os.getpid()}.tmp"
+        pq.write_table(table, tmp_path)
+        try:
+            # Unlike replace, link refuses to overwrite an earlier run
+            os.link(tmp_path, self.path / f"part-{run_id}.parquet")
+        except FileExistsError:
+            raise ValueError(f"Run {run_id!r} is already stored in {self.path}") from None
+        finally:
+            tmp_path.unlink()
+        return run_id
+
+    def _dataset(self):
+        import pyarrow.dataset as ds
+
+        return ds.dataset(
+            sorted(self.path.glob("part-*.parquet")),
+            format="parquet",
+            schema=_store_schema(),
+        )
+
+    def load(self, experiments=None, tests=None, fields=None, wide: bool = True):
+        """
+        Query stored results.
+
+        Args:
+            experiments (list[str] | None): Experiments to keep, all if omitted.
+            tests (list[str] | None): Tests to keep, e.g. ["ret7"].
+            fields (list[str] | None): Result fields to keep, e.g. ["pval"].
+            wide (bool): One row per run and test with a column per field,
+                instead of the stored long format.
+
+        Returns:
+            pd.DataFrame: Matching results.
+        """
+        import pyarrow.dataset as ds
+
+        if not self.path.exists():
+            return pd.DataFrame(columns=STORE_COLUMNS)
+
+        expr = None
+        for column, wanted in [
+            ("experiment", experiments),
+            ("test", tests),
+            ("field", fields),
+        ]:
+            if wanted is not None:
+                cond = ds.field(column).isin(list(wanted))
+                expr = cond if expr is None else expr & cond
+
+        long = self._dataset().to_table(filter=expr).to_pandas()
+        if not wide:
+            return long
+
+        keys = ["run_id", "recorded_at", "experiment", "test"]
+        table = long.pivot(index=keys, columns="field", values="value").reset_index()
+        table.columns.name = None
+        return table
+
+    def compact(self) -> Path | None:
+        """Merge all stored files into one, returning its path."""
+        import pyarrow.parquet as pq
+
+        parts = sorted(self.path.glob("part-*.parquet"))
+        if len(parts) < 2:
+            return parts[0] if parts else None
+
+        table = self._dataset().to_table()
+        merged = self.path / f"part-{uuid.uuid4().hex[:12]}.parquet"
+        tmp_path = merged.with_suffix(".tmp")
+        pq.write_table(table, tmp_path)
+        tmp_path.replace(merged)
+        for part in parts:
+            part.unlink()
+        return merged
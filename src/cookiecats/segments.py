@@ -0,0 +1,277 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy.special import chdtrc, ndtr, ndtri, stdtr, stdtrit
+
+from .stats import correct_pvals
+from .summary import (
+    BINARY_COLS,
+    CONTROL,
+    GROUP_COL,
+    TREATMENT,
+    VALUE_COL,
+    _sample_var,
+)
+
+# Default `sum_gamerounds` buckets, as left-closed [low, high) edges
+ROUND_BUCKETS = (0, 1, 10, 30, 100, 500, np.inf)
+
+
+@dataclass
+class SegmentSummary:
+    """
+    Sufficient statistics per segment and group.
+
+    Every array has one row per segment and one column per group, so the
+    tests below evaluate all segments at once.
+
+    Attributes:
+        keys (pd.DataFrame): Segment column values, one row per segment.
+        groups (tuple): Group labels, e.g. ("gate_30", "gate_40").
+        n (np.ndarray): Players per segment and group.
+        successes (dict): Successes per segment and group for each binary metric.
+        value_sum (np.ndarray): Sum of `sum_gamerounds`.
+        value_sumsq (np.ndarray): Sum of squared `sum_gamerounds`.
+        log_sum (np.ndarray): Sum of log1p(`sum_gamerounds`).
+        log_sumsq (np.ndarray): Sum of squared log1p(`sum_gamerounds`).
+    """
+
+    keys: pd.DataFrame
+    groups: tuple
+    n: np.ndarray
+    successes: dict
+    value_sum: np.ndarray
+    value_sumsq: np.ndarray
+    log_sum: np.ndarray
+    log_sumsq: np.ndarray
+
+    def index(self, group) -> int:
+        try:
+            return self.groups.index(group)
+        except ValueError:
+            raise KeyError(f"Group {group!r} not in summary {self.groups}") from None
+
+
+def _bucket_label(low, high) -> str:
+    if np.isinf(high):
+        return f"{low:g}+"
+    if high - low == 1:
+        return f"{low:g}"
+    return f"{low:g}-{high - 1:g}"
+
+
+def round_buckets(values, edges=ROUND_BUCKETS) -> pd.Categorical:
+    """
+    Bucket game rounds into labelled ranges such as "10-29" and "500+".
+
+    Args:
+        values (array-like): `sum_gamerounds` per player.
+        edges (tuple): Increasing left-closed bucket edges, the last may be inf.
+    """
+    labels = [_bucket_label(low, high) for low, high in zip(edges[:-1], edges[1:])]
+    return pd.cut(values, bins=list(edges), right=False, labels=labels)
+
+
+def summarize_segments(
+    df: pd.DataFrame,
+    segments,
+    group_col: str = GROUP_COL,
+    binary_cols=None,
+    value_col: str = VALUE_COL,
+) -> SegmentSummary:
+    """
+    Compute per-(segment, group) sufficient statistics in a single pass.
+
+    Rows are labelled with one segment code from a single groupby over the
+    segment columns, then every statistic is one bincount over the combined
+    (segment, group) code. Rows with a missing segment value are dropped.
+
+    Args:
+        df (pd.DataFrame): Player-level experiment data.
+        segments (list[str]): Segment columns, e.g. ["platform", "country"].
+            Derived segments can be added first, e.g.
+            `df.assign(rounds_bucket=round_buckets(df["sum_gamerounds"]))`.
+        group_col (str): Column holding the experiment group.
+        binary_cols (list | None): Binary metrics to count successes for.
+            Defaults to the retention columns present in `df`.
+        value_col (str): Count metric to summarize.
+    """
+    segments = [segments] if isinstance(segments, str) else list(segments)
+    if binary_cols is None:
+        binary_cols = [col for col in BINARY_COLS if col in df.columns]
+
+    grouped = df.groupby(segments, observed=True, sort=True)
+    # Rows with a missing segment value have a NaN group number
+    segment_codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    keys = grouped.size().index.to_frame(index=False)
+    group_codes, labels = pd.factorize(df[group_col], sort=True)
+
+    keep = (segment_codes >= 0) & (group_codes >= 0)
+    k = len(labels)
+    shape = (len(keys), k)
+    codes = segment_codes[keep] * k + group_codes[keep]
+
+    def total(weights=None):
+        counts = np.bincount(codes, weights=weights, minlength=shape[0] * k)
+        return counts.reshape(shape)
+
+    x = df[value_col].to_numpy(dtype=float)[keep]
+    log_x = np.log1p(x)
+
+    return SegmentSummary(
+        keys=keys,
+        groups=tuple(str(label) for label in labels),
+        n=total(),
+        successes={
+            col: total(df[col].to_numpy(dtype=float)[keep]).astype(np.int64)
+            for col in binary_cols
+        },
+        value_sum=total(x),
+        value_sumsq=total(x**2),
+        log_sum=total(log_x),
+        log_sumsq=total(log_x**2),
+    )
+
+
+def _welch(mean_ctrl, var_ctrl, n_ctrl, mean_treat, var_treat, n_treat, alpha):
+    # Welch's t-test and interval for treatment - control, elementwise
+    se_ctrl, se_treat = var_ctrl / n_ctrl, var_treat / n_treat
+    se = np.sqrt(se_ctrl + se_treat)
+    dof = se**4 / (se_ctrl**2 / (n_ctrl - 1) + se_treat**2 / (n_treat - 1))
+    delta = mean_treat - mean_ctrl
+    t_stat = delta / se
+    margin = stdtrit(dof, 1 - alpha / 2) * se
+    return (
+        delta,
+        delta - margin,
+        delta + margin,
+        t_stat,
+        2 * stdtr(dof, -np.abs(t_stat)),
+    )
+
+
+def segment_tests(
+    data,
+    segments=None,
+    metrics=None,
+    control: str = CONTROL,
+    treatment: str = TREATMENT,
+    alpha: float = 0.05,
+    correction: str = "holm",
+    ratio=(1, 1),
+) -> pd.DataFrame:
+    """
+    Run the experiment tests in every segment simultaneously.
+
+    Per segment this evaluates the SRM chi-square test, a pooled
+    two-proportion z-test per binary metric, and Welch's t-tests on raw and
+    log-transformed game rounds, all as vectorized formulas over the
+    segment axis. Differences and statistics are signed treatment -
+    control. Each test's p-values are corrected across segments with
+    `correct_pvals`; segments without a valid test (e.g. an empty arm)
+    get NaN and are left out of the correction.
+
+    Args:
+        data (pd.DataFrame | SegmentSummary): Data or segment summary.
+        segments (list[str] | None): Segment columns, required for a DataFrame.
+        metrics (list | None): Binary metrics, the retention columns if omitted.
+        control (str): Control group label.
+        treatment (str): Treatment group label.
+        alpha (float): Significance level for intervals and the correction.
+        correction (str): "holm", "bonferroni" or "bh".
+        ratio (tuple): Planned control:treatment allocation for the SRM test.
+
+    Returns:
+        pd.DataFrame: One row per segment and test, with the segment columns,
+            arm sizes, SRM p-values and raw and adjusted test p-values.
+    """
+    if isinstance(data, SegmentSummary):
+        summary = data
+    else:
+        if segments is None:
+            raise ValueError("segments are required to summarize a DataFrame")
+        summary = summarize_segments(data, segments)
+    metrics = metrics or [col for col in BINARY_COLS if col in summary.successes]
+
+    ci, ti = summary.index(control), summary.index(treatment)
+    n = summary.n.astype(float)
+    n_ctrl, n_treat = n[:, ci], n[:, ti]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # SRM chi-square test with 1 degree of freedom per segment
+        share_ctrl = ratio[0] / (ratio[0] + ratio[1])
+        total = n_ctrl + n_treat
+        expected_ctrl, expected_treat = total * share_ctrl, total * (1 - share_ctrl)
+        chi_stat = (n_ctrl - expected_ctrl) ** 2 / expected_ctrl
+        chi_stat += (n_treat - expected_treat) ** 2 / expected_treat
+        srm_pval = chdtrc(1, chi_stat)
+
+        tests = {}
+        for col in metrics:
+            successes = summary.successes[col].astype(float)
+            p_ctrl, p_treat = successes[:, ci] / n_ctrl, successes[:, ti] / n_treat
+            pooled = (successes[:, ci] + successes[:, ti]) / total
+            delta = p_treat - p_ctrl
+            z_stat = delta / np.sqrt(pooled * (1 - pooled) * (1 / n_ctrl + 1 / n_treat))
+            margin = ndtri(1 - alpha / 2) * np.sqrt(
+                p_ctrl * (1 - p_ctrl) / n_ctrl + p_treat * (1 - p_treat) / n_treat
+            )
+            tests[col] = (
+                "two-proportion z",
+                p_ctrl,
+                p_treat,
+                (delta, delta - margin, delta + margin, z_stat),
+                2 * ndtr(-np.abs(z_stat)),
+            )
+
+        for name, total_, total_sq in (
+            (VALUE_COL, summary.value_sum, summary.value_sumsq),
+            (f"log {VALUE_COL}", summary.log_sum, summary.log_sumsq),
+        ):
+            mean = total_ / n
+            var = _sample_var(total_, total_sq, n)
+            *estimates, pval = _welch(
+                mean[:, ci], var[:, ci], n_ctrl, mean[:, ti], var[:, ti], n_treat, alpha
+            )
+            tests[name] = ("Welch t", mean[:, ci], mean[:, ti], estimates, pval)
+
+    srm_adj = _adjust(srm_pval, alpha, correction)[1]
+    tables = []
+    for metric, (test, value_ctrl, value_treat, estimates, pval) in tests.items():
+        reject, adjusted = _adjust(pval, alpha, correction)
+        delta, ci_low, ci_high, statistic = estimates
+        table = summary.keys.assign(
+            **{
+                "Metric": metric,
+                "Control n": summary.n[:, ci],
+                "Treatment n": summary.n[:, ti],
+                "SRM p-value": srm_pval,
+                "SRM adjusted p-value": srm_adj,
+                "Control value": value_ctrl,
+                "Treatment value": value_treat,
+                "Absolute Δ": delta,
+                "CI low": ci_low,
+                "CI high": ci_high,
+                "Test": test,
+                "Statistic": statistic,
+                "p-value": pval,
+                "Adjusted p-value": adjusted,
+                "Significant?": np.where(reject, "Yes", "No"),
+            }
+        )
+        tables.append(table)
+
+    return pd.concat(tables, ignore_index=True)
+
+
+def _adjust(pvals, alpha, correction):
+    # Correct the finite p-values across segments, NaN stays NaN
+    valid = np.isfinite(pvals)
+    reject = np.zeros(len(pvals), dtype=bool)
+    adjusted = np.full(len(pvals), np.nan)
+    if valid.any():
+        reject[valid], adjusted[valid], *_ = correct_pvals(
+            pvals[valid], alpha=alpha, method=correction
+        )
+    return reject, adjusted
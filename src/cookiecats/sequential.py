@@ -0,0 +1,276 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import brentq
+from scipy.special import ndtr, ndtri
+
+from .summary import BINARY_COLS, CONTROL, GROUP_COL, TREATMENT, GroupSummary
+
+METHODS = ("msprt", "obrien-fleming")
+
+# Grid resolution (per unit of the Brownian scale) for boundary recursion
+GRID_STEP = 0.005
+
+# Boundary used when the alpha spent at a look is numerically zero
+MAX_Z = 8.0
+
+
+def obf_spending(t, alpha):
+    """
+    Two-sided alpha spent by information fraction t.
+
+    Applies the Lan-DeMets O'Brien-Fleming spending function to alpha / 2
+    on each side, the usual convention for symmetric two-sided designs.
+    """
+    t = np.asarray(t, dtype=float)
+    return 2 * (2 - 2 * ndtr(ndtri(1 - alpha / 4) / np.sqrt(t)))
+
+
+def _normal_pdf(z):
+    return np.exp(-0.5 * z**2) / np.sqrt(2 * np.pi)
+
+
+def _next_bound(t, target, state=None):
+    """
+    Boundary for one more look, continuing the recursion from `state`.
+
+    Args:
+        t (float): Information fraction of the new look.
+        target (float): Alpha spent at this look.
+        state (tuple | None): (grid, density, t_prev) after the previous
+            look, None for the first look.
+
+    Returns:
+        tuple: Critical |z| and the state after this look.
+    """
+    if state is None:
+        # First look: Z is standard normal
+        z = min(ndtri(1 - target / 2), MAX_Z)
+        b = z * np.sqrt(t)
+        grid = np.arange(-b, b + GRID_STEP, GRID_STEP)
+        density = _normal_pdf(grid / np.sqrt(t)) / np.sqrt(t)
+        return z, (grid, density, t)
+
+    grid, density, t_prev = state
+    sd = np.sqrt(t - t_prev)
+    weights = density * GRID_STEP
+
+    def crossing(b):
+        # P(|S_t| >= b and no earlier crossing)
+        return weights @ (ndtr((-b - grid) / sd) + ndtr((grid - b) / sd))
+
+    upper = MAX_Z * np.sqrt(t)
+    if crossing(upper) >= target:
+        b = upper
+    else:
+        b = brentq(lambda x: crossing(x) - target, 1e-6, upper)
+
+    new_grid = np.arange(-b, b + GRID_STEP, GRID_STEP)
+    kernel = _normal_pdf((new_grid[:, None] - grid[None, :]) / sd) / sd
+    return b / np.sqrt(t), (new_grid, kernel @ weights, t)
+
+
+def group_sequential_bounds(info_fractions, alpha=0.05):
+    """
+    Two-sided z boundaries for looks at the given information fractions.
+
+    The alpha spent at each look follows the O'Brien-Fleming spending
+    function; crossing probabilities are computed by numerical integration
+    of the Brownian motion density over the continuation region.
+
+    Args:
+        info_fractions (list[float]): Increasing information fractions in (0, 1].
+        alpha (float): Two-sided significance level.
+
+    Returns:
+        np.ndarray: Critical |z| for each look.
+    """
+    spent = np.diff(obf_spending(info_fractions, alpha), prepend=0.0)
+    bounds = []
+    state = None
+    for t, target in zip(info_fractions, spent):
+        bound, state = _next_bound(t, target, state)
+        bounds.append(bound)
+
+    return np.array(bounds)
+
+
+class RetentionMonitor:
+    """
+    Incremental monitoring of retention metrics as daily batches arrive.
+
+    Only per-group counts are kept, so each update costs one pass over the
+    new batch and O(1) work on the accumulated state.
+
+    Two modes are available:
+        - "msprt": mixture sequential probability ratio test with a normal
+          mixing distribution N(0, tau^2) on the rate difference. Reports
+          always-valid p-values and confidence sequences that stay valid
+          under continuous monitoring.
+        - "obrien-fleming": group-sequential test with Lan-DeMets
+          O'Brien-Fleming alpha spending. Each update is one look, with
+          the information fraction taken from `max_n` (planned players in
+          both groups).
+
+    Args:
+        metrics (tuple): Binary metrics to monitor.
+        alpha (float): Two-sided significance level.
+        method (str): "msprt" or "obrien-fleming".
+        tau (float): Mixture standard deviation for the rate difference (mSPRT).
+        max_n (int | None): Planned total players (O'Brien-Fleming only).
+        control (str): Control group label.
+        treatment (str): Treatment group label.
+        group_col (str): Column holding the experiment group.
+    """
+
+    def __init__(
+        self,
+        metrics=BINARY_COLS,
+        alpha: float = 0.05,
+        method: str = "msprt",
+        tau: float = 0.01,
+        max_n: int | None = None,
+        control: str = CONTROL,
+        treatment: str = TREATMENT,
+        group_col: str = GROUP_COL,
+    ):
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}")
+        if method == "obrien-fleming" and not max_n:
+            raise ValueError("max_n is required for O'Brien-Fleming monitoring")
+
+        self.metrics = tuple(metrics)
+        self.alpha = alpha
+        self.method = method
+        self.tau = tau
+        self.max_n = max_n
+        self.groups = (control, treatment)
+        self.group_col = group_col
+
+        self.n = np.zeros(2, dtype=np.int64)
+        self.successes = {m: np.zeros(2, dtype=np.int64) for m in self.metrics}
+        self.looks = []
+        self.p_always_valid = {m: 1.0 for m in self.metrics}
+        self.cs_bounds = {m: (-np.inf, np.inf) for m in self.metrics}
+        self.stopped = {m: False for m in self.metrics}
+
+        # O'Brien-Fleming boundaries so far, extended by one look at a time
+        self._info = []
+        self._bounds = []
+        self._recursion = None
+
+    def _batch_counts(self, batch):
+        if isinstance(batch, GroupSummary):
+            n = np.array([batch.count(g) for g in self.groups])
+            successes = {
+                m: np.array([batch.success(m, g) for g in self.groups])
+                for m in self.metrics
+            }
+            return n, successes
+
+        grouped = batch.groupby(self.group_col, observed=True)[list(self.metrics)]
+        sums = grouped.sum().reindex(self.groups, fill_value=0)
+        n = grouped.size().reindex(self.groups, fill_value=0).to_numpy()
+        return n, {m: sums[m].to_numpy() for m in self.metrics}
+
+    def update(self, batch) -> pd.DataFrame:
+        """
+        Add a batch of new players and return the current monitoring report.
+
+        Args:
+            batch (pd.DataFrame | GroupSummary): Players not seen before.
+        """
+        n, successes = self._batch_counts(batch)
+        self.n += n
+        for m in self.metrics:
+            self.successes[m] += successes[m]
+        self.looks.append(int(self.n.sum()))
+
+        return self.report()
+
+    def _difference(self, metric):
+        rates = self.successes[metric] / self.n
+        delta = rates[1] - rates[0]
+        var = np.sum(rates * (1 - rates) / self.n)
+        return rates, delta, var
+
+    def _msprt(self, metric, delta, var):
+        tau2 = self.tau**2
+        log_lr = 0.5 * np.log(var / (var + tau2)) + delta**2 * tau2 / (
+            2 * var * (var + tau2)
+        )
+        p = min(self.p_always_valid[metric], float(np.exp(-log_lr)))
+        self.p_always_valid[metric] = p
+
+        # Running intersection keeps the confidence sequence nested over time
+        radius = np.sqrt(
+            var
+            * (var + tau2)
+            / tau2
+            * (2 * np.log(1 / self.alpha) + np.log((var + tau2) / var))
+        )
+        low, high = self.cs_bounds[metric]
+        self.cs_bounds[metric] = (max(low, delta - radius), min(high, delta + radius))
+        return p, self.cs_bounds[metric]
+
+    def _boundary(self):
+        # Looks past the planned sample reuse the final boundary
+        t = min(self.looks[-1] / self.max_n, 1.0)
+        if not self._info or t > self._info[-1]:
+            spent = obf_spending(t, self.alpha)
+            if self._info:
+                spent -= obf_spending(self._info[-1], self.alpha)
+            bound, self._recursion = _next_bound(t, spent, self._recursion)
+            self._info.append(t)
+            self._bounds.append(bound)
+        return self._info[-1], self._bounds[-1]
+
+    def report(self) -> pd.DataFrame:
+        """Monitoring statistics per metric at the current look."""
+        if self.n.min() == 0:
+            raise ValueError("Both groups need players before monitoring")
+
+        if self.method == "obrien-fleming":
+            info, bound = self._boundary()
+
+        rows = []
+        for metric in self.metrics:
+            rates, delta, var = self._difference(metric)
+            degenerate = var == 0
+            if degenerate:
+                warnings.warn(
+                    f"{metric}: no variance yet (every player in both groups "
+                    "retained, or none), so this look is skipped",
+                    stacklevel=2,
+                )
+            z = np.nan if degenerate else delta / np.sqrt(var)
+            row = {
+                "Metric": metric,
+                "N control": int(self.n[0]),
+                "N treatment": int(self.n[1]),
+                "Control rate": rates[0],
+                "Treatment rate": rates[1],
+                "Absolute Δ (pp)": delta * 100,
+                "z": z,
+            }
+
+            if self.method == "msprt":
+                if degenerate:
+                    p, (low, high) = self.p_always_valid[metric], self.cs_bounds[metric]
+                else:
+                    p, (low, high) = self._msprt(metric, delta, var)
+                row["Always-valid p-value"] = p
+                row["CS low (pp)"] = low * 100
+                row["CS high (pp)"] = high * 100
+                reject = p < self.alpha
+            else:
+                row["Information fraction"] = info
+                row["Boundary |z|"] = bound
+                reject = not degenerate and abs(z) >= bound
+
+            self.stopped[metric] = self.stopped[metric] or bool(reject)
+            row["Stop?"] = "Yes" if self.stopped[metric] else "No"
+            rows.append(row)
+
+        return pd.DataFrame(rows)
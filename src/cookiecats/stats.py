@@ -1,107 +1,146 @@
 # Imports
 import math
 import numpy as np
-import pandas as pd
-from scipy.stats import chisquare, mannwhitneyu, ttest_ind
-from statsmodels.stats.multitest import multipletests
-from statsmodels.stats.power import NormalIndPower
-from statsmodels.stats.proportion import (
-    confint_proportions_2indep,
-    proportion_confint,
-    proportion_effectsize,
-    proportions_ztest,
+from scipy.special import chdtrc, ndtr, ndtri
+from .bootstrap import as_counts, bootstrap_ci, weighted_statistic
+from .planning import planning_table
+from .power import cohens_h, h_to_p1, mde_pp  # h_to_p1 kept for existing callers
+from .results import (
+    BootstrapResult,
+    EngagementStats,
+    MDEResult,
+    MultiArmSRM,
+    ProportionTest,
+    RoundsTest,
+    SRMResult,
 )
+from .summary import CONTROL, TREATMENT, GroupSummary, as_summary
 
 
 # Function to test SRM
-def test_srm_chi2(control_players: int, treatment_players: int):
+def test_srm_chi2(control_players: int, treatment_players: int, ratio=(1, 1)):
     # Calculate total players
     total_players = control_players + treatment_players
 
-    # Create lists of observed and expected counts per version
-    observed = [control_players, treatment_players]
-    expected = [total_players / 2, total_players / 2]
+    # Planned control:treatment allocation, 50/50 by default
+    srm = test_srm([control_players, treatment_players], ratios=ratio)
 
     # Create allocation ratios per version
     control_perc = control_players / total_players
     treatment_perc = treatment_players / total_players
 
-    # Run chi-square test for SRM
-    chi_stat, srm_chi2_pval = chisquare(f_obs=observed, f_exp=expected)
-
-    return srm_chi2_pval, control_perc, treatment_perc
-
-
-# Invert Cohen's h to get p1 given p0 and h
-def h_to_p1(h, p0):
-    return np.sin(np.arcsin(np.sqrt(p0)) + h / 2.0) ** 2
+    return SRMResult(srm.pval, control_perc, treatment_perc)
+
+
+def test_srm(counts, ratios=None) -> MultiArmSRM:
+    """
+    Chi-square sample ratio mismatch test for any number of arms.
+
+    Args:
+        counts (dict | GroupSummary | array-like): Players per arm, as an
+            {arm: count} mapping, a summary or a plain sequence.
+        ratios (dict | array-like | None): Planned allocation weights per
+            arm, in the same form as `counts`. Equal allocation if omitted.
+    """
+    if isinstance(counts, GroupSummary):
+        counts = dict(zip(counts.groups, counts.n))
+    if isinstance(counts, dict):
+        arms = tuple(counts)
+        observed = np.array([counts[arm] for arm in arms], dtype=float)
+        if isinstance(ratios, dict):
+            ratios = [ratios[arm] for arm in arms]
+    else:
+        observed = np.asarray(counts, dtype=float)
+        arms = tuple(range(len(observed)))
+
+    weights = np.ones(len(observed)) if ratios is None else np.asarray(ratios, float)
+    expected_share = weights / weights.sum()
+    expected = observed.sum() * expected_share
+
+    # k - 1 degrees of freedom
+    chi_stat = np.sum((observed - expected) ** 2 / expected)
+    pval = chdtrc(len(observed) - 1, chi_stat)
+
+    return MultiArmSRM(
+        arms=arms,
+        chi2=chi_stat,
+        pval=pval,
+        observed_share=observed / observed.sum(),
+        expected_share=expected_share,
+    )
 
 
-def solve_mde(df: pd.DataFrame, alpha: float, power: float, p0: float):
+def solve_mde(df, alpha: float, power: float, p0: float, control: str = CONTROL):
     # Solve for the effect size h required to achieve 80% power at the actual N
-    N = df[df["version"] == "gate_30"].shape[0]  # actual sample size
-
-    power_analysis = NormalIndPower()
-    effectsize_needed = power_analysis.solve_power(
-        effect_size=None,
-        nobs1=N,
-        alpha=alpha,
-        power=power,
-        ratio=1.0,
-        alternative="two-sided",
-    )
+    N = as_summary(df).count(control)  # actual sample size
 
-    # Convert h back to absolute uplift in percentage points
-    p1_mde = h_to_p1(effectsize_needed, p0)
-    mde_pp_current = (p1_mde - p0) * 100
+    # Closed-form power solution, converted to absolute uplift in pp
+    mde_pp_current = float(
+        mde_pp(p0, N, alpha=alpha, power=power, ratio=1.0, alternative="two-sided")
+    )
 
-    return N, mde_pp_current
+    return MDEResult(N, mde_pp_current)
 
 
 def solve_required_n(alpha: float, power: float, p0: float):
     # Choose target MDEs in percentage points (pp)
     targets_pp = [0.5, 0.8, 1.0, 1.5, 2.0]
 
-    rows = []
-    for pp in targets_pp:
-        # Calculate the required sample size for each target MDE
-        p1_target = min(max(p0 + pp / 100.0, 1e-9), 1 - 1e-9)
-        effectsize_target = proportion_effectsize(p1_target, p0)
-        power_analysis = NormalIndPower()
-        n_per_group = power_analysis.solve_power(
-            effect_size=effectsize_target,
-            nobs1=None,
-            alpha=alpha,
-            power=power,
-            ratio=1.0,
-            alternative="two-sided",
-        )
+    # Calculate the required sample size for all target MDEs at once
+    table = planning_table(p0, targets_pp, alpha=alpha, power=power)
+
+    return table[["Target MDE (pp)", "Required N control"]].rename(
+        columns={"Required N control": "Required N per group"}
+    )
+
+
+def wilson_ci(successes, nobs, alpha: float = 0.05):
+    """
+    Wilson score interval for a proportion, elementwise.
+
+    Same result as statsmodels' proportion_confint(method="wilson").
+    """
+    successes = np.asarray(successes, dtype=float)
+    nobs = np.asarray(nobs, dtype=float)
+    z = ndtri(1 - alpha / 2)
+    p = successes / nobs
+    denom = 1 + z**2 / nobs
+    center = (p + z**2 / (2 * nobs)) / denom
+    radius = z * np.sqrt(p * (1 - p) / nobs + z**2 / (4 * nobs**2)) / denom
+    return center - radius, center + radius
 
-        rows.append(
-            {"Target MDE (pp)": pp, "Required N per group": int(math.ceil(n_per_group))}
-        )
 
-    return pd.DataFrame(rows)
+def proportions_ztest_from_counts(successes, nobs):
+    """
+    Two-sided pooled z-test for two proportions, as statsmodels' proportions_ztest.
 
+    Returns:
+        tuple: z statistic (first minus second group) and p-value.
+    """
+    (s1, s2), (n1, n2) = successes, nobs
+    pooled = (s1 + s2) / (n1 + n2)
+    se = math.sqrt(pooled * (1 - pooled) * (1 / n1 + 1 / n2))
+    z_stat = (s1 / n1 - s2 / n2) / se
+    return z_stat, 2 * ndtr(-abs(z_stat))
 
-def test_two_prop_z(df, ctrl, treat, col, alpha, p0):
+
+def test_two_prop_z(
+    df, ctrl, treat, col, alpha, p0, control=CONTROL, treatment=TREATMENT
+):
     # Successes = players retained at day-7
-    success_ctrl = df[df["version"] == "gate_30"][col].sum()
-    success_treat = df[df["version"] == "gate_40"][col].sum()
+    summary = as_summary(df)
+    success_ctrl = summary.success(col, control)
+    success_treat = summary.success(col, treatment)
 
     successes = [success_ctrl, success_treat]
     nobs = [ctrl, treat]
 
     # Two-proportion z-test
-    z_stat, pval = proportions_ztest(successes, nobs, alternative="two-sided")
+    z_stat, pval = proportions_ztest_from_counts(successes, nobs)
 
     # Confidence intervals for each group
-    (ci_ctrl_low, ci_ctrl_high) = proportion_confint(
-        success_ctrl, ctrl, alpha=alpha, method="wilson"
-    )
-    (ci_treat_low, ci_treat_high) = proportion_confint(
-        success_treat, treat, alpha=alpha, method="wilson"
-    )
+    (ci_ctrl_low, ci_ctrl_high) = wilson_ci(success_ctrl, ctrl, alpha=alpha)
+    (ci_treat_low, ci_treat_high) = wilson_ci(success_treat, treat, alpha=alpha)
 
     # Calculate observed proportions and difference
     prop_ctrl = success_ctrl / ctrl
@@ -109,7 +148,9 @@ def test_two_prop_z(df, ctrl, treat, col, alpha, p0):
     delta = prop_treat - prop_ctrl
     delta_abs_pp = delta * 100
 
-    # Confidence intervals for the difference
+    # Confidence intervals for the difference (score method, no closed form)
+    from statsmodels.stats.proportion import confint_proportions_2indep
+
     (ci_delta_low, ci_delta_high) = confint_proportions_2indep(
         success_treat,
         treat,
@@ -122,98 +163,184 @@ def test_two_prop_z(df, ctrl, treat, col, alpha, p0):
     delta_rel_pct = (prop_treat / prop_ctrl - 1) * 100
 
     # Cohen's h
-    p1 = df[df["version"] == "gate_40"][col].mean()
-    h = proportion_effectsize(p0, p1)
-
-    return (
-        prop_ctrl,  # 0
-        ci_ctrl_low,  # 1
-        ci_ctrl_high,  # 2
-        prop_treat,  # 3
-        ci_treat_low,  # 4
-        ci_treat_high,  # 5
-        z_stat,  # 6
-        pval,  # 7
-        delta_abs_pp,  # 8
-        ci_delta_low,  # 9
-        ci_delta_high,  # 10
-        delta_rel_pct,  # 11
-        h,  # 12
+    p1 = summary.rate(col, treatment)
+    h = cohens_h(p0, p1)
+
+    return ProportionTest(
+        prop_ctrl=prop_ctrl,
+        ci_ctrl_low=ci_ctrl_low,
+        ci_ctrl_high=ci_ctrl_high,
+        prop_treat=prop_treat,
+        ci_treat_low=ci_treat_low,
+        ci_treat_high=ci_treat_high,
+        z_stat=z_stat,
+        pval=pval,
+        delta_abs_pp=delta_abs_pp,
+        ci_delta_low=ci_delta_low,
+        ci_delta_high=ci_delta_high,
+        delta_rel_pct=delta_rel_pct,
+        h=h,
     )
 
 
-def calculate_engagement_stats(df):
-    # Game rounds played per version
-    rounds_ctrl = df[df["version"] == "gate_30"]["sum_gamerounds"]
-    rounds_treat = df[df["version"] == "gate_40"]["sum_gamerounds"]
+def calculate_engagement_stats(df, control=CONTROL, treatment=TREATMENT):
+    # Scalars only; the game round histograms stay in the summary
+    summary = as_summary(df)
 
     # Engagement statistics for context
-    mean_ctrl = rounds_ctrl.mean()
-    median_ctrl = rounds_ctrl.median()
-    mean_treat = rounds_treat.mean()
-    median_treat = rounds_treat.median()
+    mean_ctrl = summary.mean(control)
+    median_ctrl = summary.median(control)
+    mean_treat = summary.mean(treatment)
+    median_treat = summary.median(treatment)
     delta_mean = mean_treat - mean_ctrl
 
-    # Transform game rounds
-    log_ctrl = np.log1p(rounds_ctrl)
-    log_treat = np.log1p(rounds_treat)
-
-    return (
-        rounds_ctrl,  # 0
-        rounds_treat,  # 1
-        mean_ctrl,  # 2
-        median_ctrl,  # 3
-        mean_treat,  # 4
-        median_treat,  # 5
-        delta_mean,  # 6
-        log_ctrl,  # 7
-        log_treat,  # 8
+    return EngagementStats(
+        mean_ctrl=mean_ctrl,
+        median_ctrl=median_ctrl,
+        mean_treat=mean_treat,
+        median_treat=median_treat,
+        delta_mean=delta_mean,
+        log_mean_ctrl=float(summary.log_mean(control)),
+        log_mean_treat=float(summary.log_mean(treatment)),
     )
 
 
-def test_game_rounds(engagement_stats):
-    # Mann-Whitney U test
-    u_stat, pval_rounds = mannwhitneyu(
-        engagement_stats[0], engagement_stats[1], alternative="two-sided"
+def mannwhitneyu_from_counts(
+    counts_ctrl, counts_treat, alternative="two-sided", use_continuity=True
+):
+    """
+    Mann-Whitney U test from counts over a shared sorted grid of distinct values.
+
+    Every tied value shares one midrank, so U and the tie-corrected variance
+    are computed in O(distinct values) without sorting raw samples. The
+    p-value uses the normal approximation, matching scipy.stats.mannwhitneyu
+    with method="asymptotic" (its choice for tied or large samples).
+    Stacked counts of shape (pairs, values) give one test per row.
+
+    Args:
+        counts_ctrl (np.ndarray): Control counts per distinct value.
+        counts_treat (np.ndarray): Treatment counts per distinct value.
+        alternative (str): "two-sided", "less" or "greater".
+        use_continuity (bool): Apply the 0.5 continuity correction.
+
+    Returns:
+        tuple: U statistic of the control sample and p-value.
+    """
+    counts_ctrl = np.asarray(counts_ctrl, dtype=float)
+    counts_treat = np.asarray(counts_treat, dtype=float)
+    ties = counts_ctrl + counts_treat
+    n1, n2 = counts_ctrl.sum(axis=-1), counts_treat.sum(axis=-1)
+    n = n1 + n2
+
+    # Midrank of every distinct value and rank sum of the control sample
+    midranks = np.cumsum(ties, axis=-1) - (ties - 1) / 2
+    u1 = (counts_ctrl * midranks).sum(axis=-1) - n1 * (n1 + 1) / 2
+    u2 = n1 * n2 - u1
+
+    mu = n1 * n2 / 2
+    tie_term = (ties**3 - ties).sum(axis=-1) / (n * (n - 1))
+    sigma = np.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+
+    if alternative == "two-sided":
+        u = np.maximum(u1, u2)
+    elif alternative == "greater":
+        u = u1
+    elif alternative == "less":
+        u = u2
+    else:
+        raise ValueError(f"Unknown alternative: {alternative!r}")
+
+    z = (u - mu - 0.5 * use_continuity) / sigma
+    pval = ndtr(-z)
+    if alternative == "two-sided":
+        pval = np.minimum(2 * pval, 1.0)
+
+    return u1, pval
+
+
+def mannwhitneyu_from_hist(hist_ctrl, hist_treat, **kwargs):
+    """
+    Mann-Whitney U test from (values, counts) histograms on different value grids.
+
+    Pre-aggregated histograms, e.g. from separate exports, are aligned on
+    the union of their values before calling `mannwhitneyu_from_counts`.
+    """
+    (values_ctrl, counts_ctrl), (values_treat, counts_treat) = hist_ctrl, hist_treat
+    values = np.union1d(values_ctrl, values_treat)
+    aligned_ctrl = np.zeros(len(values))
+    aligned_treat = np.zeros(len(values))
+    np.add.at(aligned_ctrl, np.searchsorted(values, values_ctrl), counts_ctrl)
+    np.add.at(aligned_treat, np.searchsorted(values, values_treat), counts_treat)
+
+    return mannwhitneyu_from_counts(aligned_ctrl, aligned_treat, **kwargs)
+
+
+def test_game_rounds(df, control=CONTROL, treatment=TREATMENT):
+    # Tests run on the game round histograms of the data or its GroupSummary
+    if isinstance(df, EngagementStats):
+        raise TypeError(
+            "test_game_rounds needs the data or its GroupSummary; "
+            "EngagementStats only holds scalar statistics"
+        )
+    summary = as_summary(df)
+
+    # Mann-Whitney U test from the game round histograms
+    u_stat, pval_rounds = mannwhitneyu_from_counts(
+        summary.hist[summary.index(control)],
+        summary.hist[summary.index(treatment)],
+        alternative="two-sided",
     )
 
-    # Welch's t-test (unequal variances)
-    tstat_log, pval_log = ttest_ind(
-        engagement_stats[7],
-        engagement_stats[8],
+    # Welch's t-test (unequal variances) from log-scale moments
+    from scipy.stats import ttest_ind_from_stats
+
+    tstat_log, pval_log = ttest_ind_from_stats(
+        summary.log_mean(control),
+        np.sqrt(summary.log_var(control)),
+        summary.count(control),
+        summary.log_mean(treatment),
+        np.sqrt(summary.log_var(treatment)),
+        summary.count(treatment),
         equal_var=False,
         alternative="two-sided",
     )
 
-    return u_stat, pval_rounds, tstat_log, pval_log
+    return RoundsTest(u_stat, pval_rounds, tstat_log, pval_log)
+
+
+def bootstrap_mean_diff(rounds_ctrl, rounds_treat, n_boot: int = 5000, seed=42):
+    # Percentile bootstrap for the mean difference (treatment - control), raw scale
+    # Samples may be raw game rounds or (values, counts) histograms
+    obs_diff, ci_low, ci_high = bootstrap_ci(
+        rounds_ctrl,
+        rounds_treat,
+        statistic="mean",
+        n_boot=n_boot,
+        method="percentile",
+        rng=seed,
+    )
 
+    mean_ctrl, mean_treat = (
+        weighted_statistic(*as_counts(rounds), "mean")
+        for rounds in (rounds_ctrl, rounds_treat)
+    )
 
-def bootstrap_mean_diff(rounds_ctrl, rounds_treat):
-    # Simple percentile bootstrap for the mean difference on the raw scale
-    np.random.seed(42)
-    B = 5000
-    boot_diffs = []
+    return BootstrapResult(obs_diff, ci_low, ci_high, mean_ctrl, mean_treat)
 
-    for i in range(B):
-        # Resample with replacement from both groups
-        ctrl_sample_mean = rounds_ctrl.sample(n=len(rounds_ctrl), replace=True).mean()
-        treat_sample_mean = rounds_treat.sample(
-            n=len(rounds_treat), replace=True
-        ).mean()
-        boot_diffs.append(ctrl_sample_mean - treat_sample_mean)
 
-    boot_diffs = np.array(boot_diffs)
-    ci_low, ci_high = np.percentile(boot_diffs, [2.5, 97.5])
-    obs_diff = rounds_treat.mean() - rounds_ctrl.mean()
+# Short names for the multipletests methods
+CORRECTIONS = {"holm": "holm", "bonferroni": "bonferroni", "bh": "fdr_bh"}
 
-    return obs_diff, ci_low, ci_high, ctrl_sample_mean, treat_sample_mean
 
+def correct_pvals(*args, alpha, method: str = "holm"):
+    # Guardrail p-values, either listed or as one array for a whole family
+    guardrail_unadj = np.concatenate([np.atleast_1d(p) for p in args])
 
-def correct_pvals(*args, alpha):
-    # Guardrail p-values
-    guardrail_unadj = [*args]
+    # Perform Holm (default), Bonferroni or Benjamini-Hochberg correction
+    from statsmodels.stats.multitest import multipletests
 
-    # Perform Holm correction
-    guardrail_adj = multipletests(guardrail_unadj, alpha=alpha, method="holm")
+    guardrail_adj = multipletests(
+        guardrail_unadj, alpha=alpha, method=CORRECTIONS.get(method, method)
+    )
 
     return guardrail_adj
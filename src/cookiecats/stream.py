@@ -0,0 +1,178 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .io import SCHEMA, find_cookiecats, iter_cookiecats
+from .stats import (
+    calculate_engagement_stats,
+    test_game_rounds,
+    test_srm_chi2,
+    test_two_prop_z,
+)
+from .summary import CONTROL, TREATMENT, GroupSummary, merge_summaries, summarize
+
+# Columns needed by the streamed tests, userid is never read
+STREAM_COLUMNS = ["version", "sum_gamerounds", "retention_1", "retention_7"]
+
+# Size of the CSV byte ranges handed to parallel workers
+BLOCK_BYTES = 64 * 2**20
+
+
+def summarize_stream(path: str | None = None, chunksize: int = 1_000_000):
+    """
+    Fold a CSV or Parquet export into a GroupSummary chunk by chunk.
+
+    Only one chunk and the running accumulators are held in memory.
+    Raises ValueError if the export has no rows.
+    """
+    path = find_cookiecats(path)
+    chunks = iter_cookiecats(path, chunksize=chunksize, columns=STREAM_COLUMNS)
+    summary: GroupSummary = merge_summaries(
+        (summarize(chunk) for chunk in chunks), path
+    )
+    return summary
+
+
+def _csv_ranges(path, block_bytes):
+    # Byte ranges of the CSV body; line boundaries are resolved by the workers
+    with open(path, "rb") as f:
+        header = f.readline()
+        body_start = f.tell()
+    size = os.path.getsize(path)
+    starts = range(body_start, size, block_bytes)
+    return header, [(start, min(start + block_bytes, size)) for start in starts]
+
+
+def _summarize_csv_range(path, header, start, end):
+    """
+    Summarize the CSV lines whose first byte lies in [start, end).
+
+    A line crossing `end` is read to its end here and skipped by the
+    worker of the next range, so every line is summarized exactly once.
+    """
+    with open(path, "rb") as f:
+        # Skip the rest of a line that began before `start`
+        f.seek(start - 1)
+        f.readline()
+        if f.tell() >= end:
+            return None
+        body = f.read(end - f.tell())
+        if not body.endswith(b"\n"):
+            body += f.readline()
+
+    dtype = {col: SCHEMA[col] for col in STREAM_COLUMNS}
+    chunk = pd.read_csv(io.BytesIO(header + body), usecols=STREAM_COLUMNS, dtype=dtype)
+    return summarize(chunk)
+
+
+def _summarize_row_group(path, index):
+    import pyarrow.parquet as pq
+
+    table = pq.ParquetFile(path).read_row_group(index, columns=STREAM_COLUMNS)
+    return summarize(table.to_pandas())
+
+
+def summarize_parallel(
+    path: str | None = None,
+    max_workers: int | None = None,
+    block_bytes: int = BLOCK_BYTES,
+) -> GroupSummary:
+    """
+    Summarize a CSV or Parquet export across a process pool.
+
+    CSVs are split into byte ranges of `block_bytes` and Parquet files by
+    row group. Each worker parses only its part and returns a partial
+    GroupSummary, and the parts are merged in file order. Many small
+    parts keep per-worker memory bounded and balance uneven parts.
+    Raises ValueError if the export has no rows.
+
+    Args:
+        path (str | None): CSV or Parquet export. Searches the repo if omitted.
+        max_workers (int | None): Worker processes, all cores if omitted.
+        block_bytes (int): Bytes per CSV range.
+    """
+    path = find_cookiecats(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        n_groups = pq.ParquetFile(path).num_row_groups
+        tasks = [(_summarize_row_group, path, i) for i in range(n_groups)]
+    else:
+        header, ranges = _csv_ranges(path, block_bytes)
+        tasks = [(_summarize_csv_range, path, header, *r) for r in ranges]
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        futures = [pool.submit(*task) for task in tasks]
+        parts = [future.result() for future in futures]
+
+    summary: GroupSummary = merge_summaries(parts, path)
+    return summary
+
+
+def analyze_summary(
+    summary: GroupSummary,
+    alpha: float,
+    p0: float | None = None,
+    control: str = CONTROL,
+    treatment: str = TREATMENT,
+):
+    """
+    Run the SRM check, retention z-tests and game-round tests on a summary.
+
+    Args:
+        summary (GroupSummary): Accumulated per-group statistics.
+        alpha (float): Significance level.
+        p0 (float | None): Baseline day-7 retention, control rate if omitted.
+        control (str): Control group label.
+        treatment (str): Treatment group label.
+
+    Returns:
+        dict: Results keyed by test, as returned by the `cookiecats.stats` tests.
+    """
+    ctrl = summary.count(control)
+    treat = summary.count(treatment)
+    if p0 is None:
+        p0 = summary.rate("retention_7", control)
+
+    labels = dict(control=control, treatment=treatment)
+    engagement_stats = calculate_engagement_stats(summary, **labels)
+
+    return {
+        "srm": test_srm_chi2(ctrl, treat),
+        "ret1": test_two_prop_z(
+            summary, ctrl, treat, "retention_1", alpha, p0, **labels
+        ),
+        "ret7": test_two_prop_z(
+            summary, ctrl, treat, "retention_7", alpha, p0, **labels
+        ),
+        "engagement": engagement_stats,
+        "rounds": test_game_rounds(summary, **labels),
+    }
+
+
+def analyze_stream(
+    path: str | None = None,
+    alpha: float = 0.05,
+    p0: float | None = None,
+    chunksize: int = 1_000_000,
+    max_workers: int | None = 1,
+    block_bytes: int = BLOCK_BYTES,
+    control: str = CONTROL,
+    treatment: str = TREATMENT,
+):
+    """
+    Summarize an export chunk by chunk, then run the tests on the summary.
+
+    With `max_workers` other than 1, the export is summarized in parallel
+    by `summarize_parallel` (all cores if None) in CSV byte ranges of
+    `block_bytes`.
+    """
+    if max_workers == 1:
+        summary = summarize_stream(path, chunksize=chunksize)
+    else:
+        summary = summarize_parallel(
+            path, max_workers=max_workers, block_bytes=block_bytes
+        )
+    return analyze_summary(summary, alpha, p0, control=control, treatment=treatment)
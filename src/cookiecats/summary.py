@@ -0,0 +1,238 @@
+from dataclasses import dataclass
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from .bootstrap import weighted_statistic
+
+GROUP_COL = "version"
+BINARY_COLS = ("retention_1", "retention_7")
+VALUE_COL = "sum_gamerounds"
+CONTROL = "gate_30"
+TREATMENT = "gate_40"
+
+# Largest integer value histogrammed with a dense bincount, np.unique beyond it
+MAX_DENSE_VALUE = 2**22
+
+
+@dataclass
+class GroupSummary:
+    """
+    Per-group sufficient statistics for the experiment tests.
+
+    Attributes:
+        groups (tuple): Group labels, e.g. ("gate_30", "gate_40").
+        n (np.ndarray): Players per group.
+        successes (dict): Successes per group for each binary metric.
+        value_sum (np.ndarray): Sum of `sum_gamerounds` per group.
+        value_sumsq (np.ndarray): Sum of squared `sum_gamerounds` per group.
+        log_sum (np.ndarray): Sum of log1p(`sum_gamerounds`) per group.
+        log_sumsq (np.ndarray): Sum of squared log1p(`sum_gamerounds`) per group.
+        values (np.ndarray): Sorted distinct `sum_gamerounds` values.
+        hist (np.ndarray): Counts per group and distinct value, shape (groups, values).
+    """
+
+    groups: tuple
+    n: np.ndarray
+    successes: dict
+    value_sum: np.ndarray
+    value_sumsq: np.ndarray
+    log_sum: np.ndarray
+    log_sumsq: np.ndarray
+    values: np.ndarray
+    hist: np.ndarray
+
+    def index(self, group) -> int:
+        try:
+            return self.groups.index(group)
+        except ValueError:
+            raise KeyError(f"Group {group!r} not in summary {self.groups}") from None
+
+    def count(self, group) -> int:
+        return int(self.n[self.index(group)])
+
+    def success(self, col, group) -> int:
+        return int(self.successes[col][self.index(group)])
+
+    def rate(self, col, group) -> float:
+        i = self.index(group)
+        return self.successes[col][i] / self.n[i]
+
+    def mean(self, group) -> float:
+        i = self.index(group)
+        return self.value_sum[i] / self.n[i]
+
+    def var(self, group) -> float:
+        i = self.index(group)
+        return _sample_var(self.value_sum[i], self.value_sumsq[i], self.n[i])
+
+    def log_mean(self, group) -> float:
+        i = self.index(group)
+        return self.log_sum[i] / self.n[i]
+
+    def log_var(self, group) -> float:
+        i = self.index(group)
+        return _sample_var(self.log_sum[i], self.log_sumsq[i], self.n[i])
+
+    def median(self, group) -> float:
+        values, counts = self.histogram(group)
+        return float(weighted_statistic(values, counts, "median"))
+
+    def merge(self, other: "GroupSummary") -> "GroupSummary":
+        """Combine with the summary of another disjoint set of players."""
+        groups = tuple(sorted(set(self.groups) | set(other.groups)))
+        values = np.union1d(self.values, other.values)
+
+        n = np.zeros(len(groups), dtype=np.int64)
+        successes = {
+            col: np.zeros(len(groups), dtype=np.int64) for col in self.successes
+        }
+        moments = np.zeros((4, len(groups)))
+        hist = np.zeros((len(groups), len(values)), dtype=np.int64)
+        for part in (self, other):
+            rows = [groups.index(g) for g in part.groups]
+            n[rows] += part.n
+            for col in successes:
+                successes[col][rows] += part.successes[col]
+            moments[:, rows] += [
+                part.value_sum,
+                part.value_sumsq,
+                part.log_sum,
+                part.log_sumsq,
+            ]
+            hist[np.ix_(rows, np.searchsorted(values, part.values))] += part.hist
+
+        return GroupSummary(groups, n, successes, *moments, values, hist)
+
+    def quantile(self, group, q):
+        values, counts = self.histogram(group)
+        return hist_quantile(values, counts, q)
+
+    def histogram(self, group):
+        """Distinct values and their counts for one group, zero counts dropped."""
+        counts = self.hist[self.index(group)]
+        keep = counts > 0
+        return self.values[keep], counts[keep]
+
+
+def hist_quantile(values, counts, q):
+    """
+    Quantiles of a sample given as counts over sorted distinct values.
+
+    Uses linear interpolation between order statistics, like np.quantile.
+    """
+    cum_counts = np.cumsum(counts)
+    pos = np.asarray(q, dtype=float) * (cum_counts[-1] - 1)
+    below = np.floor(pos).astype(np.int64)
+    above = np.minimum(below + 1, cum_counts[-1] - 1)
+    low = values[np.searchsorted(cum_counts, below, side="right")].astype(float)
+    high = values[np.searchsorted(cum_counts, above, side="right")].astype(float)
+    return low + (pos - below) * (high - low)
+
+
+def _sample_var(total, total_sq, n):
+    return (total_sq - total**2 / n) / (n - 1)
+
+
+def _value_histogram(codes, x, k):
+    # Dense bincount over (group, value) for small non-negative integers
+    if (
+        np.issubdtype(x.dtype, np.integer)
+        and len(x)
+        and 0 <= x.min()
+        and x.max() < MAX_DENSE_VALUE
+    ):
+        width = int(x.max()) + 1
+        flat = np.bincount(codes * width + x, minlength=k * width).reshape(k, width)
+        values = np.flatnonzero(flat.any(axis=0))
+        return values, flat[:, values]
+
+    values, inverse = np.unique(x, return_inverse=True)
+    m = len(values)
+    hist = np.bincount(codes * m + inverse, minlength=k * m).reshape(k, m)
+    return values, hist
+
+
+def summarize(
+    df: pd.DataFrame,
+    group_col: str = GROUP_COL,
+    binary_cols=None,
+    value_col: str = VALUE_COL,
+) -> GroupSummary:
+    """
+    Compute per-group sufficient statistics in a single pass over the data.
+
+    Args:
+        df (pd.DataFrame): Player-level experiment data.
+        group_col (str): Column holding the experiment group.
+        binary_cols (list | None): Binary metrics to count successes for.
+            Defaults to the retention columns present in `df`.
+        value_col (str): Count metric to histogram.
+    """
+    if binary_cols is None:
+        binary_cols = [col for col in BINARY_COLS if col in df.columns]
+
+    codes, labels = pd.factorize(df[group_col], sort=True)
+    binary = {col: df[col].to_numpy() for col in binary_cols}
+    return summarize_codes(codes, labels, binary, df[value_col].to_numpy())
+
+
+def summarize_codes(codes, groups, binary: dict, x) -> GroupSummary:
+    """
+    Compute per-group sufficient statistics from already encoded arrays.
+
+    Args:
+        codes (np.ndarray): Group index per player, into `groups`.
+        groups (list): Group labels.
+        binary (dict): Binary metric name -> 0/1 values per player.
+        x (np.ndarray): Count metric per player.
+    """
+    k = len(groups)
+
+    successes = {}
+    for col, flags in binary.items():
+        counts = np.bincount(codes, weights=flags, minlength=k)
+        successes[col] = counts.astype(np.int64)
+
+    # Moments follow exactly from the value histogram
+    values, hist = _value_histogram(codes, x, k)
+    values_f = values.astype(float)
+    log_values = np.log1p(values_f)
+
+    return GroupSummary(
+        groups=tuple(str(label) for label in groups),
+        n=hist.sum(axis=1),
+        successes=successes,
+        value_sum=hist @ values_f,
+        value_sumsq=hist @ values_f**2,
+        log_sum=hist @ log_values,
+        log_sumsq=hist @ log_values**2,
+        values=values,
+        hist=hist,
+    )
+
+
+def merge_summaries(parts, source="data"):
+    """
+    Merge partial summaries in order, skipping empty or missing parts.
+
+    Args:
+        parts (iterable): GroupSummary (or any summary with `n` and `merge`)
+            per chunk, None for a chunk without rows.
+        source (str | Path): Name of the input, used in the error message.
+
+    Raises ValueError if no part holds any rows.
+    """
+    parts = (part for part in parts if part is not None and part.n.sum() > 0)
+    first = next(parts, None)
+    if first is None:
+        raise ValueError(f"{source} has no rows")
+    return reduce(type(first).merge, parts, first)
+
+
+def as_summary(data) -> GroupSummary:
+    """Return `data` unchanged if it is already a GroupSummary, else summarize it."""
+    if isinstance(data, GroupSummary):
+        return data
+    return summarize(data)
@@ -1,4 +1,5 @@
 import pandas as pd
+from .summary import CONTROL, TREATMENT
 
 
 def build_results_table(
@@ -9,34 +10,41 @@ def build_results_table(
     guardrail_adj,
     engagement_stats,
     alpha,
+    control=CONTROL,
+    treatment=TREATMENT,
+    primary_label="Day-7 retention",
+    guardrail_label="Day-1 retention",
 ):
+    ctrl_col = f"Control ({control})"
+    treat_col = f"Treatment ({treatment})"
+
     rows = []
     # Day-7 retention
     rows.append(
         {
-            "Metric": "Day-7 retention",
-            "Control (gate_30)": f"{ret7_results[0]:.2%} (95% CI [{ret7_results[1]:.2%}, {ret7_results[2]:.2%}])",
-            "Treatment (gate_40)": f"{ret7_results[3]:.2%} (95% CI [{ret7_results[4]:.2%}, {ret7_results[5]:.2%}])",
-            "Absolute Δ (pp/unit)": f"{ret7_results[8]:.2f} pp (95% CI [{ret7_results[9] * 100:.2f}, {ret7_results[10] * 100:.2f}])",
-            "Relative Δ (%)": f"{ret7_results[11]:.2f}%",
-            "Effect size": f"Cohen's h = {ret7_results[12]:.2f}",
-            "Statistic": f"z = {ret7_results[6]:.2f}",
-            "p-value": f"{ret7_results[7]:.4f}",
+            "Metric": primary_label,
+            ctrl_col: f"{ret7_results.prop_ctrl:.2%} (95% CI [{ret7_results.ci_ctrl_low:.2%}, {ret7_results.ci_ctrl_high:.2%}])",
+            treat_col: f"{ret7_results.prop_treat:.2%} (95% CI [{ret7_results.ci_treat_low:.2%}, {ret7_results.ci_treat_high:.2%}])",
+            "Absolute Δ (pp/unit)": f"{ret7_results.delta_abs_pp:.2f} pp (95% CI [{ret7_results.ci_delta_low * 100:.2f}, {ret7_results.ci_delta_high * 100:.2f}])",
+            "Relative Δ (%)": f"{ret7_results.delta_rel_pct:.2f}%",
+            "Effect size": f"Cohen's h = {ret7_results.h:.2f}",
+            "Statistic": f"z = {ret7_results.z_stat:.2f}",
+            "p-value": f"{ret7_results.pval:.4f}",
             "Adjusted p-value": None,
-            "Significant?": "Yes" if ret7_results[7] < alpha else "No",
+            "Significant?": "Yes" if ret7_results.pval < alpha else "No",
         }
     )
     # Day-1 retention
     rows.append(
         {
-            "Metric": "Day-1 retention",
-            "Control (gate_30)": f"{ret1_results[0]:.2%} (95% CI [{ret1_results[1]:.2%}, {ret1_results[2]:.2%}])",
-            "Treatment (gate_40)": f"{ret1_results[3]:.2%} (95% CI [{ret1_results[4]:.2%}, {ret1_results[5]:.2%}])",
-            "Absolute Δ (pp/unit)": f"{ret1_results[8]:.2f} pp (95% CI [{ret1_results[9] * 100:.2f}, {ret1_results[10] * 100:.2f}])",
-            "Relative Δ (%)": f"{ret1_results[11]:.2f}%",
-            "Effect size": f"Cohen's h = {ret1_results[12]:.2f}",
-            "Statistic": f"z = {ret1_results[6]:.2f}",
-            "p-value": f"{ret1_results[7]:.4f}",
+            "Metric": guardrail_label,
+            ctrl_col: f"{ret1_results.prop_ctrl:.2%} (95% CI [{ret1_results.ci_ctrl_low:.2%}, {ret1_results.ci_ctrl_high:.2%}])",
+            treat_col: f"{ret1_results.prop_treat:.2%} (95% CI [{ret1_results.ci_treat_low:.2%}, {ret1_results.ci_treat_high:.2%}])",
+            "Absolute Δ (pp/unit)": f"{ret1_results.delta_abs_pp:.2f} pp (95% CI [{ret1_results.ci_delta_low * 100:.2f}, {ret1_results.ci_delta_high * 100:.2f}])",
+            "Relative Δ (%)": f"{ret1_results.delta_rel_pct:.2f}%",
+            "Effect size": f"Cohen's h = {ret1_results.h:.2f}",
+            "Statistic": f"z = {ret1_results.z_stat:.2f}",
+            "p-value": f"{ret1_results.pval:.4f}",
             "Adjusted p-value": f"{guardrail_adj[1][0]:.6f}",
             "Significant?": "Yes" if guardrail_adj[1][0] < alpha else "No",
         }
@@ -45,13 +53,13 @@ def build_results_table(
     rows.append(
         {
             "Metric": "Mann-Whitney U test on game rounds",
-            "Control (gate_30)": f"{engagement_stats[2]:.2f} (median: {engagement_stats[3]:.2f})",
-            "Treatment (gate_40)": f"{engagement_stats[4]:.2f} (median: {engagement_stats[5]:.2f})",
-            "Absolute Δ (pp/unit)": f"{engagement_stats[6]:.2f}",
+            ctrl_col: f"{engagement_stats.mean_ctrl:.2f} (median: {engagement_stats.median_ctrl:.2f})",
+            treat_col: f"{engagement_stats.mean_treat:.2f} (median: {engagement_stats.median_treat:.2f})",
+            "Absolute Δ (pp/unit)": f"{engagement_stats.delta_mean:.2f}",
             "Relative Δ (%)": None,
             "Effect size": None,
-            "Statistic": f"U = {rounds_results[0]:.0f}",
-            "p-value": f"{rounds_results[1]:.4f}",
+            "Statistic": f"U = {rounds_results.u_stat:.0f}",
+            "p-value": f"{rounds_results.pval_rounds:.4f}",
             "Adjusted p-value": f"{guardrail_adj[1][1]:.6f}",
             "Significant?": "Yes" if guardrail_adj[1][1] < alpha else "No",
         }
@@ -60,13 +68,13 @@ def build_results_table(
     rows.append(
         {
             "Metric": "Welch's t-test on log-transformed game rounds",
-            "Control (gate_30)": f"{engagement_stats[7].mean():.6f}",
-            "Treatment (gate_40)": f"{engagement_stats[8].mean():.6f}",
+            ctrl_col: f"{engagement_stats.log_mean_ctrl:.6f}",
+            treat_col: f"{engagement_stats.log_mean_treat:.6f}",
             "Absolute Δ (pp/unit)": None,
             "Relative Δ (%)": None,
             "Effect size": None,
-            "Statistic": f"t = {rounds_results[2]:.2f}",
-            "p-value": f"{rounds_results[3]:.4f}",
+            "Statistic": f"t = {rounds_results.tstat_log:.2f}",
+            "p-value": f"{rounds_results.pval_log:.4f}",
             "Adjusted p-value": f"{guardrail_adj[1][2]:.6f}",
             "Significant?": "Yes" if guardrail_adj[1][2] < alpha else "No",
         }
@@ -75,12 +83,12 @@ def build_results_table(
     rows.append(
         {
             "Metric": "Bootstrap delta mean rounds",
-            "Control (gate_30)": f"{engagement_stats[0].mean():.2f}",
-            "Treatment (gate_40)": f"{engagement_stats[1].mean():.2f}",
-            "Absolute Δ (pp/unit)": f"{bootstrap_result[0]:.2f}",
+            ctrl_col: f"{engagement_stats.mean_ctrl:.2f}",
+            treat_col: f"{engagement_stats.mean_treat:.2f}",
+            "Absolute Δ (pp/unit)": f"{bootstrap_result.mean_diff:.2f}",
             "Relative Δ (%)": None,
             "Effect size": None,
-            "Statistic": f"95% CI for mean difference: [{bootstrap_result[1]:.2f}, {bootstrap_result[2]:.2f}]",
+            "Statistic": f"95% CI for mean difference: [{bootstrap_result.ci_low:.2f}, {bootstrap_result.ci_high:.2f}]",
             "p-value": None,
             "Adjusted p-value": None,
             "Significant?": None,
@@ -1,67 +1,212 @@
+import argparse
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 from PIL import Image
 
 
+def image_size(path):
+    """
+    Width and height of an image, read from its header without decoding pixels.
+    """
+    with Image.open(path) as img:
+        return img.size
+
+
+def _layout(paths, ncols):
+    # Rows of image paths, with None for empty cells
+    if ncols is None:
+        return [list(row) for row in paths]
+    paths = list(paths)
+    rows = [paths[i : i + ncols] for i in range(0, len(paths), ncols)]
+    if rows:
+        rows[-1] += [None] * (ncols - len(rows[-1]))
+    return rows
+
+
+# Grids composed at once by default; each holds one output strip in memory
+MAX_GRID_WORKERS = 4
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_BLOCK_ROWS = 64
+
+
+def _paste_scaled(strip, path, size, box):
+    """
+    Paste the image at `path`, downscaled to `size`, into `strip` at `box`.
+
+    JPEG decoders shrink by up to 8x while decoding (`draft`), and an integer
+    `reduce` drops most of the remaining pixels cheaply before the final
+    resampling, so a large source is never held at full resolution.
+    """
+    with Image.open(path) as img:
+        img.draft(None, size)
+        if img.mode not in ("L", "RGB", "RGBA"):
+            img = img.convert("RGB")
+        factor = min(img.width // size[0], img.height // size[1])
+        if factor > 1:
+            img = img.reduce(factor)
+        if img.size != size:
+            img = img.resize(size, Image.LANCZOS)
+        strip.paste(img, box)
+
+
+def _strips(rows, sizes, col_widths, row_heights, background):
+    # One grid row at a time, as an image spanning the full output width
+    for row, row_sizes, height in zip(rows, sizes, row_heights):
+        if not height:
+            continue
+        strip = Image.new("RGB", (sum(col_widths), height), color=background)
+        left = 0
+        for path, size, width in zip(row, row_sizes, col_widths):
+            if path is not None:
+                x = left + (width - size[0]) // 2
+                _paste_scaled(strip, path, size, (x, (height - size[1]) // 2))
+            left += width
+        yield strip
+        # Drop the reference before the next strip is allocated
+        del strip
+
+
+def _png_chunk(f, tag, data):
+    f.write(struct.pack(">I", len(data)) + tag + data)
+    f.write(struct.pack(">I", zlib.crc32(tag + data)))
+
+
+def _write_png(output_path, width, height, strips):
+    # PNG rows are compressed as one stream, so strips are encoded as they come
+    compressor = zlib.compressobj()
+    with open(output_path, "wb") as f:
+        f.write(PNG_SIGNATURE)
+        _png_chunk(f, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        stride = 3 * width
+        for strip in strips:
+            # A few scanlines at a time, so no copy of the whole strip is made
+            for top in range(0, strip.height, PNG_BLOCK_ROWS):
+                bottom = min(top + PNG_BLOCK_ROWS, strip.height)
+                raw = strip.crop((0, top, width, bottom)).tobytes()
+                # Filter type 0 (none) in front of every scanline
+                data = b"".join(
+                    b"\x00" + raw[i : i + stride] for i in range(0, len(raw), stride)
+                )
+                compressed = compressor.compress(data)
+                if compressed:
+                    _png_chunk(f, b"IDAT", compressed)
+            del strip
+        _png_chunk(f, b"IDAT", compressor.flush())
+        _png_chunk(f, b"IEND", b"")
+
+
+def compose_grid(
+    paths, output_path, ncols=None, scale: float = 1.0, background="white"
+):
+    """
+    Compose images into an N x M grid, centering each image in its cell.
+
+    Cell sizes come from the image headers, and PNG output is written one
+    grid row (strip) at a time, so peak memory is one full-width strip plus
+    one source image, downscaled while decoding where the format allows.
+    Other output formats are assembled on a full canvas before saving.
+    Raises ValueError when there is no image to compose.
+
+    Args:
+        paths (list): Rows of image paths, or a flat list when `ncols` is given.
+            None leaves a cell empty.
+        output_path (str): Output image path.
+        ncols (int | None): Columns for a flat list of paths.
+        scale (float): Factor applied to every image, e.g. 0.25 to downscale.
+        background (str): Canvas color.
+
+    Returns:
+        str: The output path.
+    """
+    rows = _layout(paths, ncols)
+    if not any(path is not None for row in rows for path in row):
+        raise ValueError("No images to compose")
+    n_cols = max(len(row) for row in rows)
+
+    # Scaled image sizes from headers only
+    sizes = [
+        [
+            (
+                None
+                if path is None
+                else tuple(max(round(d * scale), 1) for d in image_size(path))
+            )
+            for path in row
+        ]
+        for row in rows
+    ]
+
+    # Determine cell dimensions by finding maximum width/height per column/row
+    col_widths = [
+        max((row[j][0] for row in sizes if j < len(row) and row[j]), default=0)
+        for j in range(n_cols)
+    ]
+    row_heights = [max((size[1] for size in row if size), default=0) for row in sizes]
+    width, height = sum(col_widths), sum(row_heights)
+    strips = _strips(rows, sizes, col_widths, row_heights, background)
+
+    if Path(output_path).suffix.lower() == ".png":
+        _write_png(output_path, width, height, strips)
+        return output_path
+
+    # Pillow encodes other formats from a complete image
+    canvas = Image.new("RGB", (width, height), color=background)
+    top = 0
+    for strip in strips:
+        canvas.paste(strip, (0, top))
+        top += strip.height
+    canvas.save(output_path)
+    return output_path
+
+
+def compose_grids(jobs, max_workers=None):
+    """
+    Compose many grids concurrently in a thread pool.
+
+    Decoding, resizing and encoding in Pillow release the GIL, so threads
+    overlap without copying images between processes. Every running grid
+    holds one strip and one source image, so the thread count also bounds
+    memory.
+
+    Args:
+        jobs (list[dict]): Keyword arguments of `compose_grid`, one per grid.
+        max_workers (int | None): Grids composed at once, at most
+            `MAX_GRID_WORKERS` (and the core count) if omitted.
+
+    Returns:
+        list[str]: Output paths in job order.
+    """
+    max_workers = max_workers or min(os.cpu_count() or 1, MAX_GRID_WORKERS)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda job: compose_grid(**job), jobs))
+
+
 def generate_grid(img_path1, img_path2, img_path3, img_path4, output_path):
     """
     Generate a 2x2 grid of images with varying sizes, centering each image in its cell.
     """
-    # Open images
-    img1 = Image.open(img_path1)
-    img2 = Image.open(img_path2)
-    img3 = Image.open(img_path3)
-    img4 = Image.open(img_path4)
-
-    # Get individual image sizes
-    w1, h1 = img1.size
-    w2, h2 = img2.size
-    w3, h3 = img3.size
-    w4, h4 = img4.size
+    return compose_grid(
+        [[img_path1, img_path2], [img_path3, img_path4]], output_path=output_path
+    )
 
-    # Determine cell dimensions by finding maximum width/height per column/row
-    col1_width = max(w1, w3)  # left column max width
-    col2_width = max(w2, w4)  # right column max width
-    row1_height = max(h1, h2)  # top row max height
-    row2_height = max(h3, h4)  # bottom row max height
-
-    # Overall canvas size
-    canvas_width = col1_width + col2_width
-    canvas_height = row1_height + row2_height
-
-    # Create a new blank image with white background
-    combined_image = Image.new("RGB", (canvas_width, canvas_height), color="white")
-
-    # Calculate top-left positions for each image to center them in their respective cells
-    # Top-left cell (for img1)
-    pos1_x = (col1_width - w1) // 2
-    pos1_y = (row1_height - h1) // 2
-
-    # Top-right cell (for img2)
-    pos2_x = col1_width + (col2_width - w2) // 2
-    pos2_y = (row1_height - h2) // 2
-
-    # Bottom-left cell (for img3)
-    pos3_x = (col1_width - w3) // 2
-    pos3_y = row1_height + (row2_height - h3) // 2
-
-    # Bottom-right cell (for img4)
-    pos4_x = col1_width + (col2_width - w4) // 2
-    pos4_y = row1_height + (row2_height - h4) // 2
-
-    # Paste images onto the canvas at calculated positions
-    combined_image.paste(img1, (pos1_x, pos1_y))
-    combined_image.paste(img2, (pos2_x, pos2_y))
-    combined_image.paste(img3, (pos3_x, pos3_y))
-    combined_image.paste(img4, (pos4_x, pos4_y))
-
-    # Save the combined image
-    combined_image.save(output_path)
-    # combined_image.show()
-
-
-generate_grid(
-    img_path1="reports/figures/3.3_dist_of_game_rounds_by_version_log.png",
-    img_path2="reports/figures/4.3_retention_rates_by_version_95_ci.png",
-    img_path3="reports/figures/4.4_player_count_game_rounds_dist_log.png",
-    img_path4="reports/figures/5_power_vs_mde_at_current_n.png",
-    output_path="reports/figures/plots_grid.png",
-)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compose images into a grid")
+    parser.add_argument("images", nargs="*", help="Image paths, row by row")
+    parser.add_argument("--output", default="reports/figures/plots_grid.png")
+    parser.add_argument("--ncols", type=int, default=2)
+    parser.add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    images = args.images or [
+        "reports/figures/3.3_dist_of_game_rounds_by_version_log.png",
+        "reports/figures/4.3_retention_rates_by_version_95_ci.png",
+        "reports/figures/4.4_player_count_game_rounds_dist_log.png",
+        "reports/figures/5_power_vs_mde_at_current_n.png",
+    ]
+    compose_grid(images, args.output, ncols=args.ncols, scale=args.scale)
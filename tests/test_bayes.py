@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+from scipy import integrate
+from scipy.special import betaln
+from scipy.stats import beta
+from synthetic import generate_cookiecats
+
+from cookiecats.bayes import MAX_MASS_ERROR, bayesian_table, beta_binomial_compare
+from cookiecats.summary import summarize
+
+# (successes, players) of arm and reference, from tiny to Cookie Cats sized
+CASES = [
+    (3, 10, 5, 12),
+    (0, 5, 1, 5),
+    (40, 200, 30, 210),
+    (8_501, 44_700, 8_279, 45_489),
+]
+
+
+def exact_prob_greater(a_arm, b_arm, a_ref, b_ref):
+    # Closed form of P(arm > reference) for an integer a_arm
+    i = np.arange(a_arm)
+    return np.exp(
+        betaln(a_ref + i, b_ref + b_arm)
+        - np.log(b_arm + i)
+        - betaln(1 + i, b_arm)
+        - betaln(a_ref, b_ref)
+    ).sum()
+
+
+def quad_loss(a_arm, b_arm, a_ref, b_ref):
+    # E[max(reference - arm, 0)], integrating the reference tail for each x
+    ref = beta(a_ref, b_ref)
+    mean_ref = ref.mean()
+
+    def integrand(x):
+        tail = mean_ref * beta(a_ref + 1, b_ref).sf(x) - x * ref.sf(x)
+        return beta(a_arm, b_arm).pdf(x) * tail
+
+    return integrate.quad(integrand, 0, 1, limit=200, epsabs=1e-12)[0]
+
+
+@pytest.fixture(scope="module")
+def compared():
+    counts = [np.array(column) for column in zip(*CASES)]
+    return {
+        method: beta_binomial_compare(*counts, method=method, n_draws=1_000_000)
+        for method in ("integrate", "sample")
+    }
+
+
+@pytest.mark.parametrize("case", range(len(CASES)))
+def test_integrated_probability_is_exact(compared, case):
+    s_arm, n_arm, s_ref, n_ref = CASES[case]
+    expected = exact_prob_greater(
+        1 + s_arm, 1 + n_arm - s_arm, 1 + s_ref, 1 + n_ref - s_ref
+    )
+    # Accurate to the posterior mass error the grid accepts
+    assert compared["integrate"]["prob_greater"][case] == pytest.approx(
+        expected, abs=MAX_MASS_ERROR
+    )
+
+
+@pytest.mark.parametrize("case", range(3))
+def test_integrated_loss_matches_quadrature(compared, case):
+    s_arm, n_arm, s_ref, n_ref = CASES[case]
+    expected = quad_loss(1 + s_arm, 1 + n_arm - s_arm, 1 + s_ref, 1 + n_ref - s_ref)
+    assert compared["integrate"]["loss_arm"][case] == pytest.approx(expected, rel=1e-6)
+
+
+@pytest.mark.parametrize(
+    "key, tol",
+    [
+        ("prob_less", 2e-3),
+        ("loss_arm", 2e-4),
+        ("loss_ref", 2e-4),
+        ("ci_low", 3e-3),
+        ("ci_high", 3e-3),
+    ],
+)
+def test_integrated_matches_sampled(compared, key, tol):
+    np.testing.assert_allclose(
+        compared["integrate"][key], compared["sample"][key], atol=tol
+    )
+
+
+def test_auto_samples_unresolved_comparisons():
+    # A near point mass next to a wide posterior is too narrow for the grid
+    result = beta_binomial_compare([2, 3], [10**6, 20], [3, 5], [20, 12])
+    assert result["sampled"].tolist() == [True, False]
+    assert result["prob_less"][0] == 1.0
+    assert result["loss_ref"][0] == 0.0
+
+
+def test_identical_arms_are_symmetric():
+    result = beta_binomial_compare(50, 400, 50, 400, method="integrate")
+    assert result["prob_less"][0] == pytest.approx(0.5, abs=1e-9)
+    assert result["loss_arm"][0] == pytest.approx(result["loss_ref"][0])
+    assert result["ci_low"][0] == pytest.approx(-result["ci_high"][0], abs=1e-3)
+
+
+def test_table_uses_grouped_counts():
+    summary = summarize(generate_cookiecats(5_000, seed=9))
+    table = bayesian_table(summary, metrics=["retention_7"])
+
+    expected = beta_binomial_compare(
+        summary.success("retention_7", "gate_40"),
+        summary.count("gate_40"),
+        summary.success("retention_7", "gate_30"),
+        summary.count("gate_30"),
+    )
+    row = table.iloc[0]
+    assert (row["Reference"], row["Arm"], row["Method"]) == (
+        "gate_30",
+        "gate_40",
+        "integrate",
+    )
+    assert row["P(arm < reference)"] == pytest.approx(expected["prob_less"][0])
+    assert row["Credible low"] == pytest.approx(expected["ci_low"][0])
+
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError, match="method"):
+        beta_binomial_compare(1, 2, 1, 2, method="exact")
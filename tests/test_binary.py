@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from synthetic import generate_cookiecats
+from test_stream import assert_same_summary
+
+from cookiecats.binary import (
+    ALIGNMENT,
+    open_cookiecats_binary,
+    summarize_binary,
+    write_cookiecats_binary,
+)
+from cookiecats.summary import summarize
+
+
+@pytest.fixture
+def players():
+    # Not a multiple of 8, so the last packed byte is partly used
+    return generate_cookiecats(1_003, seed=12)
+
+
+@pytest.fixture
+def binary(tmp_path, players):
+    return write_cookiecats_binary(players, tmp_path / "players.bin")
+
+
+def test_round_trip(binary, players):
+    data = open_cookiecats_binary(binary)
+    assert data.rows == len(players)
+    assert data.groups == ("gate_30", "gate_40")
+    pd.testing.assert_frame_equal(data.to_frame(), players)
+    pd.testing.assert_frame_equal(
+        data.to_frame(["retention_7", "version"]), players[["retention_7", "version"]]
+    )
+
+
+def test_file_layout(binary):
+    assert binary.stat().st_size % ALIGNMENT == 0
+    assert not list(binary.parent.glob("*.tmp"))
+
+
+@pytest.mark.parametrize("start, stop", [(0, 8), (3, 17), (996, 1_003), (5, 5000)])
+def test_flags_slices(binary, players, start, stop):
+    flags = open_cookiecats_binary(binary).flags("retention_1", start, stop)
+    np.testing.assert_array_equal(flags, players["retention_1"].to_numpy()[start:stop])
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 13, 64, 10**6])
+def test_summary_matches_single_pass(binary, players, chunk_rows):
+    assert_same_summary(summarize_binary(binary, chunk_rows), summarize(players))
+
+
+def test_empty_file_raises(tmp_path):
+    path = write_cookiecats_binary(generate_cookiecats(0), tmp_path / "empty.bin")
+    assert open_cookiecats_binary(path).to_frame().empty
+    with pytest.raises(ValueError, match="has no rows"):
+        summarize_binary(path)
+
+
+def test_foreign_file_raises(tmp_path):
+    path = tmp_path / "players.csv"
+    generate_cookiecats(10).to_csv(path, index=False)
+    with pytest.raises(ValueError, match="not a Cookie Cats binary file"):
+        open_cookiecats_binary(path)
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from scipy.special import ndtr, ndtri
+
+from cookiecats.bootstrap import bootstrap_ci
+from cookiecats.stats import bootstrap_mean_diff
+
+CTRL = np.array([0, 1, 1, 2, 3, 3, 3, 5, 8, 13, 21, 40], dtype=float)
+TREAT = np.array([0, 0, 1, 2, 2, 4, 5, 5, 9, 15, 30, 55, 70], dtype=float)
+
+
+def naive_bootstrap(ctrl, treat, n_boot, rng, method="percentile", alpha=0.05):
+    # Textbook index resampling of treatment - control mean, drawn in one block
+    idx_ctrl = rng.integers(0, len(ctrl), size=(n_boot, len(ctrl)))
+    idx_treat = rng.integers(0, len(treat), size=(n_boot, len(treat)))
+    boot = treat[idx_treat].mean(axis=1) - ctrl[idx_ctrl].mean(axis=1)
+    theta_hat = treat.mean() - ctrl.mean()
+
+    quantiles = [alpha / 2, 1 - alpha / 2]
+    if method == "bca":
+        # Leave-one-out over every observation of each group
+        num, den = 0.0, 0.0
+        for i, x in enumerate((ctrl, treat)):
+            loo = np.array([np.delete(x, j).mean() for j in range(len(x))])
+            theta = loo - ctrl.mean() if i else treat.mean() - loo
+            u = theta.mean() - theta
+            num += np.sum(u**3) / len(x) ** 3
+            den += np.sum(u**2) / len(x) ** 2
+        a = num / (6 * den**1.5)
+        z0 = ndtri(np.mean(boot < theta_hat) + 0.5 * np.mean(boot == theta_hat))
+        z = ndtri(np.array(quantiles))
+        quantiles = ndtr(z0 + (z0 + z) / (1 - a * (z0 + z)))
+
+    return (theta_hat, *np.quantile(boot, quantiles))
+
+
+@pytest.mark.parametrize("method", ["percentile", "bca"])
+def test_index_engine_matches_naive_reference(method):
+    # The callable path draws indices exactly like the reference
+    result = bootstrap_ci(
+        CTRL, TREAT, statistic=np.mean, n_boot=2000, method=method, rng=7
+    )
+    expected = naive_bootstrap(
+        CTRL, TREAT, 2000, np.random.default_rng(7), method=method
+    )
+    np.testing.assert_allclose(result, expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("method", ["percentile", "bca"])
+def test_multinomial_engine_matches_naive_reference(method):
+    # Different random streams, so agreement is up to Monte Carlo error
+    n_boot = 40_000
+    result = bootstrap_ci(
+        CTRL, TREAT, statistic="mean", n_boot=n_boot, method=method, rng=1
+    )
+    expected = naive_bootstrap(
+        CTRL, TREAT, n_boot, np.random.default_rng(2), method=method
+    )
+    assert result[0] == pytest.approx(expected[0])
+    width = expected[2] - expected[1]
+    np.testing.assert_allclose(result[1:], expected[1:], atol=0.03 * width)
+
+
+def test_bootstrap_mean_diff_orientation():
+    # Interval is for treatment - control, the same way round as mean_diff
+    result = bootstrap_mean_diff(CTRL, TREAT, n_boot=5000, seed=42)
+    assert result.mean_diff == pytest.approx(TREAT.mean() - CTRL.mean())
+    assert result.ci_low < result.mean_diff < result.ci_high
+    assert result.mean_ctrl == pytest.approx(CTRL.mean())
+    assert result.mean_treat == pytest.approx(TREAT.mean())
+
+
+def test_histogram_input_matches_raw():
+    # A (values, counts) histogram resamples exactly like the raw sample
+    hist = tuple(np.unique(TREAT, return_counts=True))
+    raw = bootstrap_ci(CTRL, TREAT, n_boot=1000, rng=3)
+    binned = bootstrap_ci(CTRL, hist, n_boot=1000, rng=3)
+    assert raw == binned
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.formula.api as smf
+
+from cookiecats.cuped import (
+    adjusted_table,
+    adjusted_test,
+    summarize_covariates,
+    summarize_covariates_stream,
+)
+
+RHO = 0.6
+
+
+@pytest.fixture(scope="module")
+def players():
+    # Pre-period rounds explain a share RHO^2 of this week's rounds
+    rng = np.random.default_rng(11)
+    n = 40_000
+    treat = rng.random(n) < 0.5
+    pre = rng.normal(50, 10, n)
+    noise = rng.normal(0, 10 * np.sqrt(1 - RHO**2), n)
+    rounds = np.round(20 + RHO * (pre - 50) + noise + 0.5 * treat).astype(np.int32)
+    return pd.DataFrame(
+        {
+            "version": np.where(treat, "gate_40", "gate_30"),
+            "sum_gamerounds": rounds,
+            "retention_7": rng.random(n) < 0.18 + 0.002 * (pre - 50),
+            "pre_rounds": pre,
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def summary(players):
+    return summarize_covariates(players, ["pre_rounds"])
+
+
+def test_cuped_matches_direct_computation(players, summary):
+    result = adjusted_test(summary, "sum_gamerounds")
+
+    y, x = players["sum_gamerounds"], players["pre_rounds"]
+    theta = np.cov(y, x)[0, 1] / x.var()
+    adjusted = (y - theta * (x - x.mean())).groupby(players["version"])
+    means, var = adjusted.mean(), adjusted.var() / adjusted.size()
+
+    assert result.delta == pytest.approx(means["gate_40"] - means["gate_30"])
+    assert result.se == pytest.approx(np.sqrt(var.sum()))
+    assert result.delta_unadjusted == pytest.approx(
+        y[players["version"] == "gate_40"].mean()
+        - y[players["version"] == "gate_30"].mean()
+    )
+
+
+def test_regression_matches_interacted_ols(players, summary):
+    result = adjusted_test(summary, "sum_gamerounds", method="regression")
+
+    data = players.assign(
+        treat=(players["version"] == "gate_40").astype(float),
+        pre=players["pre_rounds"] - players["pre_rounds"].mean(),
+    )
+    fit = smf.ols("sum_gamerounds ~ treat * pre", data).fit(cov_type="HC2")
+    assert result.delta == pytest.approx(fit.params["treat"])
+    assert result.se == pytest.approx(fit.bse["treat"], rel=1e-3)
+
+
+def test_variance_reduction_is_rho_squared(summary):
+    result = adjusted_test(summary, "sum_gamerounds")
+    assert result.variance_reduction == pytest.approx(RHO**2, abs=0.02)
+    assert result.ci_low < 0.5 < result.ci_high
+
+
+def test_table_has_one_row_per_metric(summary):
+    table = adjusted_table(summary, method="regression")
+    assert table["metric"].tolist() == ["retention_7", "sum_gamerounds"]
+    assert (table["variance_reduction"] > 0).all()
+
+
+def test_merged_and_streamed_summaries_match(tmp_path, players, summary):
+    half = len(players) // 2
+    merged = summarize_covariates(players.iloc[:half], ["pre_rounds"]).merge(
+        summarize_covariates(players.iloc[half:], ["pre_rounds"])
+    )
+    path = tmp_path / "players.csv"
+    players.to_csv(path, index=False)
+    streamed = summarize_covariates_stream(
+        ["pre_rounds"],
+        path,
+        metrics=summary.metrics,
+        chunksize=7_000,
+    )
+
+    for other in (merged, streamed):
+        assert other.groups == summary.groups
+        np.testing.assert_array_equal(other.n, summary.n)
+        np.testing.assert_allclose(other.sums, summary.sums)
+        np.testing.assert_allclose(other.cross, summary.cross)
+
+
+def test_invalid_input_raises(players, summary):
+    with pytest.raises(ValueError, match="method"):
+        adjusted_test(summary, "sum_gamerounds", method="ancova")
+    with pytest.raises(ValueError, match="missing"):
+        summarize_covariates(players.assign(pre_rounds=np.nan), ["pre_rounds"])
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.generate_grid import compose_grid, compose_grids
+
+
+@pytest.fixture
+def images(tmp_path):
+    # Sizes and modes differ, so cells are padded and pastes convert
+    rng = np.random.default_rng(0)
+    paths = []
+    for i, (size, mode, suffix) in enumerate(
+        [((40, 30), "RGB", ".png"), ((25, 50), "L", ".png"), ((60, 20), "P", ".gif")]
+    ):
+        pixels = rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+        path = tmp_path / f"img{i}{suffix}"
+        Image.fromarray(pixels).convert(mode).save(path)
+        paths.append(path)
+    return paths
+
+
+def test_png_strips_match_the_canvas(tmp_path, images):
+    # PNG is written strip by strip, BMP through Pillow from a full canvas
+    streamed = compose_grid(images, tmp_path / "grid.png", ncols=2, background="red")
+    canvas = compose_grid(images, tmp_path / "grid.bmp", ncols=2, background="red")
+
+    with Image.open(streamed) as a, Image.open(canvas) as b:
+        assert a.size == (60 + 25, 50 + 20)
+        np.testing.assert_array_equal(np.asarray(a), np.asarray(b))
+        # The empty last cell keeps the background
+        assert a.getpixel((84, 69)) == (255, 0, 0)
+
+
+def test_cells_are_centered(tmp_path, images):
+    output = compose_grid([[images[0]], [images[1]]], tmp_path / "grid.png")
+    with Image.open(output) as grid, Image.open(images[1]) as img:
+        cell = grid.crop((7, 30, 7 + 25, 80)).convert("L")
+        np.testing.assert_array_equal(np.asarray(cell), np.asarray(img))
+
+
+def test_downscaled_grid(tmp_path, images):
+    output = compose_grid(images, tmp_path / "grid.png", ncols=3, scale=0.5)
+    with Image.open(output) as grid:
+        assert grid.size == (20 + 12 + 30, 25)
+
+
+def test_compose_grids(tmp_path, images):
+    jobs = [
+        dict(paths=images, output_path=tmp_path / f"grid{i}.png", ncols=2)
+        for i in range(3)
+    ]
+    assert compose_grids(jobs, max_workers=2) == [job["output_path"] for job in jobs]
+
+
+def test_empty_grid_raises(tmp_path):
+    with pytest.raises(ValueError, match="No images"):
+        compose_grid([[None, None]], tmp_path / "grid.png")
@@ -0,0 +1,71 @@
+import os
+import shutil
+
+import pytest
+from synthetic import generate_cookiecats
+
+from cookiecats.incremental import ingest_partition, load_state
+
+
+@pytest.fixture
+def partition(tmp_path):
+    path = tmp_path / "day1.csv"
+    generate_cookiecats(2_000, seed=1).to_csv(path, index=False)
+    return path
+
+
+def test_touched_partition_is_not_reingested(tmp_path, partition):
+    state_path = tmp_path / "state.npz"
+    assert ingest_partition(state_path, partition)
+    n = load_state(state_path).summary.n.sum()
+
+    stat = partition.stat()
+    os.utime(partition, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert not ingest_partition(state_path, partition)
+    assert load_state(state_path).summary.n.sum() == n
+
+
+@pytest.mark.parametrize("name", ["day1.csv", "day1_copy.csv"])
+def test_copied_partition_is_not_reingested(tmp_path, partition, name):
+    state_path = tmp_path / "state.npz"
+    assert ingest_partition(state_path, partition)
+
+    copy_dir = tmp_path / "checkout"
+    copy_dir.mkdir()
+    copy = shutil.copy(partition, copy_dir / name)
+
+    assert not ingest_partition(state_path, copy)
+    assert list(load_state(state_path).partitions) == ["day1.csv"]
+
+
+def test_changed_partition_raises(tmp_path, partition):
+    state_path = tmp_path / "state.npz"
+    assert ingest_partition(state_path, partition)
+
+    generate_cookiecats(2_000, seed=2).to_csv(partition, index=False)
+
+    with pytest.raises(ValueError, match="different content"):
+        ingest_partition(state_path, partition)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_empty_partition_is_recorded(tmp_path, partition, suffix):
+    state_path = tmp_path / "state.npz"
+    empty = tmp_path / f"day0{suffix}"
+    header_only = generate_cookiecats(0)
+    if suffix == ".csv":
+        header_only.to_csv(empty, index=False)
+    else:
+        header_only.to_parquet(empty, index=False)
+
+    # Before any data, and again after a partition with rows
+    assert ingest_partition(state_path, empty)
+    assert load_state(state_path).summary is None
+    assert ingest_partition(state_path, partition)
+    summary = load_state(state_path).summary
+
+    assert not ingest_partition(state_path, empty)
+    state = load_state(state_path)
+    assert list(state.partitions) == ["day0" + suffix, "day1.csv"]
+    assert state.summary.n.tolist() == summary.n.tolist()
@@ -0,0 +1,32 @@
+import pytest
+from synthetic import generate_cookiecats
+
+from cookiecats import io
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "cookie_cats.csv"
+    generate_cookiecats(1_000, seed=3).to_csv(path, index=False)
+    return path
+
+
+def test_unwritable_cache_falls_back_to_csv(csv_path, monkeypatch):
+    def read_only(*args):
+        raise PermissionError("Read-only file system")
+
+    monkeypatch.setattr(io, "_write_cache", read_only)
+    with pytest.warns(UserWarning, match="Columnar cache not written"):
+        df = io.load_cookiecats(csv_path)
+
+    assert len(df) == 1_000
+    assert not df.attrs["cache_hit"]
+
+
+def test_cache_is_reused_and_leaves_no_temp_files(csv_path):
+    first = io.load_cookiecats(csv_path)
+    second = io.load_cookiecats(csv_path)
+
+    assert second.attrs["cache_hit"]
+    assert second.equals(first)
+    assert not list((csv_path.parent / ".cache").glob("*.tmp"))
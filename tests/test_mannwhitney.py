@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from scipy.stats import mannwhitneyu
+from synthetic import generate_cookiecats
+
+from cookiecats import stats
+from cookiecats.summary import summarize
+
+
+def scipy_reference(ctrl, treat, alternative="two-sided"):
+    result = mannwhitneyu(ctrl, treat, alternative=alternative, method="asymptotic")
+    return result.statistic, result.pvalue
+
+
+def histogram(x):
+    return tuple(np.unique(x, return_counts=True))
+
+
+def test_game_rounds_matches_scipy_on_cookiecats():
+    df = generate_cookiecats(50_000, seed=0)
+    rounds = df.groupby("version", observed=True)["sum_gamerounds"]
+    ctrl, treat = (rounds.get_group(g).to_numpy() for g in ("gate_30", "gate_40"))
+
+    result = stats.test_game_rounds(summarize(df))
+
+    u_stat, pval = scipy_reference(ctrl, treat)
+    assert result.u_stat == u_stat
+    assert result.pval_rounds == pytest.approx(pval, rel=1e-9)
+
+
+@pytest.mark.parametrize("alternative", ["two-sided", "less", "greater"])
+def test_heavy_ties(alternative):
+    rng = np.random.default_rng(1)
+    ctrl = rng.integers(0, 4, size=400)
+    treat = rng.choice(4, size=450, p=[0.2, 0.3, 0.3, 0.2])
+
+    u_stat, pval = stats.mannwhitneyu_from_hist(
+        histogram(ctrl), histogram(treat), alternative=alternative
+    )
+
+    expected = scipy_reference(ctrl, treat, alternative)
+    assert u_stat == expected[0]
+    assert pval == pytest.approx(expected[1], rel=1e-9)
+
+
+@pytest.mark.parametrize("alternative", ["two-sided", "less", "greater"])
+def test_unequal_sizes_and_grids(alternative):
+    # The histograms sit on different value grids
+    rng = np.random.default_rng(2)
+    ctrl = np.floor(rng.lognormal(2.0, 1.0, size=30))
+    treat = np.floor(rng.lognormal(2.3, 1.2, size=2_000))
+
+    u_stat, pval = stats.mannwhitneyu_from_hist(
+        histogram(ctrl), histogram(treat), alternative=alternative
+    )
+
+    expected = scipy_reference(ctrl, treat, alternative)
+    assert u_stat == expected[0]
+    assert pval == pytest.approx(expected[1], rel=1e-9)
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import mannwhitneyu, ttest_ind
+from statsmodels.stats.multitest import multipletests
+from statsmodels.stats.proportion import proportions_ztest
+from synthetic import generate_cookiecats
+
+from cookiecats.multiarm import (
+    arm_pairs,
+    compare_arms,
+    engagement_comparisons,
+    proportion_comparisons,
+)
+
+GROUPS = ("gate_30", "gate_40", "gate_50")
+
+
+@pytest.fixture(scope="module")
+def three_arms():
+    # Two synthetic experiments, the second one relabeled as gate_50
+    first = generate_cookiecats(3_000, seed=7)
+    second = generate_cookiecats(1_500, seed=8, treatment_share=1.0)
+    second["version"] = "gate_50"
+    df = pd.concat([first, second], ignore_index=True)
+    df["version"] = pd.Categorical(df["version"].astype(str), categories=GROUPS)
+    return df
+
+
+def test_arm_pairs():
+    ref, other = arm_pairs(GROUPS)
+    assert ref.tolist() == [0, 0] and other.tolist() == [1, 2]
+
+    ref, other = arm_pairs(GROUPS, control="gate_40", pairs="all")
+    assert list(zip(ref, other)) == [(1, 0), (1, 2), (0, 2)]
+
+
+@pytest.mark.parametrize("pairs", ["control", "all"])
+def test_arm_pairs_needs_two_arms(pairs):
+    with pytest.raises(ValueError, match=r"\['gate_40'\]"):
+        arm_pairs(GROUPS, pairs=pairs, arms=["gate_40"])
+
+
+def test_proportions_match_statsmodels(three_arms):
+    table = proportion_comparisons(three_arms, "retention_7", pairs="all")
+    for row in table.to_dict("records"):
+        sample = three_arms[three_arms["version"].isin([row["Arm"], row["Reference"]])]
+        grouped = sample.groupby("version", observed=True)["retention_7"]
+        counts, nobs = grouped.sum(), grouped.size()
+        z_stat, pval = proportions_ztest(
+            counts[[row["Arm"], row["Reference"]]], nobs[[row["Arm"], row["Reference"]]]
+        )
+        assert row["Statistic"] == pytest.approx(z_stat)
+        assert row["p-value"] == pytest.approx(pval)
+
+
+def test_engagement_matches_scipy(three_arms):
+    table = engagement_comparisons(three_arms)
+    rounds = three_arms.groupby("version", observed=True)["sum_gamerounds"]
+    for row in table.to_dict("records"):
+        ref, arm = rounds.get_group(row["Reference"]), rounds.get_group(row["Arm"])
+        if row["Test"] == "Mann-Whitney U":
+            expected = mannwhitneyu(ref, arm, method="asymptotic")
+        else:
+            expected = ttest_ind(np.log1p(arm), np.log1p(ref), equal_var=False)
+        assert row["Statistic"] == pytest.approx(expected.statistic)
+        assert row["p-value"] == pytest.approx(expected.pvalue)
+
+
+@pytest.mark.parametrize("correction", ["holm", "bonferroni", "bh"])
+def test_corrections_match_statsmodels(three_arms, correction):
+    table = compare_arms(three_arms, pairs="all", correction=correction)
+    method = "fdr_bh" if correction == "bh" else correction
+    reject, adjusted, *_ = multipletests(table["p-value"], 0.05, method=method)
+    np.testing.assert_allclose(table["Adjusted p-value"], adjusted)
+    assert (table["Significant?"] == "Yes").tolist() == reject.tolist()
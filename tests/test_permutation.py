@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+from scipy import stats
+from synthetic import generate_cookiecats
+
+from cookiecats.permutation import permutation_test, permutation_tests
+from cookiecats.summary import summarize
+
+# Small enough for scipy to enumerate all 1716 labellings
+CTRL = np.array([0, 3, 3, 7, 12, 40])
+TREAT = np.array([1, 5, 9, 9, 20, 31, 60])
+
+STATISTICS = {
+    "mean": np.mean,
+    "median": np.median,
+    "trimmed_mean": lambda x, axis: stats.trim_mean(x, 0.2, axis=axis),
+}
+
+
+@pytest.mark.parametrize("statistic", STATISTICS)
+@pytest.mark.parametrize("alternative", ["two-sided", "greater", "less"])
+def test_matches_exact_enumeration(statistic, alternative):
+    func = STATISTICS[statistic]
+    exact = stats.permutation_test(
+        (CTRL, TREAT),
+        lambda ctrl, treat, axis: func(treat, axis=axis) - func(ctrl, axis=axis),
+        permutation_type="independent",
+        n_resamples=np.inf,
+        alternative=alternative,
+    )
+    result = permutation_test(
+        CTRL, TREAT, statistic, n_perm=20_000, alternative=alternative, trim=0.2
+    )
+    assert result.observed == pytest.approx(exact.statistic)
+    assert result.pval == pytest.approx(exact.pvalue, abs=4 * result.mc_se)
+
+
+def test_histograms_match_raw_samples():
+    histograms = [np.unique(x, return_counts=True) for x in (CTRL, TREAT)]
+    assert permutation_test(*histograms, n_perm=2_000) == permutation_test(
+        CTRL, TREAT, n_perm=2_000
+    )
+
+
+def test_result_does_not_depend_on_workers():
+    serial = permutation_test(CTRL, TREAT, n_perm=3_500, max_workers=1)
+    parallel = permutation_test(CTRL, TREAT, n_perm=3_500, max_workers=2)
+    assert parallel == serial
+
+
+def test_stops_at_target_precision():
+    result = permutation_test(CTRL, TREAT, n_perm=100_000, precision=0.02)
+    assert result.stopped_early
+    assert result.n_perm < 100_000
+    assert 2.576 * result.mc_se <= 0.02
+
+
+@pytest.fixture(scope="module")
+def retention():
+    df = generate_cookiecats(4_000, seed=15)
+    groups = df.groupby("version", observed=True)["retention_7"]
+    return groups.get_group("gate_30"), groups.get_group("gate_40"), summarize(df)
+
+
+def fisher_pvalue(ctrl, treat, alternative):
+    # With fixed margins, relabelling players is Fisher's hypergeometric null
+    table = [
+        [treat.sum(), len(treat) - treat.sum()],
+        [ctrl.sum(), len(ctrl) - ctrl.sum()],
+    ]
+    if alternative != "two-sided":
+        return stats.fisher_exact(table, alternative)[1]
+    greater = stats.fisher_exact(table, "greater")[1]
+    less = stats.fisher_exact(table, "less")[1]
+    return min(1.0, 2 * min(greater, less))
+
+
+@pytest.mark.parametrize("alternative", ["two-sided", "greater", "less"])
+def test_rates_match_fisher_exact(retention, alternative):
+    ctrl, treat, _ = retention
+    result = permutation_test(
+        ctrl.to_numpy(dtype=float),
+        treat.to_numpy(dtype=float),
+        n_perm=20_000,
+        alternative=alternative,
+    )
+    expected = fisher_pvalue(ctrl, treat, alternative)
+    assert result.pval == pytest.approx(expected, abs=4 * result.mc_se)
+
+
+def test_table_from_summary(retention):
+    ctrl, treat, summary = retention
+    table = permutation_tests(
+        summary, metrics=["retention_7"], n_perm=20_000, max_workers=1
+    ).set_index("Metric")
+
+    assert list(table.index) == ["retention_7", "sum_gamerounds"]
+    row = table.loc["retention_7"]
+    assert row["Observed Δ"] == pytest.approx(treat.mean() - ctrl.mean())
+    expected = fisher_pvalue(ctrl, treat, "two-sided")
+    assert row["p-value"] == pytest.approx(expected, abs=4 * row["Monte Carlo SE"])
+
+
+def test_invalid_arguments_raise():
+    with pytest.raises(ValueError, match="alternative"):
+        permutation_test(CTRL, TREAT, alternative="both")
+    with pytest.raises(ValueError, match="n_perm"):
+        permutation_test(CTRL, TREAT, n_perm=0)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from statsmodels.stats.power import NormalIndPower
+
+from cookiecats.planning import planning_table, required_n
+from cookiecats.power import cohens_h, mde_h, power_from_pp
+
+CASES = [
+    # p0, mde_pp, alpha, power, ratio
+    (0.19, 1.0, 0.05, 0.80, 1.0),
+    (0.45, -0.5, 0.01, 0.90, 2.0),
+    (0.02, 0.3, 0.10, 0.80, 0.5),
+]
+
+
+@pytest.mark.parametrize("alternative", ["two-sided", "larger"])
+@pytest.mark.parametrize("p0, mde_pp, alpha, power, ratio", CASES)
+def test_required_n_matches_statsmodels(p0, mde_pp, alpha, power, ratio, alternative):
+    h = abs(cohens_h(p0 + mde_pp / 100, p0))
+    expected = NormalIndPower().solve_power(
+        h, alpha=alpha, power=power, ratio=ratio, alternative=alternative
+    )
+    result = required_n(p0, mde_pp, alpha, power, ratio, alternative=alternative)
+    assert result == pytest.approx(expected, rel=1e-8)
+
+
+def test_required_n_splits_alpha_across_arms():
+    h = abs(cohens_h(0.20, 0.19))
+    expected = NormalIndPower().solve_power(h, alpha=0.05 / 3, power=0.8)
+    assert required_n(0.19, 1.0, n_arms=4) == pytest.approx(expected, rel=1e-8)
+
+
+@pytest.mark.parametrize("p0, mde_pp, alpha, power, ratio", CASES)
+def test_power_and_mde_match_statsmodels(p0, mde_pp, alpha, power, ratio):
+    h = abs(cohens_h(p0 + mde_pp / 100, p0))
+    expected = NormalIndPower().power(h, 20_000, alpha, ratio=ratio)
+    assert power_from_pp(mde_pp, p0, 20_000, alpha, ratio) == pytest.approx(expected)
+
+    # solve_power's root finder stops early, so check power at the MDE instead
+    h_min = mde_h(20_000, alpha, power, ratio)
+    achieved = NormalIndPower().power(h_min, 20_000, alpha, ratio=ratio)
+    assert achieved == pytest.approx(power, abs=1e-12)
+
+
+def test_planning_table_rounds_up_required_n():
+    table = planning_table(0.19, [0.5, 1.0], alpha=[0.05, 0.01], n_arms=[2, 3])
+    expected = np.ceil(
+        required_n(
+            table["Baseline rate"],
+            table["Target MDE (pp)"],
+            alpha=table["Alpha"],
+            n_arms=table["Arms"],
+        )
+    )
+    np.testing.assert_array_equal(table["Required N control"], expected)
+
+
+@pytest.mark.parametrize("kwargs", [{"n_arms": 1}, {"mde_pp": 0.0}])
+def test_invalid_designs_raise(kwargs):
+    args = {"p0": 0.19, "mde_pp": 1.0, **kwargs}
+    with pytest.raises(ValueError):
+        required_n(**args)
+    with pytest.raises(ValueError):
+        planning_table(**args)
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from synthetic import DEFAULTS, generate_cookiecats
+
+from cookiecats.ratio import (
+    DEFAULT_RATIOS,
+    RatioMetric,
+    fieller_ci,
+    ratio_table,
+    summarize_ratios,
+)
+
+REPS = 400
+
+
+@pytest.fixture(scope="module")
+def simulated():
+    # Rounds without the Pareto tail, so every ratio has a finite variance
+    return [
+        ratio_table(generate_cookiecats(3_000, seed=i, tail_share=0), fieller=True)
+        for i in range(REPS)
+    ]
+
+
+def test_ratios_match_pandas():
+    df = generate_cookiecats(5_000, seed=3)
+    scaled = RatioMetric("Rounds per 100 players", "sum_gamerounds", scale=100)
+    table = ratio_table(df, (*DEFAULT_RATIOS, scaled)).set_index("Metric")
+
+    grouped = df.assign(product=df["sum_gamerounds"] * df["retention_7"]).groupby(
+        "version", observed=True
+    )
+    per_retained = grouped["product"].sum() / grouped["retention_7"].sum()
+    expected = {
+        "Day-7 retention": grouped["retention_7"].mean(),
+        "Game rounds per player": grouped["sum_gamerounds"].mean(),
+        "Game rounds per day-7 retained player": per_retained,
+        "Rounds per 100 players": 100 * grouped["sum_gamerounds"].mean(),
+    }
+    for metric, values in expected.items():
+        assert table.loc[metric, "Control (gate_30)"] == pytest.approx(
+            values["gate_30"]
+        )
+        assert table.loc[metric, "Treatment (gate_40)"] == pytest.approx(
+            values["gate_40"]
+        )
+
+
+def test_summary_input_matches_dataframe():
+    df = generate_cookiecats(2_000, seed=4)
+    np.testing.assert_allclose(
+        ratio_table(summarize_ratios(df)).select_dtypes("number"),
+        ratio_table(df).select_dtypes("number"),
+    )
+
+
+def test_delta_method_se_matches_simulation(simulated):
+    # The mean delta-method SE against the spread of the estimates; skewed
+    # rounds per retained player run about 9% low at this sample size
+    for i, metric in enumerate(r.name for r in DEFAULT_RATIOS):
+        delta = np.array([table["Absolute Δ"][i] for table in simulated])
+        width = np.array(
+            [table["CI high"][i] - table["CI low"][i] for table in simulated]
+        )
+        se = width.mean() / (2 * 1.959964)
+        assert se == pytest.approx(delta.std(ddof=1), rel=0.15), metric
+
+
+@pytest.mark.parametrize("method", ["Relative", "Fieller"])
+def test_relative_lift_coverage(simulated, method):
+    retention = DEFAULTS["retention_7"]
+    true_lift = {
+        "Day-7 retention": 100 * (retention[1] / retention[0] - 1),
+        "Game rounds per player": 0.0,
+        "Game rounds per day-7 retained player": 0.0,
+    }
+    for metric, lift in true_lift.items():
+        i = [r.name for r in DEFAULT_RATIOS].index(metric)
+        covered = [
+            table[f"{method} CI low (%)"][i]
+            <= lift
+            <= table[f"{method} CI high (%)"][i]
+            for table in simulated
+        ]
+        # 95% nominal, 3.3 binomial standard errors either way
+        assert np.mean(covered) == pytest.approx(0.95, abs=0.037), metric
+
+
+def test_fieller_limits_solve_the_quadratic():
+    a, var_a, b, var_b = 1.2, 0.01, 1.0, 0.02
+    z2 = 1.959964**2
+    low, high = fieller_ci(b, var_b, a, var_a)
+    for theta in (low + 1, high + 1):
+        # (a - theta b)^2 = z^2 (var_a + theta^2 var_b)
+        assert (a - theta * b) ** 2 == pytest.approx(z2 * (var_a + theta**2 * var_b))
+    assert low < a / b - 1 < high
+
+
+def test_fieller_is_unbounded_when_control_is_not_significant():
+    low, high = fieller_ci([1.0, 0.1], [0.01, 0.01], [1.2, 1.2], [0.01, 0.01])
+    assert np.isfinite([low[0], high[0]]).all()
+    assert np.isnan([low[1], high[1]]).all()
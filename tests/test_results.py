@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from synthetic import generate_cookiecats
+
+from cookiecats import stats
+from cookiecats.results import ResultsStore
+from cookiecats.stream import analyze_summary
+from cookiecats.summary import summarize
+
+
+@pytest.fixture(scope="module")
+def results():
+    return analyze_summary(summarize(generate_cookiecats(2_000, seed=6)), 0.05)
+
+
+def test_engagement_stats_hold_scalars_only(results):
+    engagement = results["engagement"]
+    assert all(np.isscalar(value) for value in engagement)
+    assert engagement.to_dict() == dict(zip(type(engagement).__slots__, engagement))
+
+
+def test_game_rounds_rejects_engagement_stats(results):
+    with pytest.raises(TypeError, match="GroupSummary"):
+        stats.test_game_rounds(results["engagement"])
+
+
+def test_store_round_trip(tmp_path, results):
+    store = ResultsStore(tmp_path)
+    run_id = store.append("gate_test", results)
+
+    loaded = store.load(tests=["ret7"])
+    assert loaded["run_id"].tolist() == [run_id]
+    assert loaded["pval"].iloc[0] == pytest.approx(results["ret7"].pval)
+
+
+def test_store_refuses_to_overwrite_a_run(tmp_path, results):
+    store = ResultsStore(tmp_path)
+    store.append("gate_test", results, run_id="daily")
+    with pytest.raises(ValueError, match="already stored"):
+        store.append("other", results, run_id="daily")
+
+    assert store.load()["experiment"].unique().tolist() == ["gate_test"]
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import chisquare, ttest_ind
+from statsmodels.stats.multitest import multipletests
+from statsmodels.stats.proportion import proportions_ztest
+from synthetic import generate_cookiecats
+
+from cookiecats.segments import round_buckets, segment_tests, summarize_segments
+
+PLATFORMS = ["android", "ios", "web"]
+
+
+@pytest.fixture(scope="module")
+def players():
+    df = generate_cookiecats(6_000, seed=13)
+    rng = np.random.default_rng(14)
+    platform = rng.choice(PLATFORMS, len(df), p=[0.5, 0.4, 0.1]).astype(object)
+    # A segment with control players only, and players without a platform
+    control = (df["version"] == "gate_30").to_numpy()
+    platform[control & (rng.random(len(df)) < 0.01)] = "tv"
+    platform[rng.random(len(df)) < 0.02] = None
+    return df.assign(platform=platform)
+
+
+@pytest.fixture(scope="module")
+def table(players):
+    return segment_tests(players, ["platform"])
+
+
+def test_round_buckets():
+    buckets = round_buckets([0, 1, 9, 10, 29, 30, 499, 500, 10**6])
+    assert list(buckets.categories) == ["0", "1-9", "10-29", "30-99", "100-499", "500+"]
+    assert list(buckets) == ["0", "1-9", "1-9", "10-29", "10-29", "30-99"] + [
+        "100-499",
+        "500+",
+        "500+",
+    ]
+
+
+def test_summary_drops_missing_segments(players):
+    summary = summarize_segments(players, "platform")
+    assert summary.keys["platform"].tolist() == ["android", "ios", "tv", "web"]
+    assert summary.n.sum() == players["platform"].notna().sum()
+    assert summary.n[2, summary.index("gate_40")] == 0
+
+
+@pytest.mark.parametrize("platform", PLATFORMS)
+def test_segment_matches_scipy(players, table, platform):
+    segment = players[players["platform"] == platform]
+    groups = segment.groupby("version", observed=True)
+    rows = table[table["platform"] == platform].set_index("Metric")
+
+    srm = chisquare(groups.size())
+    assert rows["SRM p-value"].iloc[0] == pytest.approx(srm.pvalue)
+
+    for metric in ("retention_1", "retention_7"):
+        counts = groups[metric].sum()[["gate_40", "gate_30"]]
+        z_stat, pval = proportions_ztest(counts, groups.size()[["gate_40", "gate_30"]])
+        assert rows.loc[metric, "Statistic"] == pytest.approx(z_stat)
+        assert rows.loc[metric, "p-value"] == pytest.approx(pval)
+
+    rounds = groups["sum_gamerounds"]
+    for metric, transform in (
+        ("sum_gamerounds", np.asarray),
+        ("log sum_gamerounds", np.log1p),
+    ):
+        welch = ttest_ind(
+            transform(rounds.get_group("gate_40")),
+            transform(rounds.get_group("gate_30")),
+            equal_var=False,
+        )
+        assert rows.loc[metric, "Statistic"] == pytest.approx(welch.statistic)
+        assert rows.loc[metric, "p-value"] == pytest.approx(welch.pvalue)
+
+
+def test_correction_skips_invalid_segments(table):
+    for metric, rows in table.groupby("Metric"):
+        valid = rows["platform"] != "tv"
+        assert rows.loc[~valid, ["p-value", "Adjusted p-value"]].isna().all(axis=None)
+        assert rows.loc[~valid, "Significant?"].eq("No").all()
+
+        reject, adjusted, *_ = multipletests(rows.loc[valid, "p-value"], method="holm")
+        np.testing.assert_allclose(rows.loc[valid, "Adjusted p-value"], adjusted)
+
+
+def test_summary_input_matches_dataframe(players, table):
+    from_summary = segment_tests(summarize_segments(players, ["platform"]))
+    pd.testing.assert_frame_equal(from_summary, table)
+
+
+def test_dataframe_needs_segments(players):
+    with pytest.raises(ValueError, match="segments are required"):
+        segment_tests(players)
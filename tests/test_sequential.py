@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from synthetic import generate_cookiecats
+
+from cookiecats.sequential import RetentionMonitor, group_sequential_bounds
+
+# Lan-DeMets O'Brien-Fleming bounds for equally spaced looks, two-sided
+# alpha = 0.05 (Jennison & Turnbull, 2000; gsDesign sfLDOF)
+PUBLISHED_BOUNDS = {
+    2: [2.963, 1.969],
+    3: [3.710, 2.511, 1.993],
+    4: [4.333, 2.963, 2.359, 2.014],
+    5: [4.877, 3.357, 2.680, 2.290, 2.031],
+}
+
+
+@pytest.mark.parametrize("looks", sorted(PUBLISHED_BOUNDS))
+def test_obf_bounds_match_published_values(looks):
+    info = np.arange(1, looks + 1) / looks
+    bounds = group_sequential_bounds(info, alpha=0.05)
+    np.testing.assert_allclose(bounds, PUBLISHED_BOUNDS[looks], atol=5e-3)
+
+
+def test_monitor_extends_boundaries_one_look_at_a_time():
+    df = generate_cookiecats(10_000, seed=5)
+    monitor = RetentionMonitor(method="obrien-fleming", max_n=8_000)
+    batches = [df.iloc[start : start + 2_000] for start in range(0, 10_000, 2_000)]
+    reported = []
+    for batch in batches:
+        reported.append(monitor.update(batch)["Boundary |z|"].iloc[0])
+        monitor.report()  # Repeated reports reuse the cached boundary
+
+    # The fifth batch is past max_n and reuses the final boundary
+    info = np.minimum(np.arange(1, 6) * 2_000 / 8_000, 1)
+    expected = group_sequential_bounds(info[:4])
+    np.testing.assert_allclose(reported, [*expected, expected[-1]])
+    assert len(monitor._bounds) == 4
+
+
+@pytest.mark.parametrize("method", ["msprt", "obrien-fleming"])
+def test_zero_variance_look_is_skipped(method):
+    batch = pd.DataFrame(
+        {
+            "version": ["gate_30"] * 3 + ["gate_40"] * 3,
+            "retention_1": [True] * 6,
+            "retention_7": [False] * 6,
+        }
+    )
+    monitor = RetentionMonitor(method=method, max_n=1_000)
+    with pytest.warns(UserWarning, match="no variance yet"):
+        report = monitor.update(batch)
+
+    assert report["z"].isna().all()
+    assert (report["Stop?"] == "No").all()
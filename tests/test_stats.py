@@ -0,0 +1,26 @@
+import pytest
+
+from cookiecats import stats
+
+# Public functions of the original stats module
+BASELINE_API = [
+    "test_srm_chi2",
+    "h_to_p1",
+    "solve_mde",
+    "solve_required_n",
+    "test_two_prop_z",
+    "calculate_engagement_stats",
+    "test_game_rounds",
+    "bootstrap_mean_diff",
+    "correct_pvals",
+]
+
+
+@pytest.mark.parametrize("name", BASELINE_API)
+def test_baseline_functions_are_still_importable(name):
+    assert callable(getattr(stats, name))
+
+
+def test_h_to_p1_inverts_cohens_h():
+    p1 = stats.h_to_p1(0.05, 0.19)
+    assert stats.cohens_h(p1, 0.19) == pytest.approx(0.05)
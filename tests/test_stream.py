@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from synthetic import generate_cookiecats
+
+from cookiecats.stream import (
+    _csv_ranges,
+    _summarize_csv_range,
+    analyze_stream,
+    summarize_parallel,
+)
+from cookiecats.summary import merge_summaries, summarize
+
+
+@pytest.fixture
+def export(tmp_path):
+    df = generate_cookiecats(300, seed=4)
+    df["version"] = df["version"].cat.rename_categories(["A", "B"])
+    path = tmp_path / "export.csv"
+    df.to_csv(path, index=False)
+    return df, path
+
+
+def assert_same_summary(result, expected):
+    assert result.groups == expected.groups
+    np.testing.assert_array_equal(result.n, expected.n)
+    np.testing.assert_array_equal(result.values, expected.values)
+    np.testing.assert_array_equal(result.hist, expected.hist)
+    for col in expected.successes:
+        np.testing.assert_array_equal(result.successes[col], expected.successes[col])
+    np.testing.assert_allclose(result.log_sum, expected.log_sum)
+
+
+@pytest.mark.parametrize("block_bytes", [1, 7, 64, 1000, 10**6])
+def test_byte_ranges_match_single_pass(export, block_bytes):
+    # Every line is summarized exactly once, whatever the range boundaries
+    df, path = export
+    header, ranges = _csv_ranges(path, block_bytes)
+    parts = [_summarize_csv_range(path, header, *r) for r in ranges]
+    assert_same_summary(merge_summaries(parts), summarize(df))
+
+
+def test_summarize_parallel_matches_single_pass(export):
+    df, path = export
+    result = summarize_parallel(path, max_workers=2, block_bytes=512)
+    assert_same_summary(result, summarize(df))
+
+
+def test_analyze_stream_forwards_labels_and_block_size(export):
+    _, path = export
+    serial = analyze_stream(path, control="A", treatment="B")
+    parallel = analyze_stream(
+        path, control="A", treatment="B", max_workers=2, block_bytes=512
+    )
+    assert parallel["ret7"].pval == pytest.approx(serial["ret7"].pval)
+    assert parallel["rounds"].u_stat == serial["rounds"].u_stat
+
+
+def test_header_only_export_raises(tmp_path):
+    path = tmp_path / "empty.csv"
+    generate_cookiecats(0).to_csv(path, index=False)
+    with pytest.raises(ValueError, match="no rows"):
+        summarize_parallel(path, max_workers=1)